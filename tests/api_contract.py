@@ -0,0 +1,221 @@
+"""The frontend's API catalog, response schemas and a pooled client for contract tests.
+
+The catalog is read straight from the app: `endpoints` in src/services/api.js
+and every `api.<method>(...)` call in src/services/loanService.js, with
+template literals turned into path templates ("/auth/loans/{id}/details/").
+When a service function adds or changes a call, test_api_contract.py
+sees it on the next run.
+
+Schemas are plain Python structures, checked by validate():
+
+- a type: the value must be an instance of it (bool does not pass as int)
+- a compiled regex: the value must be a string matching it
+- a tuple: any one of the alternatives
+- a list with one schema: a JSON array whose items all match it
+- a dict: a JSON object with those fields. A name ending in "?" is optional.
+  Fields that the schema does not list are allowed.
+"""
+import os
+import re
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+SERVICES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "services")
+
+ENDPOINTS_BLOCK = re.compile(r"export const endpoints = \{(.*?)\};", re.S)
+ENDPOINT_ENTRY = re.compile(r"(\w+):\s*'([^']*)'")
+SERVICE_FUNCTION = re.compile(r"^  (\w+): async \(([^)]*)\) => \{", re.M)
+API_CALL = re.compile(r"\bapi\.(get|post|put|patch|delete)\(\s*(`[^`]*`|'[^']*'|[\w.]+)")
+TEMPLATE_PART = re.compile(r"\$\{([\w.]+)\}")
+
+
+class ServiceCall:
+    """One HTTP call a loanService function makes"""
+
+    def __init__(self, name, method, path, query=None):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.query = query or {}
+
+    @property
+    def params(self):
+        """Path placeholders, e.g. {"id"} for /auth/loans/{id}/details/"""
+        return set(re.findall(r"\{(\w+)\}", self.path))
+
+    def url(self, **params):
+        return self.path.format(**params)
+
+    def __repr__(self):
+        return f"{self.name}: {self.method} {self.path}"
+
+
+def parse_endpoints(source):
+    block = ENDPOINTS_BLOCK.search(source)
+    return dict(ENDPOINT_ENTRY.findall(block.group(1))) if block else {}
+
+
+def _expand(expression, endpoints, body):
+    """Path templates (with their query strings) an argument expression can evaluate to"""
+    if expression.startswith("`"):
+        def substitute(match):
+            name = match.group(1)
+            if name.startswith("endpoints."):
+                return endpoints[name.split(".", 1)[1]]
+            return "{" + name + "}"
+        return [TEMPLATE_PART.sub(substitute, expression.strip("`"))]
+    if expression.startswith("'"):
+        return [expression.strip("'")]
+    if expression.startswith("endpoints."):
+        return [endpoints[expression.split(".", 1)[1]]]
+    # A local variable: follow `const url = condition ? a : b;`
+    assignment = re.search(rf"const {re.escape(expression)} = (.+?);", body)
+    if not assignment:
+        raise ValueError(f"cannot resolve {expression!r}")
+    value = assignment.group(1)
+    branches = value.split("?", 1)[1].split(" : ") if "?" in value and " : " in value else [value]
+    return [path for branch in branches for path in _expand(branch.strip(), endpoints, body)]
+
+
+def parse_service(source, endpoints):
+    """Every api.<method>() call in a service module, in source order"""
+    functions = list(SERVICE_FUNCTION.finditer(source))
+    calls = []
+    for function, following in zip(functions, functions[1:] + [None]):
+        body = source[function.end():following.start() if following else len(source)]
+        for method, expression in API_CALL.findall(body):
+            for template in _expand(expression, endpoints, body):
+                path, _, query = template.partition("?")
+                calls.append(ServiceCall(function.group(1), method.upper(), path,
+                                         dict(part.split("=", 1) for part in query.split("&") if part)))
+    return calls
+
+
+def load_catalog(directory=SERVICES_DIR):
+    """(endpoints from api.js, ServiceCalls from loanService.js)"""
+    with open(os.path.join(directory, "api.js")) as f:
+        endpoints = parse_endpoints(f.read())
+    with open(os.path.join(directory, "loanService.js")) as f:
+        calls = parse_service(f.read(), endpoints)
+    return endpoints, calls
+
+
+# Response schemas, following the fields the screens read
+
+DECIMAL = re.compile(r"^-?\d+\.\d{2}$")
+DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+TIMESTAMP = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:\d{2})?$")
+NULL = type(None)
+
+MESSAGE = {"message": str}
+USER = {
+    "id": int, "username": str, "email": str, "role": str, "first_name": str, "last_name": str,
+    "is_active": bool, "phone?": (str, NULL), "date_joined?": TIMESTAMP, "last_login?": (TIMESTAMP, NULL),
+}
+LOGIN = {"token": str, "user": USER}
+CUSTOMER = {
+    "customer_id": int, "full_name": str, "customer_code?": str, "nickname?": str, "email?": str, "phone?": str,
+    "address?": str, "created_at?": TIMESTAMP,
+}
+LOAN = {
+    "loan_id": int, "customer": int, "customer_name?": str, "loan_type": (int, NULL), "principal_amount": DECIMAL,
+    "interest_percentage": DECIMAL, "total_due_count": int, "repayment_mode": str, "loan_status": str,
+    "created_at": TIMESTAMP,
+}
+SCHEDULE = {
+    "id": int, "loan": int, "installment_no": int, "due_date": DATE, "principal_amount": DECIMAL,
+    "interest_amount": DECIMAL, "total_due": DECIMAL, "paid_amount": DECIMAL, "payment_method": (str, NULL),
+    "status": str, "assigned_to": (int, NULL), "customer_name?": str,
+}
+LOAN_TYPE = {"id": int, "name": str}
+PERMISSION = {"id": int, "codename": str, "name": str}
+ROLE = {"id": int, "name": str, "description": str, "permissions": [int]}
+DOCUMENT = {"id": int, "loan": int, "name": str}
+DAILY_COLLECTION = {
+    "id": int, "agent_id": int, "collection_date": DATE, "cash_total": DECIMAL, "upi_total": DECIMAL,
+    "card_total": DECIMAL, "total_amount": DECIMAL,
+}
+ATTENDANCE = {"id": int, "user": int, "date": DATE, "status": str, "check_in": (str, NULL), "check_out": (str, NULL)}
+NOTIFICATION = {"id": int, "user_id": int, "title": str, "message": str, "type": str, "is_read": bool,
+                "created_at": TIMESTAMP}
+DISBURSEMENT = {"id": int, "loan_id": int, "amount": DECIMAL, "method": str, "status": str, "reference": str,
+                "created_at": TIMESTAMP}
+AUDIT_LOG = {"id": int, "user": str, "action": str, "module": str, "timestamp": TIMESTAMP}
+LOAN_DETAILS = {"loan": LOAN, "customer": CUSTOMER, "schedules": [SCHEDULE]}
+COLLECTION_REPORT = {"total_collected": DECIMAL, "by_agent": dict, "collections": [DAILY_COLLECTION]}
+PERFORMANCE_REPORT = [{"agent_id": int, "agent": str, "assigned": int, "collected": int,
+                       "collection_rate": (int, float)}]
+TARGET_REPORT = {"monthly_target": (int, float), "achieved": (int, float), "achievement_percentage": (int, float)}
+
+
+def _type_name(schema):
+    if isinstance(schema, type):
+        return schema.__name__
+    if isinstance(schema, re.Pattern):
+        return f"string matching {schema.pattern}"
+    if isinstance(schema, tuple):
+        return " or ".join(_type_name(s) for s in schema)
+    return "array" if isinstance(schema, list) else "object"
+
+
+def validate(value, schema, where="$"):
+    """Problems with `value` against `schema`, as "path: message" strings; empty if it matches"""
+    if isinstance(schema, tuple):
+        if any(not validate(value, option, where) for option in schema):
+            return []
+        return [f"{where}: expected {_type_name(schema)}, got {value!r:.60}"]
+    if isinstance(schema, re.Pattern):
+        if isinstance(value, str) and schema.match(value):
+            return []
+        return [f"{where}: expected {_type_name(schema)}, got {value!r:.60}"]
+    if isinstance(schema, type):
+        if isinstance(value, schema) and not (isinstance(value, bool) and schema is not bool):
+            return []
+        return [f"{where}: expected {schema.__name__}, got {type(value).__name__}"]
+    if isinstance(schema, list):
+        if not isinstance(value, list):
+            return [f"{where}: expected array, got {type(value).__name__}"]
+        return [problem for i, item in enumerate(value) for problem in validate(item, schema[0], f"{where}[{i}]")]
+    if not isinstance(value, dict):
+        return [f"{where}: expected object, got {type(value).__name__}"]
+    problems = []
+    for name, field in schema.items():
+        optional = name.endswith("?")
+        name = name.rstrip("?")
+        if name not in value:
+            if not optional:
+                problems.append(f"{where}.{name}: missing")
+            continue
+        problems.extend(validate(value[name], field, f"{where}.{name}"))
+    return problems
+
+
+class ApiClient:
+    """Keep-alive HTTP client with per-role token auth; remembers each call's latency"""
+
+    def __init__(self, api_url, tokens, pool_size=16):
+        self.api_url = api_url
+        self.tokens = tokens
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.http.mount("http://", adapter)
+        self.http.mount("https://", adapter)
+        self.timings = []
+        self._lock = threading.Lock()
+
+    def request(self, method, path, role="admin", **kwargs):
+        headers = {}
+        if role:
+            headers["Authorization"] = f"Token {self.tokens.for_role(role)['token']}"
+        started = time.perf_counter()
+        response = self.http.request(method, f"{self.api_url}{path}", headers=headers, timeout=10, **kwargs)
+        elapsed = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self.timings.append((method, path, elapsed))
+        return response
+
+    def close(self):
+        self.http.close()
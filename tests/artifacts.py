@@ -0,0 +1,199 @@
+"""Debugging artifacts for failed tests, written off the test's thread.
+
+While a test runs, FailureArtifacts only keeps cheap in-memory state: the
+last HISTORY WebDriver commands (name, arguments, duration, error), plus
+what the test's DomSnapshot and NetworkLog already hold. Passing tests
+write nothing.
+
+When a test fails, its teardown reads the console log and the page's HTML
+and takes a screenshot. These are the only extra browser round-trips.
+Everything goes to an ArtifactWriter, which gzips the JSON, HTML and HAR
+and writes them on a background thread while the browser moves on to the
+next test:
+
+    reports/artifacts/<module>/<Class>__<test>/
+        screenshot.jpg      JPEG from DevTools (PNG when the driver has no CDP)
+        commands.json.gz    the last WebDriver commands
+        console.json.gz     console messages logged during the test
+        dom.json.gz         the last DomSnapshot capture and the final page HTML
+        network.har.gz      every request of the test as HAR 1.2 (gunzip, then open in DevTools)
+
+The results log records the directory, and the HTML reports link to it
+instead of embedding anything.
+"""
+import base64
+import gzip
+import json
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from collections import deque
+
+from network_log import har
+
+ARTIFACT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports", "artifacts")
+# Commands and console messages kept per test
+HISTORY = 50
+SCREENSHOT_QUALITY = 70
+# Arguments longer than this (scripts, page sources) are cut in the command history
+MAX_ARGUMENT_LENGTH = 200
+
+
+def artifact_dir(directory, nodeid):
+    """<directory>/<module>/<Class>__<test>[params] for a test node id"""
+    module, _, name = nodeid.partition("::")
+    module = os.path.splitext(os.path.basename(module))[0]
+    return os.path.join(directory, module, re.sub(r"[^\w.\[\]-]+", "_", name.replace("::", "__")))
+
+
+def _short(value):
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    return text if len(text) <= MAX_ARGUMENT_LENGTH else text[:MAX_ARGUMENT_LENGTH] + "..."
+
+
+class ArtifactWriter:
+    """Compresses and writes files on one daemon thread, started with the first write"""
+
+    def __init__(self, directory=ARTIFACT_DIR):
+        self.directory = directory
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, folder, files, clear=False):
+        """Queue `files` ({name: bytes or JSON-able value}) for writing into `folder`; names ending
+        in .gz are compressed. `clear` first removes what an earlier run left in the folder."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="artifact-writer")
+                self._thread.start()
+        self._queue.put((folder, files, clear))
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            folder, files, clear = job
+            try:
+                if clear:
+                    shutil.rmtree(folder, ignore_errors=True)
+                os.makedirs(folder, exist_ok=True)
+                for name, content in files.items():
+                    if not isinstance(content, bytes):
+                        content = (content if isinstance(content, str) else json.dumps(content, indent=1)).encode()
+                    if name.endswith(".gz"):
+                        content = gzip.compress(content, compresslevel=6, mtime=0)
+                    with open(os.path.join(folder, name), "wb") as f:
+                        f.write(content)
+            except Exception as e:
+                print(f"Writing artifacts to {folder} failed: {e}")
+
+    def close(self):
+        """Wait for everything queued so far to be on disk"""
+        if self._thread:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+
+class FailureArtifacts:
+    """Rolling per-test history, turned into files only if the test fails"""
+
+    def __init__(self, driver, writer, nodeid, dom=None, network=None, history=HISTORY):
+        self.driver = driver
+        self.writer = writer
+        self.folder = artifact_dir(writer.directory, nodeid)
+        self.dom = dom
+        self.network = network
+        self.history = history
+        self.commands = deque(maxlen=history)
+        self.started = time.time()
+        self._cleared = False
+        self._execute = driver.execute
+        # An instance attribute shadows WebDriver.execute for this lease only
+        driver.execute = self._recording_execute
+
+    def _recording_execute(self, command, params=None):
+        started = time.perf_counter()
+        error = None
+        try:
+            return self._execute(command, params)
+        except Exception as e:
+            error = f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"
+            raise
+        finally:
+            self.commands.append({
+                "at_ms": round((time.time() - self.started) * 1000),
+                "command": command,
+                "params": {k: _short(v) for k, v in (params or {}).items() if k != "sessionId"},
+                "ms": round((time.perf_counter() - started) * 1000, 1),
+                "error": error,
+            })
+
+    def stop(self):
+        """Put the driver's own execute back before it returns to the pool"""
+        if self.driver.__dict__.get("execute") == self._recording_execute:
+            del self.driver.execute
+
+    def screenshot(self):
+        """(file name, image bytes), as a compressed JPEG where DevTools is available"""
+        if hasattr(self.driver, "execute_cdp_cmd"):
+            try:
+                data = self.driver.execute_cdp_cmd("Page.captureScreenshot",
+                                                   {"format": "jpeg", "quality": SCREENSHOT_QUALITY})
+                return "screenshot.jpg", base64.b64decode(data["data"])
+            except Exception:
+                pass
+        return "screenshot.png", self.driver.get_screenshot_as_png()
+
+    def console(self):
+        """Console messages logged since the test started, at most `history` of them"""
+        entries = [entry for entry in self.driver.get_log("browser") if entry["timestamp"] >= self.started * 1000]
+        return entries[-self.history:]
+
+    def dom_state(self):
+        state = {"url": None, "title": None, "snapshot": None}
+        if self.dom is not None and self.dom.url:
+            state["snapshot"] = {"url": self.dom.url, "title": self.dom.title, "elements": self.dom.elements}
+        state["url"] = self.driver.current_url
+        state["title"] = self.driver.title
+        return state
+
+    def capture(self, label):
+        """Write a screenshot and the DOM now, whatever the outcome, e.g. from a debugging test"""
+        files = {}
+        self._collect(files, f"{label}.", [("screenshot", self.screenshot), ("dom.json.gz", self.dom_state),
+                                           ("html.gz", lambda: self.driver.page_source)])
+        self._submit(files)
+
+    def save_failure(self):
+        """Write everything known about the failed test; returns the artifact folder"""
+        self.stop()
+        files = {"commands.json.gz": list(self.commands)}
+        collectors = [("screenshot", self.screenshot), ("console.json.gz", self.console),
+                      ("dom.json.gz", self.dom_state), ("page.html.gz", lambda: self.driver.page_source)]
+        if self.network is not None:
+            collectors.append(("network.har.gz", lambda: har(self.network.drain().events)))
+        self._collect(files, "", collectors)
+        self._submit(files)
+        return self.folder
+
+    def _collect(self, files, prefix, collectors):
+        # A broken browser still leaves whatever could be read
+        for name, collect in collectors:
+            try:
+                value = collect()
+            except Exception as e:
+                files[f"{prefix}{name.split('.')[0]}.error.txt"] = f"{type(e).__name__}: {e}"
+                continue
+            if name == "screenshot":
+                name, value = value
+            files[f"{prefix}{name}"] = value
+
+    def _submit(self, files):
+        self.writer.submit(self.folder, files, clear=not self._cleared)
+        self._cleared = True
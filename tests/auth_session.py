@@ -0,0 +1,87 @@
+import json
+import threading
+
+import requests
+
+API_URL = "http://127.0.0.1:8000/api"
+
+# Accounts the suite logs in with, keyed by role
+CREDENTIALS = {
+    "admin": ("admin@example.com", "password123"),
+    "agent": ("agent@example.com", "password123"),
+}
+
+# Where the Login component navigates after a successful login
+ROLE_HOME = {
+    "master_admin": "/admin/dashboard",
+    "collection_agent": "/agent/dashboard",
+    "staff": "/staff/dashboard",
+}
+
+
+class LoginError(Exception):
+    pass
+
+
+class TokenCache:
+    """Logs in through the backend once per account and remembers the token for the session"""
+
+    def __init__(self, api_url=API_URL):
+        self.api_url = api_url
+        self.http = requests.Session()
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def get(self, email, password):
+        """Return the `{"token", "user"}` payload for an account, logging in if needed"""
+        key = (email, password)
+        with self._lock:
+            if key in self._sessions:
+                return self._sessions[key]
+
+        try:
+            response = self.http.post(
+                f"{self.api_url}/auth/login/",
+                json={"email": email, "password": password},
+                timeout=10,
+            )
+        except requests.RequestException as e:
+            raise LoginError(f"Login API unreachable: {e}")
+
+        data = response.json() if response.content else {}
+        if not response.ok or "token" not in data:
+            raise LoginError(data.get("error") or f"Login API returned {response.status_code}")
+
+        session = {"token": data["token"], "user": data.get("user") or {}}
+        with self._lock:
+            self._sessions[key] = session
+        return session
+
+    def for_role(self, role):
+        email, password = CREDENTIALS[role]
+        return self.get(email, password)
+
+    def close(self):
+        self.http.close()
+
+
+def seed_local_storage(driver, base_url, session):
+    """Write the same localStorage keys the Login component writes on success.
+
+    localStorage is per origin, so a document from the app origin has to be
+    loaded first. A static asset is enough and avoids booting the SPA twice.
+    """
+    driver.get(f"{base_url}/vite.svg")
+    driver.execute_script(
+        """
+        localStorage.setItem('token', arguments[0]);
+        localStorage.setItem('user', arguments[1]);
+        localStorage.setItem('isAuthenticated', 'true');
+        """,
+        session["token"],
+        json.dumps(session["user"]),
+    )
+
+
+def home_path(user):
+    return ROLE_HOME.get((user or {}).get("role"), "/dashboard")
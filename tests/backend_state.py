@@ -0,0 +1,59 @@
+import requests
+
+# Building and loading the large scale_* scenarios takes several seconds
+SCENARIO_TIMEOUT = 120
+# What a backend answers for a /test-state/ URL it does not route. The endpoints themselves never
+# answer these; an unknown scenario or snapshot is a 400.
+MISSING_STATUSES = (404, 405, 501)
+SUPPORTED_HOW = ("use --backend=mock, or a backend that serves POST /test-state/reset/, snapshot/ and restore/ "
+                 "the way mock_backend.py does")
+
+
+class StateUnsupported(Exception):
+    """The backend has no test-state endpoints (e.g. a live server without them)"""
+
+
+class BackendState:
+    """Client for the backend's /test-state/ endpoints: scenarios, snapshots and rollback"""
+
+    def __init__(self, api_url):
+        self.api_url = api_url
+        self.http = requests.Session()
+        self.unsupported = None
+
+    def _post(self, action, payload=None, timeout=5):
+        if self.unsupported:
+            raise self.unsupported
+        try:
+            response = self.http.post(f"{self.api_url}/test-state/{action}/", json=payload or {}, timeout=timeout)
+        except requests.RequestException as e:
+            self.unsupported = StateUnsupported(f"Backend unreachable: {e}")
+            raise self.unsupported
+        if response.status_code in MISSING_STATUSES:
+            self.unsupported = StateUnsupported(
+                f"{self.api_url} has no test-state endpoints (POST test-state/{action}/ answered "
+                f"{response.status_code}); {SUPPORTED_HOW}")
+            raise self.unsupported
+        if not response.ok:
+            raise RuntimeError(f"test-state/{action} failed: {response.status_code} {response.text}")
+        try:
+            return response.json()
+        except ValueError:
+            # e.g. a dev server or proxy that answers every path with the app's index page
+            self.unsupported = StateUnsupported(
+                f"POST {self.api_url}/test-state/{action}/ answered {response.status_code} with "
+                f"{response.headers.get('Content-Type', 'no content type')}, not JSON; {SUPPORTED_HOW}")
+            raise self.unsupported
+
+    def apply(self, scenario):
+        """Replace all backend data with a named scenario from scenarios.py"""
+        return self._post("reset", {"scenario": scenario}, timeout=SCENARIO_TIMEOUT)
+
+    def snapshot(self):
+        return self._post("snapshot")["snapshot"]
+
+    def restore(self, snapshot_id):
+        self._post("restore", {"snapshot": snapshot_id})
+
+    def close(self):
+        self.http.close()
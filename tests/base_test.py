@@ -1,76 +1,143 @@
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select
-import time
+import os
+import sys
+
+from artifacts import FailureArtifacts
+from auth_session import LoginError, home_path, seed_local_storage
+from dom_snapshot import DomSnapshot
+from emulation import apply as apply_emulation, clear as clear_emulation, profile_for
+from impact_map import CoverageRecorder
+from network_log import NetworkLog
+from route_metrics import RouteMetricsBuffer
+from waits import navigate, wait_until_settled
+
+BASE_URL = "http://localhost:5173"
 
 class BaseTest:
+    # "api" seeds localStorage from a cached token, "form" drives the real login page
+    login_mode = os.environ.get("LOANFRONT_LOGIN_MODE", "api")
+
     @pytest.fixture(autouse=True)
-    def setup(self):
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")  # Remove for visual testing
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-background-networking")
-        chrome_options.add_argument("--disable-sync")
-        chrome_options.add_argument("--disable-translate")
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--disable-features=TranslateUI")
-        chrome_options.add_argument("--disable-ipc-flooding-protection")
-        
-        self.driver = webdriver.Chrome(options=chrome_options)
-        self.driver.maximize_window()
-        self.wait = WebDriverWait(self.driver, 10)
-        self.base_url = "http://localhost:5173"
+    def setup(self, request, preflight, driver_pool, base_url, auth_tokens, wait_recorder, selector_cache, collect_route_metrics,
+              record_network, cassettes, record_impact, artifact_writer, emulation_rules):
+        preflight.require("frontend", "api", "browser")
+        if cassettes.mode == "replay" and not cassettes.has(request.node.nodeid):
+            pytest.skip("no recorded cassette; run with --cassettes=record first")
+        self.profile = profile_for(request.node, emulation_rules)
+        pristine = request.node.get_closest_marker("pristine") is not None
+        self.driver = driver_pool.acquire(pristine=pristine)
+        self.artifacts = None
+        try:
+            if self.profile:
+                apply_emulation(self.driver, self.profile)
+            self.cassette = cassettes.attach(self.driver, request.node.nodeid)
+            self.wait = WebDriverWait(self.driver, 10)
+            self.base_url = base_url
+            self.auth_tokens = auth_tokens
+            self.wait_recorder = wait_recorder
+            self.selector_cache = selector_cache
+            self.dom = DomSnapshot(self.driver)
+            self.route_metrics = RouteMetricsBuffer(self.driver) if collect_route_metrics else None
+            self.network = NetworkLog(self.driver)
+            self.coverage = CoverageRecorder(self.driver) if record_impact else None
+            if artifact_writer:
+                self.artifacts = FailureArtifacts(self.driver, artifact_writer, request.node.nodeid, self.dom,
+                                                  self.network, request.config.getoption("--artifact-history"))
+            self.test_id = request.node.nodeid
+            self.driver.before_navigate = self.collect_page_data
+        except Exception:
+            self.release(driver_pool, recycle=True)
+            raise
         
         yield
         
-        self.driver.quit()
+        # Anything that goes wrong below leaves the browser in an unknown state
+        recycle = True
+        try:
+            if self.artifacts:
+                report = getattr(request.node, "rep_call", None)
+                if report is not None and report.failed:
+                    request.node.user_properties.append(("artifacts", self.artifacts.save_failure()))
+            if self.route_metrics:
+                try:
+                    self.route_metrics.collect()
+                except Exception as e:
+                    print(f"Collecting route metrics failed: {e}")
+                request.node.user_properties.append(
+                    ("route_metrics", self.route_metrics.results(self.profile.name if self.profile else None)))
+            if record_network:
+                try:
+                    request.node.user_properties.append(("network", self.network.summary()))
+                except Exception as e:
+                    print(f"Reading the network log failed: {e}")
+            if self.coverage:
+                try:
+                    self.coverage.collect()
+                    request.node.user_properties.append(("impact", self.coverage.stop()))
+                except Exception as e:
+                    print(f"Collecting JS coverage failed: {e}")
+            if self.cassette:
+                self.cassette.detach()
+            if self.profile:
+                try:
+                    clear_emulation(self.driver)
+                except Exception as e:
+                    print(f"Clearing emulation failed, recycling the browser: {e}")
+                    return
+            recycle = False
+        finally:
+            self.release(driver_pool, recycle=recycle)
+    
+    def release(self, driver_pool, recycle=False):
+        """Take this test's hooks off the driver and give it back to the pool"""
+        self.driver.__dict__.pop("before_navigate", None)
+        if self.artifacts:
+            self.artifacts.stop()
+        driver_pool.release(self.driver, recycle=recycle)
     
     def login(self, email="admin@example.com", password="password123"):
-        """Helper method to login - flexible implementation"""
-        self.driver.get(f"{self.base_url}/login")
-        time.sleep(2)
+        """Helper method to login - uses the mode configured by `login_mode`"""
+        if self.login_mode == "form":
+            return self.login_via_form(email, password)
+        return self.login_via_api(email, password)
+    
+    def login_via_api(self, email="admin@example.com", password="password123"):
+        """Login with a session-cached API token and land on the role's dashboard"""
+        try:
+            session = self.auth_tokens.get(email, password)
+        except LoginError as e:
+            print(f"Login failed: {e}")
+            return False
+        
+        # Seeding storage leaves the current document too
+        self.collect_page_data()
+        seed_local_storage(self.driver, self.base_url, session)
+        self.navigate(f"{self.base_url}{home_path(session['user'])}")
+        return True
+    
+    def login_via_form(self, email="admin@example.com", password="password123"):
+        """Helper method to login through the login page - flexible implementation"""
+        login_url = f"{self.base_url}/login"
+        self.navigate(login_url)
+        self.wait_until_settled()
         
         try:
-            # Try multiple selectors for email input
-            email_input = None
-            for selector in ["input[type='email']", "input[name='email']", "#email", ".email-input"]:
-                try:
-                    email_input = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    break
-                except:
-                    continue
-            
+            # Each group of fallback selectors is resolved in one browser call
+            email_input = self.find_first("login.email", ["input[type='email']", "input[name='email']", "#email", ".email-input"])
             if not email_input:
                 print("No email input found - login page may not exist")
                 return False
                 
-            # Try multiple selectors for password input  
-            password_input = None
-            for selector in ["input[type='password']", "input[name='password']", "#password", ".password-input"]:
-                try:
-                    password_input = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    break
-                except:
-                    continue
-                    
+            password_input = self.find_first("login.password", ["input[type='password']", "input[name='password']", "#password", ".password-input"])
             if not password_input:
                 print("No password input found")
                 return False
             
-            # Try multiple selectors for submit button
-            login_btn = None
-            for selector in ["button[type='submit']", "input[type='submit']", ".login-btn", "#login-btn"]:
-                try:
-                    login_btn = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    break
-                except:
-                    continue
-                    
+            login_btn = self.find_first("login.submit", ["button[type='submit']", "input[type='submit']", ".login-btn", "#login-btn"])
             if not login_btn:
                 print("No login button found")
                 return False
@@ -81,13 +148,45 @@ class BaseTest:
             password_input.send_keys(password)
             login_btn.click()
             
-            time.sleep(3)
+            self.wait_until_settled(from_url=login_url)
             return True
                 
         except Exception as e:
             print(f"Login failed: {e}")
             return False
     
+    def navigate(self, url):
+        """Load `url`, first collecting coverage and route metrics from the page being left"""
+        navigate(self.driver, url)
+    
+    def collect_page_data(self):
+        """Collect what the current document holds and would lose on navigation"""
+        try:
+            if self.route_metrics:
+                self.route_metrics.collect()
+            if self.coverage:
+                self.coverage.collect()
+        except Exception as e:
+            print(f"Collecting page data before navigating failed: {e}")
+    
+    def find_first(self, name, selectors):
+        """First element matching any of `selectors` (CSS or XPath), trying the one that
+        matched last time on this route first; None if nothing matches"""
+        return self.selector_cache.resolve(self.driver, name, selectors)
+    
+    def wait_until_settled(self, from_url=None, timeout=10):
+        """Wait until the route changed (if from_url is given), the network is idle,
+        React has committed and animations are done; records the time spent"""
+        caller = sys._getframe(1)
+        label = f"{caller.f_code.co_name}:{caller.f_lineno}"
+        seconds = wait_until_settled(self.driver, from_url=from_url, timeout=timeout)
+        self.wait_recorder.record(self.test_id, label, seconds)
+        if self.route_metrics:
+            self.route_metrics.collect(settled=True)
+        if self.coverage:
+            self.coverage.collect()
+        return seconds
+    
     def logout(self):
         """Helper method to logout"""
         logout_btn = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Logout')]")))
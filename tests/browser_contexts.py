@@ -0,0 +1,97 @@
+"""Many concurrent tests in one Chrome, each in its own browser context.
+
+A browser context is Chrome's incognito-style profile: it has its own
+cookies, storage, cache and (optionally) proxy, but it shares the browser,
+GPU and network service processes with every other context. With
+--browser-contexts, the controller launches one SharedBrowser. Each xdist
+worker's DriverPool then hands out ContextDrivers instead of launching a
+Chrome per worker. A ContextDriver is a ChromeDriver session attached to
+the shared browser (debuggerAddress) that is switched to a tab in a
+context of its own. So `pytest -n 8 --browser-contexts` runs eight tests
+at once in a single browser, and BaseTest, the page objects and the waits
+work unchanged, because each test still holds an ordinary WebDriver.
+
+Contexts are created and disposed over a CdpSession to the browser target.
+Between leases the pool disposes the test's context and opens a fresh one,
+which is a stronger reset than clearing storage. Contexts are also
+disposed when the worker's DevTools connection drops, so a crashed worker
+leaves nothing behind.
+
+Each worker has its own mock backend, so each context gets a proxy
+pointing at that worker's mock, with the same bypass rules as a dedicated
+browser (mock_backend.proxy_arguments): only the app's own origin goes
+direct.
+"""
+import os
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+from cdp_session import CdpSession, browser_websocket, debugger_address
+from mock_backend import proxy_bypass_list
+from network_log import logging_capabilities
+from waits import install_probes
+
+SHARED_BROWSER_ENV = "LOANFRONT_SHARED_BROWSER"
+
+
+class SharedBrowser:
+    """The Chrome every context lives in; started once per run by the controller"""
+
+    def __init__(self, options):
+        self.options = options
+        self.driver = None
+        self.address = None
+
+    def start(self):
+        self.driver = webdriver.Chrome(options=self.options)
+        self.address = debugger_address(self.driver)
+        # xdist workers are spawned after configure and inherit the environment
+        os.environ[SHARED_BROWSER_ENV] = self.address
+        return self
+
+    def stop(self):
+        os.environ.pop(SHARED_BROWSER_ENV, None)
+        if self.driver:
+            self.driver.quit()
+            self.driver = None
+
+
+def context_proxy(backend, app_url):
+    """Target.createBrowserContext proxy settings sending everything but the app to `backend`"""
+    host, port = backend.server.server_address[:2]
+    return {"proxyServer": f"http://{host}:{port}", "proxyBypassList": proxy_bypass_list(app_url)}
+
+
+class ContextDriver(webdriver.Chrome):
+    """A ChromeDriver session on the shared browser that drives a tab in its own browser context"""
+
+    def __init__(self, address, proxy=None):
+        options = Options()
+        options.debugger_address = address
+        logging_capabilities(options)
+        super().__init__(options=options)
+        self.proxy = proxy or {}
+        self.context_id = None
+        self.cdp = CdpSession(browser_websocket(address)).start()
+        self.reset_context()
+
+    def reset_context(self):
+        """Move to a tab in a brand-new context and dispose the previous one"""
+        previous = self.context_id
+        self.context_id = self.cdp.send("Target.createBrowserContext",
+                                        dict(self.proxy, disposeOnDetach=True))["browserContextId"]
+        target = self.cdp.send("Target.createTarget", {"url": "about:blank", "browserContextId": self.context_id})
+        self.switch_to.window(target["targetId"])
+        install_probes(self)
+        if previous:
+            self.cdp.send("Target.disposeBrowserContext", {"browserContextId": previous})
+
+    def quit(self):
+        try:
+            if self.context_id:
+                self.cdp.send("Target.disposeBrowserContext", {"browserContextId": self.context_id})
+        finally:
+            self.cdp.stop()
+            # An attached session detaches on quit; the shared browser keeps running
+            super().quit()
@@ -0,0 +1,412 @@
+"""Long-lived pool of warm headless Chrome browsers shared by pytest runs.
+
+    python browser_service.py start --size 2 --app-url http://localhost:5173
+    python browser_service.py status
+    python browser_service.py stop
+
+The service owns one chromedriver and `size` Chrome sessions. Each session
+has its own persistent profile and disk cache, and is warmed by loading the
+app once, so the Vite modules and fonts are already cached when a test run
+attaches. A pytest process leases a slot by creating its lease file
+exclusively, attaches to the running session over the WebDriver protocol,
+and gives the slot back when it is done instead of quitting Chrome.
+
+The browsers start before any mock backend exists, so each slot's proxy
+is a small forwarder owned by the service. The lease records
+where the leasing run wants the app's API calls to go.
+"""
+import argparse
+import http.client
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+from mock_backend import LIVE_ORIGIN, proxy_arguments
+from waits import install_probes
+
+SERVICE_DIR = os.environ.get(
+    "LOANFRONT_BROWSER_SERVICE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "loanfront-browsers"),
+)
+STATE_FILE = "service.json"
+HEALTH_INTERVAL = 5.0
+START_TIMEOUT = 60.0
+
+HOP_HEADERS = {"connection", "keep-alive", "proxy-connection", "proxy-authorization", "te", "trailer",
+               "transfer-encoding", "upgrade", "content-length"}
+
+
+def _pid_alive(pid):
+    if os.name == "nt":
+        import ctypes
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        code = ctypes.c_ulong()
+        ctypes.windll.kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return code.value == 259  # STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, data):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp, path)
+
+
+def lease_path(directory, index):
+    return os.path.join(directory, f"slot-{index}.lease")
+
+
+def take_lease(directory, index, api_target=None):
+    """Claim slot `index` for this process; False if another live process holds it"""
+    path = lease_path(directory, index)
+    for _ in range(2):
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            holder = _read_json(path)
+            # A lease caught mid-write has no content yet; only reclaim dead holders
+            if holder and not _pid_alive(holder.get("pid", 0)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            return False
+        with os.fdopen(fd, "w") as f:
+            json.dump({"pid": os.getpid(), "api_target": api_target}, f)
+        return True
+    return False
+
+
+def drop_lease(directory, index):
+    try:
+        os.remove(lease_path(directory, index))
+    except OSError:
+        pass
+
+
+def service_state(directory=SERVICE_DIR):
+    """The running service's state file contents, or None when no service is up"""
+    state = _read_json(os.path.join(directory, STATE_FILE))
+    if not state or not _pid_alive(state.get("pid", 0)):
+        return None
+    return state
+
+
+class RemoteChrome(webdriver.Remote):
+    """Remote WebDriver talking to chromedriver, with ChromeDriver's CDP passthrough.
+
+    With `session_id` it attaches to a session the service already started
+    rather than creating a new one, and quit() hands the slot back.
+    """
+
+    def __init__(self, executor, options, session_id=None, capabilities=None, lease=None):
+        self._attach_to = session_id
+        self._attach_caps = capabilities or {}
+        self._lease = lease
+        super().__init__(command_executor=executor, options=options)
+
+    def start_session(self, capabilities):
+        if self._attach_to is None:
+            return super().start_session(capabilities)
+        self.session_id = self._attach_to
+        self.caps = self._attach_caps
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        return self.execute("executeCdpCommand", {"cmd": cmd, "params": cmd_args})["value"]
+
+    def quit(self):
+        if self._lease is None:
+            return super().quit()
+        drop_lease(*self._lease)
+        self._lease = None
+
+
+def lease_browser(api_target=None, directory=SERVICE_DIR):
+    """Attach to a free warm browser from the service, or None if there is none"""
+    from driver_pool import chrome_options
+
+    if service_state(directory) is None:
+        return None
+    for index in range(len(service_state(directory)["slots"])):
+        if not take_lease(directory, index, api_target):
+            continue
+        # Read again under the lease: the service may have relaunched the slot meanwhile
+        state = service_state(directory)
+        slot = state["slots"][index] if state and index < len(state["slots"]) else None
+        if not slot or not slot.get("session_id"):
+            drop_lease(directory, index)
+            continue
+        try:
+            driver = RemoteChrome(
+                state["executor"], chrome_options(), slot["session_id"], slot.get("capabilities"),
+                lease=(directory, index),
+            )
+            if driver.execute_script("return 1;") == 1:
+                return driver
+        except Exception as e:
+            print(f"Browser service slot {index} is unusable: {e}")
+        drop_lease(directory, index)
+    return None
+
+
+class _ForwardHandler(BaseHTTPRequestHandler):
+    """Relays proxied API requests to the current lease holder's backend"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_OPTIONS(self):
+        self._forward()
+
+    def do_GET(self):
+        self._forward()
+
+    def do_POST(self):
+        self._forward()
+
+    def do_PUT(self):
+        self._forward()
+
+    def do_PATCH(self):
+        self._forward()
+
+    def do_DELETE(self):
+        self._forward()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _forward(self):
+        url = urlsplit(self.path)
+        lease = _read_json(self.server.lease_path) or {}
+        target = urlsplit(lease.get("api_target") or LIVE_ORIGIN)
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        headers = {k: v for k, v in self.headers.items() if k.lower() not in HOP_HEADERS}
+        if body:
+            headers["Content-Length"] = str(len(body))
+
+        connection = http.client.HTTPConnection(target.hostname, target.port, timeout=30)
+        try:
+            connection.request(self.command, url.path + (f"?{url.query}" if url.query else ""), body or None, headers)
+            response = connection.getresponse()
+            payload = response.read()
+        except OSError as e:
+            self.send_error(502, f"API backend unreachable: {e}")
+            return
+        finally:
+            connection.close()
+
+        self.send_response(response.status, response.reason)
+        for key, value in response.getheaders():
+            if key.lower() not in HOP_HEADERS:
+                self.send_header(key, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class BrowserService:
+    def __init__(self, size=2, app_url=None, directory=SERVICE_DIR):
+        self.size = max(1, size)
+        self.app_url = app_url.rstrip("/") if app_url else None
+        self.directory = directory
+        self.chromedriver = None
+        self.forwarders = []
+        self.drivers = [None] * self.size
+        self.stopping = threading.Event()
+
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self.chromedriver = Service()
+        self.chromedriver.start()
+        for index in range(self.size):
+            server = ThreadingHTTPServer(("127.0.0.1", 0), _ForwardHandler)
+            server.daemon_threads = True
+            server.lease_path = lease_path(self.directory, index)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self.forwarders.append(server)
+            drop_lease(self.directory, index)
+            self.launch(index)
+        self.write_state()
+        return self
+
+    def launch(self, index):
+        """Start (or restart) the Chrome of slot `index` and warm its cache"""
+        from driver_pool import chrome_options
+
+        profile = os.path.join(self.directory, f"profile-{index}")
+        options = chrome_options([
+            f"--user-data-dir={profile}",
+            f"--disk-cache-dir={os.path.join(profile, 'cache')}",
+            *proxy_arguments("127.0.0.1", self.forwarders[index].server_address[1], self.app_url),
+        ])
+        driver = RemoteChrome(self.chromedriver.service_url, options)
+        driver.maximize_window()
+        install_probes(driver)
+        if self.app_url:
+            self.warm(driver)
+        self.drivers[index] = driver
+
+    def warm(self, driver):
+        """Load the app's entry pages once so modules, styles and fonts land in the disk cache"""
+        for path in ("/login", "/signup"):
+            try:
+                driver.get(self.app_url + path)
+                driver.execute_async_script(
+                    "const done = arguments[arguments.length - 1];"
+                    "document.fonts.ready.then(() => done(true), () => done(false));"
+                )
+            except Exception as e:
+                print(f"Warm-up of {self.app_url}{path} failed: {e}")
+        driver.get("about:blank")
+
+    def write_state(self):
+        _write_json(os.path.join(self.directory, STATE_FILE), {
+            "pid": os.getpid(),
+            "executor": self.chromedriver.service_url,
+            "app_url": self.app_url,
+            "slots": [
+                {
+                    "index": index,
+                    "session_id": driver.session_id if driver else None,
+                    "capabilities": driver.caps if driver else None,
+                    "forward_port": self.forwarders[index].server_address[1],
+                }
+                for index, driver in enumerate(self.drivers)
+            ],
+        })
+
+    def check(self):
+        """Relaunch idle slots whose browser died; leased slots belong to their test run"""
+        changed = False
+        for index, driver in enumerate(self.drivers):
+            if not take_lease(self.directory, index):
+                continue
+            try:
+                healthy = driver is not None and driver.execute_script("return 1;") == 1
+            except Exception:
+                healthy = False
+            try:
+                if not healthy:
+                    print(f"Slot {index} is unhealthy, relaunching")
+                    try:
+                        driver.quit()
+                    except Exception:
+                        pass
+                    self.drivers[index] = None
+                    self.launch(index)
+                    changed = True
+            except Exception as e:
+                print(f"Relaunching slot {index} failed: {e}")
+            finally:
+                drop_lease(self.directory, index)
+        if changed:
+            self.write_state()
+
+    def serve(self):
+        while not self.stopping.wait(HEALTH_INTERVAL):
+            self.check()
+
+    def stop(self):
+        self.stopping.set()
+        try:
+            os.remove(os.path.join(self.directory, STATE_FILE))
+        except OSError:
+            pass
+        for driver in self.drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        for server in self.forwarders:
+            server.shutdown()
+            server.server_close()
+        if self.chromedriver:
+            self.chromedriver.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["start", "serve", "stop", "status"])
+    parser.add_argument("--size", type=int, default=2, help="Number of warm browsers")
+    parser.add_argument("--app-url", default=os.environ.get("LOANFRONT_BASE_URL"),
+                        help="Frontend to preload into the browser caches")
+    parser.add_argument("--dir", default=SERVICE_DIR, help="Profiles, leases and state file")
+    args = parser.parse_args(argv)
+
+    state = service_state(args.dir)
+    if args.command == "status":
+        print(json.dumps(state, indent=1) if state else "not running")
+    elif args.command == "stop":
+        if state:
+            os.kill(state["pid"], signal.SIGTERM)
+            print(f"stopped service {state['pid']}")
+        else:
+            print("not running")
+    elif args.command == "start":
+        if state:
+            sys.exit(f"already running as pid {state['pid']}")
+        command = [sys.executable, os.path.abspath(__file__), "serve", "--size", str(args.size), "--dir", args.dir]
+        if args.app_url:
+            command += ["--app-url", args.app_url]
+        if os.name == "nt":
+            detach = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+        else:
+            detach = {"start_new_session": True}
+        os.makedirs(args.dir, exist_ok=True)
+        with open(os.path.join(args.dir, "service.log"), "a") as log:
+            process = subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.abspath(__file__)), **detach)
+        deadline = time.monotonic() + START_TIMEOUT
+        while time.monotonic() < deadline:
+            state = service_state(args.dir)
+            if state and state["pid"] == process.pid:
+                print(f"service running as pid {process.pid} with {len(state['slots'])} browsers")
+                return
+            if process.poll() is not None:
+                break
+            time.sleep(0.2)
+        sys.exit(f"service did not start, see {os.path.join(args.dir, 'service.log')}")
+    else:
+        service = BrowserService(args.size, args.app_url, args.dir)
+        signal.signal(signal.SIGTERM, lambda *_: service.stopping.set())
+        try:
+            service.start()
+            print(f"serving {service.size} browsers from {args.dir}", flush=True)
+            service.serve()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            service.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""Record and replay the app's API traffic per test through CDP Fetch interception.
+
+In record mode, every request to the API origin (127.0.0.1:8000/api, also
+when the mock backend answers it through the proxy) is paused at the
+response stage. Its body is read and the response is let through. At the
+end of the test, the exchanges go into that test's cassette, a gzipped JSON
+file under cassettes/.
+
+In replay mode, the test's cassette is loaded into memory and the same
+requests are paused at the request stage and fulfilled from it, so nothing
+reaches the network. Requests are matched on a configurable subset of
+method, path, query and body. When a key was recorded several times (a list
+fetched before and after an approval), the responses are served in recorded
+order and the last one is repeated. Unmatched requests fail like an
+unreachable server and are listed at teardown.
+
+Selenium's execute_cdp_cmd cannot receive events, so each cassette opens a
+CdpSession to the test's page target (alongside ChromeDriver's) and handles
+Fetch.requestPaused on that session's thread. Windows that a test opens
+later are not intercepted.
+"""
+import base64
+import gzip
+import json
+import os
+import re
+from collections import defaultdict, deque
+from urllib.parse import parse_qsl, urlsplit
+
+from auth_session import TokenCache
+from cdp_session import CdpError, CdpSession, page_websocket
+
+CASSETTE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cassettes")
+API_PATTERN = "http://127.0.0.1:8000/api/*"
+MATCH_FIELDS = ("method", "path", "query", "body")
+# Recorded response headers; the rest describe the recording server, not the contract
+KEPT_HEADERS = {"content-type", "access-control-allow-credentials", "access-control-allow-headers",
+                "access-control-allow-methods"}
+AUTH_FILE = "_auth.json"
+
+
+class CassetteUnavailable(Exception):
+    """The browser exposes no DevTools endpoint to intercept with"""
+
+
+def parse_match(value):
+    fields = tuple(field.strip() for field in value.split(",") if field.strip())
+    unknown = set(fields) - set(MATCH_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown cassette match fields {sorted(unknown)}, expected some of {MATCH_FIELDS}")
+    return fields
+
+
+def _canonical_body(body):
+    if not body:
+        return ""
+    try:
+        return json.dumps(json.loads(body), sort_keys=True, separators=(",", ":"))
+    except ValueError:
+        return body
+
+
+def request_key(method, url, body, fields):
+    """The parts of a request that `fields` says must match"""
+    parts = urlsplit(url)
+    values = {
+        "method": method.upper(),
+        "path": parts.path,
+        "query": "&".join(f"{k}={v}" for k, v in sorted(parse_qsl(parts.query, keep_blank_values=True))),
+        "body": _canonical_body(body),
+    }
+    return " ".join(values[field] for field in fields)
+
+
+def cassette_path(directory, nodeid):
+    """cassettes/<module>/<Class>__<test>[params].json.gz for a test node id"""
+    module, _, name = nodeid.partition("::")
+    module = os.path.splitext(os.path.basename(module))[0]
+    name = re.sub(r"[^\w.\[\]-]+", "_", name.replace("::", "__"))
+    return os.path.join(directory, module, f"{name}.json.gz")
+
+
+class Cassette:
+    """The recorded API exchanges of one test"""
+
+    def __init__(self, path, mode, match):
+        self.path = path
+        self.mode = mode
+        self.match = match
+        self.entries = []
+        self.misses = []
+        self._queues = defaultdict(deque)
+        self._session = None
+        if mode == "replay":
+            with gzip.open(path, "rt") as f:
+                self.entries = json.load(f)["entries"]
+            for entry in self.entries:
+                self._queues[request_key(entry["method"], entry["url"], entry["body"], match)].append(entry)
+
+    def attach(self, driver):
+        stage = "Response" if self.mode == "record" else "Request"
+        try:
+            self._session = CdpSession(page_websocket(driver), {"Fetch.requestPaused": self._paused}).start()
+            self._session.send("Fetch.enable", {"patterns": [{"urlPattern": API_PATTERN, "requestStage": stage}]})
+        except (CdpError, OSError) as e:
+            self.detach()
+            raise CassetteUnavailable(f"could not enable Fetch interception: {e}")
+        return self
+
+    def detach(self):
+        if self._session:
+            self._session.stop()
+            self._session = None
+        if self.mode == "record":
+            self.save()
+        elif self.misses:
+            print(f"{len(self.misses)} API requests had no recorded response in {self.path}:")
+            for miss in self.misses:
+                print(f"    {miss}")
+
+    async def _paused(self, session, params):
+        try:
+            await (self._record if self.mode == "record" else self._replay)(session, params)
+        except Exception as e:
+            print(f"Cassette interception of {params['request']['url']} failed: {e}")
+            await session.call("Fetch.continueRequest", {"requestId": params["requestId"]})
+
+    async def _record(self, session, params):
+        request = params["request"]
+        if request["method"] == "OPTIONS":
+            await session.call("Fetch.continueRequest", {"requestId": params["requestId"]})
+            return
+        entry = {"method": request["method"], "url": request["url"], "body": request.get("postData"),
+                 "status": params.get("responseStatusCode"), "headers": {}, "response": None}
+        if params.get("responseErrorReason"):
+            entry["error"] = params["responseErrorReason"]
+        else:
+            entry["headers"] = {h["name"].lower(): h["value"] for h in params.get("responseHeaders", [])
+                                if h["name"].lower() in KEPT_HEADERS}
+            if entry["status"] not in (204, 304):
+                result = await session.call("Fetch.getResponseBody", {"requestId": params["requestId"]})
+                entry["response"] = result["body"]
+                entry["base64"] = result["base64Encoded"]
+        self.entries.append(entry)
+        await session.call("Fetch.continueRequest", {"requestId": params["requestId"]})
+
+    async def _replay(self, session, params):
+        request = params["request"]
+        origin = {k.lower(): v for k, v in request.get("headers", {}).items()}.get("origin", "*")
+        if request["method"] == "OPTIONS":
+            # CORS preflight: allow whatever the app asks for
+            await session.call("Fetch.fulfillRequest", {"requestId": params["requestId"], "responseCode": 204,
+                                                            "responseHeaders": self._cors_headers({}, origin)})
+            return
+        key = request_key(request["method"], request["url"], request.get("postData"), self.match)
+        queue = self._queues.get(key)
+        if not queue:
+            self.misses.append(key)
+            await session.call("Fetch.failRequest", {"requestId": params["requestId"],
+                                                         "errorReason": "ConnectionRefused"})
+            return
+        entry = queue.popleft() if len(queue) > 1 else queue[0]
+        if entry.get("error"):
+            await session.call("Fetch.failRequest", {"requestId": params["requestId"],
+                                                         "errorReason": entry["error"]})
+            return
+        body = entry["response"] or ""
+        if not entry.get("base64"):
+            body = base64.b64encode(body.encode()).decode()
+        await session.call("Fetch.fulfillRequest", {
+            "requestId": params["requestId"], "responseCode": entry["status"],
+            "responseHeaders": self._cors_headers(entry["headers"], origin), "body": body,
+        })
+
+    @staticmethod
+    def _cors_headers(headers, origin):
+        # The app may be served from a different origin than when the cassette was recorded
+        headers = dict(headers, **{"access-control-allow-origin": origin})
+        headers.setdefault("access-control-allow-credentials", "true")
+        headers.setdefault("access-control-allow-headers", "Authorization, Content-Type")
+        headers.setdefault("access-control-allow-methods", "GET, POST, PUT, PATCH, DELETE, OPTIONS")
+        return [{"name": name, "value": value} for name, value in sorted(headers.items())]
+
+    def save(self):
+        if not self.entries:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # mtime=0 keeps re-recorded cassettes byte-identical when nothing changed
+        with open(self.path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+            f.write(json.dumps({"entries": self.entries}, separators=(",", ":")).encode())
+
+
+class CassetteLibrary:
+    """Session-wide cassette settings; hands out one Cassette per test"""
+
+    def __init__(self, mode="off", directory=CASSETTE_DIR, match=MATCH_FIELDS):
+        self.mode = mode
+        self.directory = directory
+        self.match = match
+
+    def path_for(self, nodeid):
+        return cassette_path(self.directory, nodeid)
+
+    def has(self, nodeid):
+        return os.path.exists(self.path_for(nodeid))
+
+    def attach(self, driver, nodeid):
+        """Start recording or replaying for a test, or None when cassettes are off"""
+        if self.mode == "off":
+            return None
+        return Cassette(self.path_for(nodeid), self.mode, self.match).attach(driver)
+
+
+class RecordedTokens(TokenCache):
+    """Login tokens that are saved while recording and served from disk on replay, so
+    BaseTest.login_via_api works without a backend"""
+
+    def __init__(self, api_url, library):
+        super().__init__(api_url)
+        self.library = library
+        self.path = os.path.join(library.directory, AUTH_FILE)
+        self.recorded = {}
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                self.recorded = json.load(f)
+
+    def get(self, email, password):
+        if self.library.mode == "replay" and email in self.recorded:
+            return self.recorded[email]
+        session = super().get(email, password)
+        if self.library.mode == "record":
+            self.recorded[email] = session
+        return session
+
+    def close(self):
+        if self.library.mode == "record" and self.recorded:
+            os.makedirs(self.library.directory, exist_ok=True)
+            with open(self.path, "w") as f:
+                json.dump(self.recorded, f, indent=1, sort_keys=True)
+        super().close()
@@ -0,0 +1,121 @@
+"""A DevTools protocol connection that can receive events.
+
+ChromeDriver's execute_cdp_cmd sends commands but never delivers events,
+and only reaches the window the session is switched to. CdpSession opens
+its own websocket to a page or browser target (Chrome accepts several
+clients per target). It runs the connection with trio on a background
+thread. Event handlers are coroutines that run on that thread and can
+await further commands. Other threads use send().
+"""
+import json
+import threading
+
+import requests
+import trio
+import trio_websocket
+
+# Bodies of the large scale_* tables run into tens of MB
+MAX_MESSAGE_SIZE = 256 * 1024 * 1024
+
+
+class CdpError(Exception):
+    pass
+
+
+def debugger_address(driver):
+    address = (driver.capabilities.get("goog:chromeOptions") or {}).get("debuggerAddress")
+    if not address:
+        raise CdpError("browser reports no goog:chromeOptions.debuggerAddress")
+    return address
+
+
+def browser_websocket(address):
+    return requests.get(f"http://{address}/json/version", timeout=5).json()["webSocketDebuggerUrl"]
+
+
+def page_websocket(driver):
+    """DevTools websocket of the window the driver is switched to"""
+    address = debugger_address(driver)
+    # ChromeDriver's window handles are DevTools target ids
+    handle = driver.current_window_handle
+    for target in requests.get(f"http://{address}/json/list", timeout=5).json():
+        if target.get("id") == handle:
+            return target["webSocketDebuggerUrl"]
+    raise CdpError(f"no DevTools target for window {handle}")
+
+
+class CdpSession:
+    """One websocket to a DevTools target; `handlers` maps event names to `async handler(session, params)`"""
+
+    def __init__(self, ws_url, handlers=None):
+        self.ws_url = ws_url
+        self.handlers = handlers or {}
+        self._ready = threading.Event()
+        self._error = None
+        self._ws = None
+        self._ids = 0
+        self._replies = {}
+        self._trio_token = None
+        self._scope = None
+        self._thread = None
+
+    def start(self, timeout=10):
+        self._thread = threading.Thread(target=trio.run, args=(self._main,), daemon=True, name="cdp-session")
+        self._thread.start()
+        if not self._ready.wait(timeout) or self._error:
+            raise CdpError(f"could not connect to {self.ws_url}: {self._error or 'timed out'}")
+        return self
+
+    def stop(self):
+        if self._trio_token and self._thread.is_alive():
+            try:
+                trio.from_thread.run_sync(self._scope.cancel, trio_token=self._trio_token)
+            except trio.RunFinishedError:
+                pass
+        if self._thread:
+            self._thread.join(5)
+
+    async def call(self, method, params=None):
+        """Send a command and wait for its result (on the session's thread)"""
+        self._ids += 1
+        reply = self._replies[self._ids] = {"done": trio.Event()}
+        await self._ws.send_message(json.dumps({"id": self._ids, "method": method, "params": params or {}}))
+        await reply["done"].wait()
+        if "error" in reply:
+            raise CdpError(f"{method}: {reply['error'].get('message')}")
+        return reply["result"]
+
+    def send(self, method, params=None):
+        """Send a command from any other thread and block until its result arrives"""
+        return trio.from_thread.run(self.call, method, params, trio_token=self._trio_token)
+
+    async def _main(self):
+        self._trio_token = trio.lowlevel.current_trio_token()
+        try:
+            async with trio_websocket.open_websocket_url(self.ws_url, max_message_size=MAX_MESSAGE_SIZE) as ws:
+                self._ws = ws
+                with trio.CancelScope() as self._scope:
+                    async with trio.open_nursery() as nursery:
+                        nursery.start_soon(self._read, nursery)
+                        self._ready.set()
+        except Exception as e:
+            self._error = e
+        finally:
+            self._ready.set()
+
+    async def _read(self, nursery):
+        while True:
+            message = json.loads(await self._ws.get_message())
+            if "id" in message:
+                reply = self._replies.pop(message["id"], None)
+                if reply is not None:
+                    reply.update({k: v for k, v in message.items() if k in ("result", "error")})
+                    reply["done"].set()
+            elif message.get("method") in self.handlers:
+                nursery.start_soon(self._dispatch, message["method"], message.get("params", {}))
+
+    async def _dispatch(self, method, params):
+        try:
+            await self.handlers[method](self, params)
+        except Exception as e:
+            print(f"CDP handler for {method} failed: {e}")
@@ -0,0 +1,520 @@
+import functools
+import os
+
+import pytest
+
+from api_contract import ApiClient
+from auth_session import API_URL, TokenCache
+from artifacts import HISTORY, ArtifactWriter
+from backend_state import BackendState, StateUnsupported
+from browser_contexts import SHARED_BROWSER_ENV, ContextDriver, SharedBrowser, context_proxy
+from cassettes import CASSETTE_DIR, MATCH_FIELDS, CassetteLibrary, RecordedTokens, parse_match
+from base_test import BASE_URL
+from emulation import PROFILES, parse_rules
+from driver_pool import DriverPool, chrome_options, launch_chrome, pool_size_from_env, service_or_local
+from impact_map import IMPACT_MAP_FILE, ImpactRecorder, changed_files, impacted, load_map
+from mock_backend import MockBackend, chrome_arguments
+from network_log import NetworkReport
+from preflight import Preflight, probe_api, probe_browser, probe_frontend
+from profiler import ProfileCollector, ProfilerPlugin
+from results_log import ResultsLog, ini_markers
+from route_metrics import ROUTE_BASELINE_FILE, RouteMetricsReport
+from scale_bench import BenchmarkReport
+from selector_cache import SELECTOR_CACHE_FILE, SelectorCache
+from sharding import (
+    DURATIONS_FILE, DurationRecorder, load_durations, make_duration_scheduler, parse_shard, partition,
+    resolve_base_url, worker_index,
+)
+from static_bundle import StaticServer, build_bundle
+from waits import WaitRecorder
+
+wait_recorder_key = pytest.StashKey()
+shared_browser_key = pytest.StashKey()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("loanfront", "Loan app Selenium harness")
+    group.addoption(
+        "--pool-size",
+        type=int,
+        default=pool_size_from_env(),
+        help="Number of browsers kept warm per session/xdist worker (env: LOANFRONT_POOL_SIZE)",
+    )
+    group.addoption(
+        "--browser-service",
+        choices=["auto", "off"],
+        default=os.environ.get("LOANFRONT_BROWSER_SERVICE", "auto"),
+        help="Attach to warm browsers from a running browser_service.py, or always launch locally "
+             "(env: LOANFRONT_BROWSER_SERVICE)",
+    )
+    group.addoption(
+        "--browser-contexts",
+        action="store_true",
+        default=os.environ.get("LOANFRONT_BROWSER_CONTEXTS") == "1",
+        help="Run every worker's tests in isolated browser contexts of one shared Chrome instead of a Chrome "
+             "per worker; combine with -n N (env: LOANFRONT_BROWSER_CONTEXTS=1)",
+    )
+    group.addoption(
+        "--backend",
+        choices=["mock", "live"],
+        default=os.environ.get("LOANFRONT_BACKEND", "mock"),
+        help="Serve the API from the in-process mock or use the live server at 127.0.0.1:8000 (env: LOANFRONT_BACKEND)",
+    )
+    group.addoption(
+        "--app-url",
+        default=os.environ.get("LOANFRONT_BASE_URL", BASE_URL),
+        help="Frontend URL; may contain {worker} or be a comma-separated list, one per xdist worker "
+             "(env: LOANFRONT_BASE_URL)",
+    )
+    group.addoption(
+        "--frontend",
+        choices=["dev", "bundle"],
+        default=os.environ.get("LOANFRONT_FRONTEND", "dev"),
+        help="Test against --app-url (the Vite dev server), or build the app once and serve dist/ locally "
+             "(env: LOANFRONT_FRONTEND)",
+    )
+    group.addoption(
+        "--cassettes",
+        choices=["off", "record", "replay"],
+        default=os.environ.get("LOANFRONT_CASSETTES", "off"),
+        help="Record each UI test's API responses to disk, or replay them instead of calling a backend "
+             "(env: LOANFRONT_CASSETTES)",
+    )
+    group.addoption(
+        "--cassette-dir",
+        default=CASSETTE_DIR,
+        help="Where per-test cassettes are stored",
+    )
+    group.addoption(
+        "--cassette-match",
+        type=parse_match,
+        default=MATCH_FIELDS,
+        help=f"Comma-separated request parts a replayed response must match (default: {','.join(MATCH_FIELDS)})",
+    )
+    group.addoption(
+        "--durations-path",
+        default=DURATIONS_FILE,
+        help="JSON file of historical per-test durations used to balance xdist workers and --shard",
+    )
+    group.addoption(
+        "--store-durations",
+        action="store_true",
+        help="Record this run's per-test durations into --durations-path",
+    )
+    group.addoption(
+        "--selector-cache",
+        default=SELECTOR_CACHE_FILE,
+        help="JSON file remembering which fallback selector matched on each route",
+    )
+    group.addoption(
+        "--results-log",
+        help="Append one JSON line per finished test to this file",
+    )
+    group.addoption(
+        "--split-reports",
+        metavar="DIR",
+        help="Render the full, per-marker and per-module HTML reports from --results-log into DIR",
+    )
+    group.addoption(
+        "--route-metrics",
+        metavar="PATH",
+        help="Collect per-route load metrics (navigation timing, LCP, CLS, long tasks, first table row) into PATH",
+    )
+    group.addoption(
+        "--route-baseline",
+        default=ROUTE_BASELINE_FILE,
+        help="Stored per-route medians that --route-metrics is compared against",
+    )
+    group.addoption(
+        "--route-threshold",
+        type=float,
+        default=0.2,
+        help="Fail the run when a route metric's median exceeds its baseline by more than this fraction",
+    )
+    group.addoption(
+        "--update-route-baseline",
+        action="store_true",
+        help="Write this run's per-route medians to --route-baseline instead of comparing",
+    )
+    group.addoption(
+        "--network-report",
+        metavar="PATH",
+        help="Write per-route API call counts, bytes, overlap and duplicate requests to PATH",
+    )
+    group.addoption(
+        "--emulate",
+        action="append",
+        metavar="[MARKER=]PROFILE",
+        help=f"Run every test, or the tests with MARKER, under a device/network profile "
+             f"({', '.join(PROFILES)}); repeatable. A test's own emulate mark takes precedence",
+    )
+    group.addoption(
+        "--preflight",
+        choices=["abort", "skip", "off"],
+        default=os.environ.get("LOANFRONT_PREFLIGHT", "abort"),
+        help="Before the first test, check that the frontend, the live API and Chrome/chromedriver work; "
+             "end the session (abort) or skip the tests that need a broken one (env: LOANFRONT_PREFLIGHT)",
+    )
+    group.addoption(
+        "--preflight-wait",
+        type=float,
+        default=float(os.environ.get("LOANFRONT_PREFLIGHT_WAIT", 0)),
+        metavar="SECONDS",
+        help="Keep retrying failed preflight checks this long, e.g. while the dev server starts "
+             "(env: LOANFRONT_PREFLIGHT_WAIT)",
+    )
+    group.addoption(
+        "--artifacts",
+        metavar="DIR",
+        help="Save a screenshot, HAR, console log, DOM and the last WebDriver commands of every failed test "
+             "under DIR; passing tests write nothing",
+    )
+    group.addoption(
+        "--artifact-history",
+        type=int,
+        default=HISTORY,
+        metavar="N",
+        help=f"WebDriver commands and console messages kept per test for --artifacts (default {HISTORY})",
+    )
+    group.addoption(
+        "--leak-cycles",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Run the @leak_check tests, cycling each route loop N times after warm-up (10+ for a stable trend)",
+    )
+    group.addoption(
+        "--leak-routes",
+        metavar="PATHS",
+        help="Comma-separated route cycle replacing the leak check's default for that dashboard, "
+             "e.g. /admin/dashboard,/admin/loans",
+    )
+    group.addoption(
+        "--benchmarks",
+        metavar="PATH",
+        help="Run the @benchmark tests (large scale_* datasets, slow) and write their results to PATH",
+    )
+    group.addoption(
+        "--record-impact",
+        action="store_true",
+        help="Collect JS coverage per UI test and update --impact-map with the routes and src/ modules it ran",
+    )
+    group.addoption(
+        "--impact-map",
+        default=IMPACT_MAP_FILE,
+        help="JSON map from each test to the routes and src/ modules it exercises",
+    )
+    group.addoption(
+        "--impact-since",
+        metavar="REF",
+        default=os.environ.get("LOANFRONT_IMPACT_SINCE"),
+        help="Run only the tests impacted by files changed since git REF, per --impact-map "
+             "(env: LOANFRONT_IMPACT_SINCE)",
+    )
+    group.addoption(
+        "--profile-harness",
+        metavar="PATH",
+        help="Attribute each test's wall time to harness phases and write the profile as JSON to PATH",
+    )
+    group.addoption(
+        "--profile-top",
+        type=int,
+        default=10,
+        help="How many of the slowest categories and test phases to print with --profile-harness",
+    )
+    group.addoption(
+        "--shard",
+        default=os.environ.get("LOANFRONT_SHARD"),
+        help="Run only shard K of N (e.g. 2/4), balanced by recorded durations (env: LOANFRONT_SHARD)",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "pristine: run the test in a freshly launched browser instead of a pooled one")
+    config.addinivalue_line("markers", "scenario(name): load a named dataset from scenarios.py into the backend before the test")
+    config.addinivalue_line("markers", "emulate(profile): run the test under a device/network profile from emulation.py")
+    try:
+        parse_rules(config.getoption("--emulate"))
+    except ValueError as e:
+        # Fail before any browser starts, not once per test
+        raise pytest.UsageError(f"--emulate: {e}")
+    if config.getoption("--shard"):
+        try:
+            parse_shard(config.getoption("--shard"))
+        except ValueError as e:
+            raise pytest.UsageError(f"--shard: {e}")
+    config.stash[wait_recorder_key] = WaitRecorder()
+    if config.getoption("--browser-contexts") and not config.option.collectonly and not hasattr(config, "workerinput"):
+        config.stash[shared_browser_key] = SharedBrowser(chrome_options()).start()
+    if config.getoption("--results-log") and not config.option.collectonly and not hasattr(config, "workerinput"):
+        config.pluginmanager.register(ResultsLog(
+            config.getoption("--results-log"), ini_markers(config), config.getoption("--split-reports"),
+        ), "results-log")
+    if config.getoption("--route-metrics") and not config.option.collectonly and not hasattr(config, "workerinput"):
+        config.pluginmanager.register(RouteMetricsReport(
+            config.getoption("--route-metrics"), config.getoption("--route-baseline"),
+            config.getoption("--route-threshold"), config.getoption("--update-route-baseline"),
+        ), "route-metrics")
+    if config.getoption("--network-report") and not config.option.collectonly and not hasattr(config, "workerinput"):
+        config.pluginmanager.register(NetworkReport(config.getoption("--network-report")), "network-report")
+    if config.getoption("--benchmarks") and not config.option.collectonly and not hasattr(config, "workerinput"):
+        config.pluginmanager.register(BenchmarkReport(config.getoption("--benchmarks")), "benchmark-report")
+    if config.getoption("--record-impact") and not config.option.collectonly and not hasattr(config, "workerinput"):
+        config.pluginmanager.register(ImpactRecorder(config.getoption("--impact-map")), "impact-recorder")
+    if config.getoption("--profile-harness") and not config.option.collectonly:
+        if getattr(config.option, "numprocesses", None) is None or hasattr(config, "workerinput"):
+            config.pluginmanager.register(ProfilerPlugin(), "harness-profiler")
+        if not hasattr(config, "workerinput"):
+            config.pluginmanager.register(ProfileCollector(
+                config.getoption("--profile-harness"), config.getoption("--profile-top"),
+            ), "harness-profile-collector")
+    if config.getoption("--store-durations") and not hasattr(config, "workerinput"):
+        # Reports from xdist workers are replayed on the controller, so it sees every test
+        config.pluginmanager.register(DurationRecorder(config.getoption("--durations-path")), "duration-recorder")
+
+
+def pytest_unconfigure(config):
+    browser = config.stash.get(shared_browser_key, None)
+    if browser:
+        browser.stop()
+
+
+def pytest_collection_modifyitems(config, items):
+    if not config.getoption("--benchmarks"):
+        skip = pytest.mark.skip(reason="benchmark; run with --benchmarks=PATH")
+        for item in items:
+            if item.get_closest_marker("benchmark"):
+                item.add_marker(skip)
+    if not config.getoption("--leak-cycles"):
+        skip = pytest.mark.skip(reason="leak check; run with --leak-cycles=N")
+        for item in items:
+            if item.get_closest_marker("leak_check"):
+                item.add_marker(skip)
+
+    since = config.getoption("--impact-since")
+    if since:
+        selected, reason = impacted([item.nodeid for item in items], load_map(config.getoption("--impact-map")),
+                                    changed_files(since))
+        config.hook.pytest_deselected(items=[item for item in items if item.nodeid not in selected])
+        items[:] = [item for item in items if item.nodeid in selected]
+        reporter = config.pluginmanager.get_plugin("terminalreporter")
+        if reporter:
+            reporter.write_line(f"impact since {since}: {len(items)} tests selected ({reason})")
+
+    shard = config.getoption("--shard")
+    if not shard:
+        return
+    index, count = parse_shard(shard)
+    durations = load_durations(config.getoption("--durations-path"))
+    bins, _ = partition([item.nodeid for item in items], durations, count)
+    selected = set(bins[index])
+    config.hook.pytest_deselected(items=[item for item in items if item.nodeid not in selected])
+    items[:] = [item for item in items if item.nodeid in selected]
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Keep each phase's report on the item (item.rep_call) so fixtures can see whether the test failed"""
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    if config.getoption("dist") != "load":
+        return None
+    durations = load_durations(config.getoption("--durations-path"))
+    if not durations:
+        return None
+    return make_duration_scheduler(durations)(config, log)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    recorder = config.stash.get(wait_recorder_key, None)
+    if not recorder or not recorder.records:
+        return
+    terminalreporter.section("readiness waits")
+    terminalreporter.write_line(f"{len(recorder.records)} waits, {recorder.total():.2f}s total")
+    for label, (count, seconds) in recorder.by_label()[:10]:
+        terminalreporter.write_line(f"{seconds:8.2f}s  {count:4d}x  {label}")
+
+
+@pytest.fixture(scope="session")
+def mock_backend(request):
+    """In-memory stand-in for the Django API on a free port, or None with --backend=live"""
+    if request.config.getoption("--backend") != "mock":
+        yield None
+        return
+    backend = MockBackend().start()
+    yield backend
+    backend.stop()
+
+
+@pytest.fixture(scope="session")
+def api_url(mock_backend):
+    return mock_backend.api_url if mock_backend else API_URL
+
+
+@pytest.fixture(scope="session")
+def frontend_bundle(request):
+    """Static server for the production build with --frontend=bundle, else None"""
+    if request.config.getoption("--frontend") != "bundle":
+        yield None
+        return
+    server = StaticServer(build_bundle()).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def base_url(request, frontend_bundle):
+    """This worker's frontend URL"""
+    if frontend_bundle:
+        return frontend_bundle.url
+    return resolve_base_url(request.config.getoption("--app-url"), worker_index(request.config))
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request, mock_backend, base_url):
+    """Browsers launched once per session (once per xdist worker) and leased to tests"""
+    extra_arguments = chrome_arguments(mock_backend, base_url) if mock_backend else ()
+    launch = functools.partial(launch_chrome, extra_arguments)
+    factory = launch
+    if request.config.getoption("--browser-contexts"):
+        proxy = context_proxy(mock_backend, base_url) if mock_backend else None
+        factory = functools.partial(ContextDriver, os.environ[SHARED_BROWSER_ENV], proxy)
+    # Cassettes need the browser's DevTools address, which only local launches report
+    elif request.config.getoption("--browser-service") == "auto" and request.config.getoption("--cassettes") == "off":
+        factory = functools.partial(service_or_local, mock_backend.url if mock_backend else None, extra_arguments)
+    pool = DriverPool(
+        size=request.config.getoption("--pool-size"),
+        factory=factory,
+        origins=[base_url],
+        pristine_factory=launch,
+    )
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="session")
+def cassettes(pytestconfig):
+    """Per-test API record/replay settings"""
+    return CassetteLibrary(
+        pytestconfig.getoption("--cassettes"), pytestconfig.getoption("--cassette-dir"),
+        pytestconfig.getoption("--cassette-match"),
+    )
+
+
+@pytest.fixture(scope="session")
+def auth_tokens(api_url, cassettes):
+    """Backend login tokens cached per account for the whole session; recorded alongside cassettes"""
+    cache = TokenCache(api_url) if cassettes.mode == "off" else RecordedTokens(api_url, cassettes)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture(scope="session")
+def preflight(pytestconfig):
+    """Results of probing this worker's frontend, the live API and the local Chrome"""
+    probes = {}
+    if pytestconfig.getoption("--preflight") != "off":
+        if pytestconfig.getoption("--frontend") == "dev":
+            url = resolve_base_url(pytestconfig.getoption("--app-url"), worker_index(pytestconfig))
+            probes["frontend"] = (f"frontend {url}", probe_frontend, (url,))
+        # The mock answers in-process, and replayed cassettes need no API at all
+        if pytestconfig.getoption("--backend") == "live" and pytestconfig.getoption("--cassettes") != "replay":
+            probes["api"] = (f"api {API_URL}", probe_api, (API_URL,))
+        probes["browser"] = ("browser", probe_browser, ())
+    return Preflight(probes, pytestconfig.getoption("--preflight-wait"), pytestconfig.getoption("--preflight"),
+                     hasattr(pytestconfig, "workerinput")).run()
+
+
+@pytest.fixture(scope="session")
+def api_client(preflight, api_url, auth_tokens):
+    """Keep-alive HTTP client for the headless API contract tests"""
+    preflight.require("api")
+    client = ApiClient(api_url, auth_tokens)
+    yield client
+    client.close()
+
+
+@pytest.fixture(scope="session")
+def wait_recorder(pytestconfig):
+    """Where BaseTest.wait_until_settled records the time each wait blocked"""
+    return pytestconfig.stash[wait_recorder_key]
+
+
+@pytest.fixture(scope="session")
+def collect_route_metrics(pytestconfig):
+    """Whether tests record per-route load metrics"""
+    return bool(pytestconfig.getoption("--route-metrics"))
+
+
+@pytest.fixture(scope="session")
+def record_impact(pytestconfig):
+    """Whether tests collect JS coverage for the impact map"""
+    return pytestconfig.getoption("--record-impact")
+
+
+@pytest.fixture(scope="session")
+def record_network(pytestconfig):
+    """Whether tests ship their per-route API usage to --network-report"""
+    return bool(pytestconfig.getoption("--network-report"))
+
+
+@pytest.fixture(scope="session")
+def artifact_writer(pytestconfig):
+    """Background writer for failure artifacts, or None without --artifacts"""
+    if not pytestconfig.getoption("--artifacts"):
+        yield None
+        return
+    writer = ArtifactWriter(os.path.abspath(pytestconfig.getoption("--artifacts")))
+    yield writer
+    writer.close()
+
+
+@pytest.fixture(scope="session")
+def emulation_rules(pytestconfig):
+    """(marker, Profile) pairs from --emulate"""
+    return parse_rules(pytestconfig.getoption("--emulate"))
+
+
+@pytest.fixture(scope="session")
+def selector_cache(pytestconfig):
+    """Fallback-selector winners learned per route, saved for the next run"""
+    cache = SelectorCache(pytestconfig.getoption("--selector-cache"))
+    yield cache
+    cache.save()
+
+
+@pytest.fixture(scope="session")
+def backend_state(api_url):
+    state = BackendState(api_url)
+    yield state
+    state.close()
+
+
+@pytest.fixture(autouse=True)
+def isolated_backend_data(request, backend_state, cassettes):
+    """Apply the test's scenario marker (if any) and roll backend data back afterwards"""
+    if cassettes.mode == "replay":
+        # Replayed responses already reflect the scenario they were recorded with
+        yield
+        return
+    marker = request.node.get_closest_marker("scenario")
+    try:
+        snapshot_id = backend_state.snapshot()
+    except StateUnsupported as e:
+        if marker:
+            pytest.skip(f"scenario '{marker.args[0]}' needs test-state endpoints: {e}")
+        yield
+        return
+
+    try:
+        if marker:
+            backend_state.apply(marker.args[0])
+        yield
+    finally:
+        # Also undoes whatever a scenario that failed halfway managed to load
+        backend_state.restore(snapshot_id)
@@ -0,0 +1,166 @@
+"""Indexed snapshot of the rendered page for text and structure assertions.
+
+`driver.page_source` serialises and ships the whole DOM each time it is
+read. A DomSnapshot instead captures the visible text and the visible
+elements (role, key attributes, text) once, indexes them locally and
+answers contains/count/find from the index. Every query first asks the
+page for its version (URL, document id and the probe's mutation counter
+from waits.PROBE_SCRIPT). If the page has not changed, that is the whole
+round-trip. After a navigation or a DOM mutation, the same call returns a
+fresh capture.
+"""
+import re
+from collections import defaultdict
+
+# Attributes worth indexing; everything else is styling noise
+INDEXED_ATTRIBUTES = ["id", "class", "name", "type", "placeholder", "href", "aria-label", "title", "data-testid"]
+
+CAPTURE_SCRIPT = """
+const known = arguments[0];
+const attributes = arguments[1];
+const probe = window.__loanfront;
+const version = probe ? [location.href, probe.document, probe.mutations].join('|') : null;
+if (version !== null && version === known) return {version: version, unchanged: true};
+
+const IMPLICIT_ROLES = {
+  A: 'link', BUTTON: 'button', SELECT: 'combobox', TEXTAREA: 'textbox', TABLE: 'table', TR: 'row',
+  TD: 'cell', TH: 'columnheader', FORM: 'form', NAV: 'navigation', UL: 'list', OL: 'list', LI: 'listitem',
+  H1: 'heading', H2: 'heading', H3: 'heading', H4: 'heading', H5: 'heading', H6: 'heading',
+  IMG: 'img', DIALOG: 'dialog', LABEL: 'label', OPTION: 'option',
+};
+const INPUT_ROLES = {checkbox: 'checkbox', radio: 'radio', submit: 'button', button: 'button', search: 'searchbox'};
+// Roles whose whole text is their label; other elements only index their own text nodes
+const LABELLED = new Set(['link', 'button', 'heading', 'cell', 'columnheader', 'option', 'label', 'listitem']);
+
+function roleOf(element) {
+  const explicit = element.getAttribute('role');
+  if (explicit) return explicit;
+  if (element.tagName === 'INPUT') return INPUT_ROLES[element.type] || 'textbox';
+  return IMPLICIT_ROLES[element.tagName] || null;
+}
+function isVisible(element) {
+  if (element.checkVisibility) return element.checkVisibility({visibilityProperty: true, opacityProperty: true});
+  return element.getClientRects().length > 0;
+}
+
+const elements = [];
+for (const element of document.body ? document.body.querySelectorAll('*') : []) {
+  if (element.tagName === 'SCRIPT' || element.tagName === 'STYLE' || !isVisible(element)) continue;
+  const role = roleOf(element);
+  let text;
+  if (LABELLED.has(role)) {
+    text = element.innerText || '';
+  } else {
+    text = Array.from(element.childNodes).filter(n => n.nodeType === Node.TEXT_NODE).map(n => n.textContent).join(' ');
+  }
+  const attrs = {};
+  for (const name of attributes) {
+    const value = element.getAttribute(name);
+    if (value) attrs[name] = value;
+  }
+  text = text.replace(/\\s+/g, ' ').trim();
+  if (!role && !text && Object.keys(attrs).length === 0) continue;
+  elements.push({tag: element.tagName.toLowerCase(), role: role, text: text, attributes: attrs});
+}
+return {
+  version: version,
+  url: location.href,
+  title: document.title,
+  sourceLength: document.documentElement.outerHTML.length,
+  text: document.body ? document.body.innerText : '',
+  elements: elements,
+};
+"""
+
+
+def tokens(text):
+    return re.findall(r"\w+", text.lower())
+
+
+class DomSnapshot:
+    def __init__(self, driver):
+        self.driver = driver
+        self.version = None
+        self.captures = 0
+        self._clear()
+
+    def _clear(self):
+        self.url = None
+        self.title = ""
+        self.source_length = 0
+        self.text = ""
+        self.attribute_text = ""
+        self.elements = []
+        self.by_role = defaultdict(set)
+        self.by_token = defaultdict(set)
+        self.by_attribute = defaultdict(set)
+
+    def invalidate(self):
+        """Force the next query to recapture, e.g. for documents loaded without the probes"""
+        self.version = None
+
+    def refresh(self):
+        """Recapture if the page changed since the last capture"""
+        data = self.driver.execute_script(CAPTURE_SCRIPT, self.version, INDEXED_ATTRIBUTES)
+        if data.get("unchanged"):
+            return self
+        self._clear()
+        self.version = data["version"]
+        self.captures += 1
+        self.url = data["url"]
+        self.title = data["title"]
+        self.source_length = data["sourceLength"]
+        self.text = data["text"].lower()
+        self.elements = data["elements"]
+
+        values = []
+        for i, element in enumerate(self.elements):
+            if element["role"]:
+                self.by_role[element["role"]].add(i)
+            for token in tokens(element["text"]):
+                self.by_token[token].add(i)
+            for name, value in element["attributes"].items():
+                values.append(value)
+                self.by_attribute[(name, value)].add(i)
+                if name == "class":
+                    for cls in value.split():
+                        self.by_attribute[("class", cls)].add(i)
+        self.attribute_text = "\n".join(values).lower()
+        return self
+
+    def contains(self, text, attributes=True):
+        """Case-insensitive substring check over the visible text and, by default, indexed attribute values"""
+        self.refresh()
+        needle = text.lower()
+        return needle in self.text or (attributes and needle in self.attribute_text)
+
+    def find(self, role=None, text=None, **attributes):
+        """Visible elements matching all criteria. `text` is a case-insensitive substring of the
+        element's text; attribute names use underscores for dashes (data_testid=...) and
+        class_ matches a single class name."""
+        self.refresh()
+        candidates = None
+        if role is not None:
+            candidates = set(self.by_role.get(role, ()))
+        for name, value in attributes.items():
+            matches = self.by_attribute.get((name.rstrip("_").replace("_", "-"), str(value)), set())
+            candidates = matches if candidates is None else candidates & matches
+        if text is not None:
+            words = tokens(text)
+            for i, word in enumerate(words):
+                if 0 < i < len(words) - 1:
+                    matches = self.by_token.get(word, set())
+                else:
+                    # The first and last word of the needle may be cut off mid-word
+                    matches = set().union(*(ids for token, ids in self.by_token.items() if word in token))
+                candidates = matches if candidates is None else candidates & matches
+        if candidates is None:
+            candidates = range(len(self.elements))
+        needle = text.lower() if text is not None else None
+        return [
+            self.elements[i] for i in sorted(candidates)
+            if needle is None or needle in self.elements[i]["text"].lower()
+        ]
+
+    def count(self, role=None, text=None, **attributes):
+        return len(self.find(role, text, **attributes))
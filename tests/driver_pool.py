@@ -0,0 +1,160 @@
+import os
+import threading
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+from browser_service import lease_browser
+from network_log import discard_log, logging_capabilities
+from profiler import phase
+from waits import install_probes
+
+
+def chrome_options(extra_arguments=()):
+    """Chrome options shared by every browser the suite launches"""
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")  # Remove for visual testing
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-background-networking")
+    chrome_options.add_argument("--disable-sync")
+    chrome_options.add_argument("--disable-translate")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-features=TranslateUI")
+    chrome_options.add_argument("--disable-ipc-flooding-protection")
+    for argument in extra_arguments:
+        chrome_options.add_argument(argument)
+    logging_capabilities(chrome_options)
+    return chrome_options
+
+
+def launch_chrome(extra_arguments=()):
+    """Start a fresh local Chrome"""
+    driver = webdriver.Chrome(options=chrome_options(extra_arguments))
+    driver.maximize_window()
+    install_probes(driver)
+    return driver
+
+
+def service_or_local(api_target=None, extra_arguments=()):
+    """Attach to a warm browser from browser_service.py when one is free, else launch locally"""
+    driver = lease_browser(api_target)
+    if driver is None:
+        driver = launch_chrome(extra_arguments)
+    return driver
+
+
+class DriverPool:
+    """Keeps up to `size` browsers alive for the whole session and leases them to tests.
+
+    Browsers are launched lazily, reset cheaply between leases and replaced
+    when they fail a health check. One pool exists per pytest process, so
+    every xdist worker gets its own.
+    """
+
+    def __init__(self, size=1, factory=launch_chrome, origins=(), pristine_factory=None):
+        self.size = max(1, size)
+        self.factory = factory
+        self.pristine_factory = pristine_factory or factory
+        self.origins = list(origins)
+        self._idle = []
+        self._leased = set()
+        self._lock = threading.Lock()
+
+    def acquire(self, pristine=False):
+        """Lease a browser; `pristine` always starts a brand-new process"""
+        if pristine:
+            with phase("browser_startup"):
+                driver = self.pristine_factory()
+            driver._pool_pristine = True
+            return driver
+
+        with self._lock:
+            driver = self._idle.pop() if self._idle else None
+        if driver is not None and not self.is_healthy(driver):
+            self._discard(driver)
+            driver = None
+        if driver is None:
+            with phase("browser_startup"):
+                driver = self.factory()
+        with self._lock:
+            self._leased.add(driver)
+        return driver
+
+    def release(self, driver, recycle=False):
+        """Return a leased browser, resetting it or throwing it away"""
+        if getattr(driver, "_pool_pristine", False):
+            self._discard(driver)
+            return
+
+        with self._lock:
+            self._leased.discard(driver)
+
+        if not recycle:
+            try:
+                with phase("browser_reset"):
+                    self.reset(driver)
+            except Exception as e:
+                print(f"Browser reset failed, recycling it: {e}")
+                recycle = True
+
+        with self._lock:
+            keep = not recycle and len(self._idle) < self.size
+            if keep:
+                self._idle.append(driver)
+        if not keep:
+            self._discard(driver)
+
+    def reset(self, driver):
+        """Clear cookies and storage, close extra windows and park on about:blank"""
+        # Console messages are only read when a test fails; don't let them pile up across leases
+        discard_log(driver, "browser")
+        if hasattr(driver, "reset_context"):
+            # Other tabs of a shared browser belong to other tests; swap in a fresh context instead
+            driver.reset_context()
+            return
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        if driver.current_url.startswith("http"):
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        for origin in self.origins:
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                "origin": origin,
+                "storageTypes": "local_storage,session_storage,indexeddb,service_workers",
+            })
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.get("about:blank")
+
+    def is_healthy(self, driver):
+        """A browser is healthy if it still answers a trivial script"""
+        try:
+            return driver.execute_script("return 1;") == 1 and len(driver.window_handles) > 0
+        except Exception:
+            return False
+
+    def close(self):
+        """Quit every browser the pool still owns"""
+        with self._lock:
+            drivers = self._idle + list(self._leased)
+            self._idle = []
+            self._leased = set()
+        for driver in drivers:
+            self._discard(driver)
+
+    def _discard(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+
+def pool_size_from_env(default=1):
+    """Pool size from LOANFRONT_POOL_SIZE, falling back to `default`"""
+    try:
+        return int(os.environ.get("LOANFRONT_POOL_SIZE", default))
+    except ValueError:
+        return default
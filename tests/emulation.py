@@ -0,0 +1,115 @@
+"""Named device and network profiles applied to a test's browser through CDP.
+
+By default the suite drives a maximized, unthrottled desktop Chrome. A
+profile sets three things:
+
+- CPU throttling (Emulation.setCPUThrottlingRate; 4 means four times slower)
+- network conditions (Network.emulateNetworkConditions): latency and
+  throughput in both directions, which also apply to mock backend traffic
+  going through the proxy
+- the viewport (Emulation.setDeviceMetricsOverride), touch and user agent
+
+A test picks a profile with @pytest.mark.emulate("agent-3G-lowend"), on
+the test, its class or its parameters. For runs, --emulate PROFILE applies
+one to every test, and --emulate MARKER=PROFILE applies one to the tests
+carrying that marker (e.g. collection=agent-3G-lowend). The test's own mark
+wins over the options. BaseTest clears the emulation before the browser
+goes back to the pool. Route metrics recorded under a profile are reported
+as "<route> @<profile>", so every profile has its own baseline.
+"""
+
+# Chrome DevTools' throughput presets are in bytes per second
+KBIT = 1024 / 8
+MBIT = 1024 * KBIT
+
+ANDROID_USER_AGENT = ("Mozilla/5.0 (Linux; Android 10; K) AppleWebKit/537.36 (KHTML, like Gecko) "
+                      "Chrome/119.0.0.0 Mobile Safari/537.36")
+
+
+class Profile:
+    def __init__(self, name, cpu_rate=1, latency_ms=0, download=-1, upload=-1, connection="none",
+                 width=None, height=None, scale=1, mobile=False, user_agent=None):
+        self.name = name
+        self.cpu_rate = cpu_rate
+        self.latency_ms = latency_ms
+        # -1 means unthrottled
+        self.download = download
+        self.upload = upload
+        self.connection = connection
+        self.width = width
+        self.height = height
+        self.scale = scale
+        self.mobile = mobile
+        self.user_agent = user_agent
+
+    def __repr__(self):
+        return f"Profile({self.name!r})"
+
+
+PROFILES = {profile.name: profile for profile in [
+    # A budget Android phone on a congested 3G link, as field agents use
+    Profile("agent-3G-lowend", cpu_rate=6, latency_ms=562.5, download=1.6 * MBIT * 0.9, upload=750 * KBIT * 0.9,
+            connection="cellular3g", width=360, height=640, scale=2, mobile=True, user_agent=ANDROID_USER_AGENT),
+    # A mid-range phone on 4G
+    Profile("agent-4G", cpu_rate=3, latency_ms=150, download=9 * MBIT, upload=1.5 * MBIT,
+            connection="cellular4g", width=412, height=915, scale=2.625, mobile=True, user_agent=ANDROID_USER_AGENT),
+    # Branch office PC on wired broadband
+    Profile("office-desktop", cpu_rate=1, latency_ms=20, download=50 * MBIT, upload=10 * MBIT,
+            connection="ethernet", width=1366, height=768),
+]}
+
+
+def get_profile(name):
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown emulation profile {name!r}, expected one of {sorted(PROFILES)}") from None
+
+
+def parse_rules(values):
+    """--emulate values as [(marker or None, Profile)], most specific first"""
+    rules = []
+    for value in values or []:
+        marker, _, name = value.rpartition("=")
+        rules.append((marker or None, get_profile(name)))
+    return sorted(rules, key=lambda rule: rule[0] is None)
+
+
+def profile_for(item, rules):
+    """The profile a test runs under: its emulate mark, else the first matching --emulate rule, else None"""
+    mark = item.get_closest_marker("emulate")
+    if mark:
+        return get_profile(mark.args[0])
+    for marker, profile in rules:
+        if marker is None or item.get_closest_marker(marker):
+            return profile
+    return None
+
+
+def apply(driver, profile):
+    driver.execute_cdp_cmd("Emulation.setCPUThrottlingRate", {"rate": profile.cpu_rate})
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.emulateNetworkConditions", {
+        "offline": False, "latency": profile.latency_ms, "downloadThroughput": profile.download,
+        "uploadThroughput": profile.upload, "connectionType": profile.connection,
+    })
+    if profile.width:
+        driver.execute_cdp_cmd("Emulation.setDeviceMetricsOverride", {
+            "width": profile.width, "height": profile.height, "deviceScaleFactor": profile.scale,
+            "mobile": profile.mobile,
+        })
+    driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {"enabled": profile.mobile})
+    if profile.user_agent:
+        driver.execute_cdp_cmd("Emulation.setUserAgentOverride", {"userAgent": profile.user_agent})
+
+
+def clear(driver):
+    """Undo apply() so the pooled browser is a plain desktop again"""
+    driver.execute_cdp_cmd("Emulation.setCPUThrottlingRate", {"rate": 1})
+    driver.execute_cdp_cmd("Network.emulateNetworkConditions", {
+        "offline": False, "latency": 0, "downloadThroughput": -1, "uploadThroughput": -1,
+    })
+    driver.execute_cdp_cmd("Emulation.clearDeviceMetricsOverride", {})
+    driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {"enabled": False})
+    # An empty override restores the browser's own user agent
+    driver.execute_cdp_cmd("Emulation.setUserAgentOverride", {"userAgent": ""})
@@ -0,0 +1,155 @@
+"""Test-impact selection: run only the UI tests whose routes and components a diff touches.
+
+With --record-impact, every BaseTest test collects precise JS coverage
+through CDP. It is taken at each readiness wait, before each navigation
+(BaseTest.navigate and the page objects' open()) and at teardown, because
+coverage for a document's scripts is lost once the page navigates away.
+The test records the routes it saw and the src/ modules whose functions
+ran, not just loaded. Module top-level code does not count, because Vite
+evaluates every statically imported file whether or not it renders. The
+controller merges these per-test entries into the impact map (JSON, see
+--impact-map).
+
+With --impact-since REF, the files changed since REF (committed,
+uncommitted and untracked) are compared against the map:
+
+- a change to a shared module (SHARED_FILES: api.js, App.jsx, build config,
+  the harness) selects the whole suite
+- a changed test module, or a cassette recorded for it, selects its own tests
+- a changed src/ file selects every test that executed it; a stylesheet
+  counts as a change to the modules in its directory
+- tests missing from the map (new tests, or headless ones that never open
+  a browser) always run
+
+Coverage needs the Vite dev server: the production bundle is one file, so
+--record-impact with --frontend=bundle records routes only.
+"""
+import fnmatch
+import json
+import os
+import subprocess
+from urllib.parse import urlsplit
+
+from selector_cache import route_key
+
+IMPACT_MAP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".test_impact.json")
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Changes here can affect any screen; coverage cannot narrow them down
+SHARED_FILES = [
+    "src/App.jsx", "src/main.jsx", "src/index.js", "src/*.css", "src/services/*", "src/utils/*", "src/styles/*",
+    "src/ProtectedRoute/*", "index.html", "package.json", "package-lock.json", "vite.config.js",
+    "tests/*.py", "tests/pytest.ini", "tests/cassettes/_auth.json",
+]
+STYLESHEETS = (".css", ".scss")
+
+
+class CoverageRecorder:
+    """Precise JS coverage of one test's browser, reduced to src/ modules and routes"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.files = set()
+        self.routes = set()
+        driver.execute_cdp_cmd("Profiler.enable", {})
+        driver.execute_cdp_cmd("Profiler.startPreciseCoverage", {"callCount": True, "detailed": False})
+
+    def collect(self):
+        """Fold in the coverage since the last call; counts reset on every take"""
+        url = self.driver.current_url
+        if url.startswith("http"):
+            self.routes.add(route_key(url))
+        for script in self.driver.execute_cdp_cmd("Profiler.takePreciseCoverage", {})["result"]:
+            path = urlsplit(script["url"]).path.lstrip("/")
+            if path.startswith("src/") and any(_ran(function) for function in script["functions"]):
+                self.files.add(path)
+
+    def stop(self):
+        self.driver.execute_cdp_cmd("Profiler.stopPreciseCoverage", {})
+        self.driver.execute_cdp_cmd("Profiler.disable", {})
+        return {"routes": sorted(self.routes), "files": sorted(self.files)}
+
+
+def _ran(function):
+    """Whether a function other than the module's top level was called"""
+    ranges = function["ranges"]
+    top_level = not function["functionName"] and ranges and ranges[0]["startOffset"] == 0
+    return not top_level and any(r["count"] > 0 for r in ranges)
+
+
+def _matches(path, pattern):
+    """fnmatch per path segment, so * never crosses a directory"""
+    parts, pattern_parts = path.split("/"), pattern.split("/")
+    return len(parts) == len(pattern_parts) and all(map(fnmatch.fnmatch, parts, pattern_parts))
+
+
+def load_map(path):
+    try:
+        with open(path) as f:
+            return json.load(f).get("tests", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def changed_files(ref, root=REPO_ROOT):
+    """Repo-relative paths changed since `ref`, including uncommitted and untracked files"""
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=root, capture_output=True, text=True, check=True).stdout.split("\n")
+    changed = git("diff", "--name-only", ref) + git("ls-files", "--others", "--exclude-standard")
+    return sorted({path for path in changed if path})
+
+
+def impacted(nodeids, impact_map, changed):
+    """(selected node ids, reason) for a set of changed files"""
+    shared = [path for path in changed if any(_matches(path, pattern) for pattern in SHARED_FILES)
+              and not os.path.basename(path).startswith("test_")]
+    if shared:
+        return set(nodeids), f"shared files changed: {', '.join(shared[:5])}"
+
+    changed_tests = {os.path.basename(path) for path in changed if os.path.basename(path).startswith("test_")}
+    changed_tests.update(f"{path.split('/')[2]}.py" for path in changed if path.startswith("tests/cassettes/test_"))
+    sources = set()
+    for path in changed:
+        if not path.startswith("src/"):
+            continue
+        if path.endswith(STYLESHEETS):
+            directory = os.path.dirname(path) + "/"
+            sources.update(f for entry in impact_map.values() for f in entry["files"] if f.startswith(directory))
+        else:
+            sources.add(path)
+
+    selected = set()
+    for nodeid in nodeids:
+        entry = impact_map.get(nodeid)
+        module = os.path.basename(nodeid.split("::")[0])
+        if entry is None or module in changed_tests or sources & set(entry["files"]):
+            selected.add(nodeid)
+    return selected, f"{len(sources)} changed src modules, {len(changed_tests)} changed test modules"
+
+
+class ImpactRecorder:
+    """Controller plugin that merges each test's routes and modules into the impact map"""
+
+    def __init__(self, path):
+        self.path = path
+        self.tests = {}
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "teardown":
+            entry = dict(report.user_properties).get("impact")
+            if entry:
+                self.tests[report.nodeid] = entry
+
+    def pytest_sessionfinish(self):
+        if not self.tests:
+            return
+        tests = load_map(self.path)
+        tests.update(self.tests)
+        with open(self.path, "w") as f:
+            json.dump({"tests": dict(sorted(tests.items()))}, f, indent=1)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.tests:
+            files = {f for entry in self.tests.values() for f in entry["files"]}
+            terminalreporter.write_line(
+                f"impact map: {len(self.tests)} tests, {len(files)} src modules -> {self.path}")
@@ -0,0 +1,110 @@
+"""Memory leak checks for a session that stays open and keeps changing routes.
+
+A LeakCheck visits a cycle of routes over and over inside one document.
+It uses history.pushState plus a popstate event, the same way the app's own
+links navigate, so nothing is freed by a page load. After each full cycle
+it is back on the first route. There it forces two garbage collections
+(HeapProfiler.collectGarbage) and samples Performance.getMetrics:
+
+- JSHeapUsedSize: live JS heap in bytes
+- Nodes: DOM nodes in the renderer, including detached ones something still holds
+- JSEventListeners: registered event listeners
+
+The first WARMUP_CYCLES cycles are not sampled, because lazy chunks,
+caches and fonts legitimately settle in then. A least-squares line through
+the remaining samples gives each metric's growth per cycle. The fit is
+less sensitive to one noisy sample than last-minus-first. A check fails
+when any slope exceeds its budget in BUDGETS and the line explains at
+least MIN_R2 of the variance, so one late jump (a cache filling up, a GC
+that happened to run) is not reported as steady growth.
+"""
+
+NAVIGATE_SCRIPT = """
+window.history.pushState({}, '', arguments[0]);
+window.dispatchEvent(new PopStateEvent('popstate', {state: {}}));
+"""
+
+METRICS = ("JSHeapUsedSize", "Nodes", "JSEventListeners")
+# Allowed growth per cycle once warmed up
+BUDGETS = {"JSHeapUsedSize": 256 * 1024, "Nodes": 50, "JSEventListeners": 10}
+WARMUP_CYCLES = 2
+# Below this r², growth is a step or noise rather than a leak
+MIN_R2 = 0.6
+GC_PASSES = 2
+
+
+def linear_fit(values):
+    """(slope, r²) of the least-squares line through `values` at x = 0, 1, 2, ..."""
+    n = len(values)
+    if n < 2:
+        return 0.0, 0.0
+    mean_x = (n - 1) / 2
+    mean_y = sum(values) / n
+    sxx = sum((x - mean_x) ** 2 for x in range(n))
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values))
+    syy = sum((y - mean_y) ** 2 for y in values)
+    slope = sxy / sxx
+    r2 = (sxy * sxy) / (sxx * syy) if syy else 0.0
+    return slope, r2
+
+
+class LeakCheck:
+    """Cycles `routes` on a logged-in browser; `settle` is called after each navigation"""
+
+    def __init__(self, driver, routes, settle, budgets=None):
+        self.driver = driver
+        self.routes = list(routes)
+        self.settle = settle
+        self.budgets = dict(BUDGETS, **(budgets or {}))
+        self.samples = []
+
+    def sample(self):
+        for _ in range(GC_PASSES):
+            self.driver.execute_cdp_cmd("HeapProfiler.collectGarbage", {})
+        metrics = self.driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+        values = {metric["name"]: metric["value"] for metric in metrics}
+        return {name: values.get(name, 0) for name in METRICS}
+
+    def navigate(self, path):
+        self.driver.execute_script(NAVIGATE_SCRIPT, path)
+        self.settle()
+
+    def cycle(self):
+        """Visit every route once and come back to the first"""
+        for path in self.routes[1:] + self.routes[:1]:
+            self.navigate(path)
+
+    def run(self, cycles):
+        """Warm up, then sample after each of `cycles` cycles; returns the result"""
+        self.driver.execute_cdp_cmd("Performance.enable", {})
+        try:
+            self.navigate(self.routes[0])
+            for _ in range(WARMUP_CYCLES):
+                self.cycle()
+            self.samples = [self.sample()]
+            for _ in range(cycles):
+                self.cycle()
+                self.samples.append(self.sample())
+        finally:
+            self.driver.execute_cdp_cmd("Performance.disable", {})
+        return self.result()
+
+    def result(self):
+        """Per metric: first and last sample, growth per cycle, fit quality and whether it is over budget"""
+        result = {}
+        for name in METRICS:
+            values = [sample[name] for sample in self.samples]
+            slope, r2 = linear_fit(values)
+            result[name] = {
+                "first": values[0] if values else 0, "last": values[-1] if values else 0,
+                "per_cycle": round(slope, 1), "r2": round(r2, 3), "budget": self.budgets[name],
+                "over_budget": slope > self.budgets[name] and r2 >= MIN_R2,
+            }
+        return result
+
+    def problems(self):
+        return [
+            f"{name} grows {m['per_cycle']:g}/cycle (r²={m['r2']}, {m['first']:g} -> {m['last']:g}), "
+            f"budget {m['budget']:g}"
+            for name, m in self.result().items() if m["over_budget"]
+        ]
@@ -0,0 +1,365 @@
+"""Many collection agents collecting payments at once, against the mock or a real backend.
+
+    python load_collect.py --agents 50 --duration 30
+    python load_collect.py --backend http://127.0.0.1:8000/api --agent field1@example.com --agent field2@example.com
+    python load_collect.py --agents 20 --browsers 2 --app-url http://localhost:5173
+
+HTTP tier: every simulated agent logs in once and then repeats what the agent
+screens do for each installment. It fetches the assigned schedules, POSTs the
+payload loanService.collectPayment sends to loan-schedules/{id}/collect/, and
+refreshes daily-collections. All agents share one asyncio event loop and a
+keep-alive connection pool.
+
+Browser tier (--browsers N): N headless browsers run the collect-payment UI
+flow from test_collection_agent at the same time. They time the page open and
+the collect page from the link to the confirmation. A browser agent that
+never completes a collection fails the run.
+
+With --backend mock (the default) the mock API runs in a child process
+loaded with the collection_burst scenario, so the load generator and the
+server don't compete for one interpreter. A real backend gets the same
+scenario through its test-state endpoints unless --agent accounts are given.
+Every agent, browser or HTTP, has an account of its own. --agents plus
+--browsers can be at most the scenario's BURST_AGENTS, or the number of
+--agent accounts.
+"""
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit
+
+from seed_data import PASSWORD
+
+# What agents choose in the collect form; collectPayment defaults to cash
+PAYMENT_METHODS = ["cash"] * 6 + ["upi"] * 3 + ["card"]
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of an unsorted list"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+class Latencies:
+    """Thread-safe latency samples and error counts per operation"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds, ok=True):
+        with self._lock:
+            if ok:
+                self.samples[name].append(seconds)
+            else:
+                self.errors[name] += 1
+
+    def summary(self, elapsed):
+        result = {}
+        for name in sorted(set(self.samples) | set(self.errors)):
+            values = self.samples[name]
+            result[name] = {
+                "count": len(values),
+                "errors": self.errors[name],
+                "throughput": round(len(values) / elapsed, 2) if elapsed else 0.0,
+                **{f"p{p}_ms": round(percentile(values, p) * 1000, 1) if values else None for p in (50, 95, 99)},
+                "max_ms": round(max(values) * 1000, 1) if values else None,
+            }
+        return result
+
+
+class HttpPool:
+    """Minimal asyncio HTTP/1.1 JSON client keeping up to `size` connections alive"""
+
+    def __init__(self, api_url, size):
+        url = urlsplit(api_url)
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.prefix = url.path.rstrip("/")
+        self.idle = []
+        self.slots = asyncio.Semaphore(size)
+
+    async def request(self, method, path, body=None, token=None):
+        """(status, decoded JSON) for one call; a stale keep-alive connection is retried once"""
+        async with self.slots:
+            for attempt in range(2):
+                reused = bool(self.idle)
+                reader, writer = self.idle.pop() if reused else await asyncio.open_connection(self.host, self.port)
+                try:
+                    status, payload, keep_alive = await self._exchange(reader, writer, method, path, body, token)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    writer.close()
+                    if reused and attempt == 0:
+                        continue
+                    raise
+                if keep_alive:
+                    self.idle.append((reader, writer))
+                else:
+                    writer.close()
+                return status, payload
+
+    async def _exchange(self, reader, writer, method, path, body, token):
+        data = json.dumps(body).encode() if body is not None else b""
+        lines = [
+            f"{method} {self.prefix}{path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            "Accept: application/json",
+            f"Content-Length: {len(data)}",
+        ]
+        if body is not None:
+            lines.append("Content-Type: application/json")
+        if token:
+            lines.append(f"Authorization: Token {token}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + data)
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed before the response")
+        status = int(status_line.split()[1])
+        length, chunked, keep_alive = None, False, True
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            name, value = name.strip().lower(), value.strip().lower()
+            if name == "content-length":
+                length = int(value)
+            elif name == "transfer-encoding":
+                chunked = "chunked" in value
+            elif name == "connection":
+                keep_alive = value != "close"
+
+        if chunked:
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                chunk = await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                chunks.append(chunk[:-2])
+            payload = b"".join(chunks)
+        elif length is not None:
+            payload = await reader.readexactly(length)
+        else:
+            payload = await reader.read()
+            keep_alive = False
+        try:
+            return status, json.loads(payload) if payload else None, keep_alive
+        except ValueError:
+            return status, None, keep_alive
+
+    def close(self):
+        for _, writer in self.idle:
+            writer.close()
+        self.idle = []
+
+
+async def timed(stats, name, call):
+    start = time.perf_counter()
+    try:
+        status, payload = await call
+    except (OSError, asyncio.IncompleteReadError):
+        stats.record(name, time.perf_counter() - start, ok=False)
+        return None, None
+    stats.record(name, time.perf_counter() - start, ok=status < 400)
+    return status, payload
+
+
+async def http_agent(pool, email, password, stats, deadline, think):
+    """One agent: log in, then collect assigned installments until none are left or time runs out"""
+    status, session = await timed(stats, "login", pool.request("POST", "/auth/login/", {"email": email, "password": password}))
+    if status != 200:
+        return 0
+    token, user = session["token"], session["user"]
+    collected = 0
+    while time.monotonic() < deadline:
+        status, schedules = await timed(stats, "assigned", pool.request("GET", "/auth/loan-schedules/assigned/", token=token))
+        pending = [s for s in schedules or [] if s["status"] != "paid"]
+        if not pending:
+            break
+        schedule = pending[0]
+        status, _ = await timed(stats, "collect", pool.request(
+            "POST", f"/auth/loan-schedules/{schedule['id']}/collect/",
+            {"payment_method": random.choice(PAYMENT_METHODS), "paid_amount": schedule["total_due"]}, token,
+        ))
+        if status == 200:
+            collected += 1
+        await timed(stats, "daily_collections", pool.request("GET", f"/auth/daily-collections/?agent_id={user['id']}", token=token))
+        if think:
+            await asyncio.sleep(random.uniform(0, 2 * think))
+    return collected
+
+
+async def run_http_tier(api_url, accounts, stats, duration, connections, think):
+    pool = HttpPool(api_url, connections)
+    deadline = time.monotonic() + duration
+    try:
+        collected = await asyncio.gather(*(
+            http_agent(pool, email, password, stats, deadline, think) for email, password in accounts
+        ))
+    finally:
+        pool.close()
+    return sum(collected)
+
+
+def browser_agent(base_url, api_url, extra_arguments, email, password, stats, deadline, outcomes):
+    """Drive the assigned-loans and collect-payment screens in a real browser until time runs out or
+    nothing is left to collect; stores (installments collected, error or None) in outcomes[email]"""
+    from auth_session import TokenCache, seed_local_storage
+    from driver_pool import launch_chrome
+    from pages import AgentLoansPage, CollectPaymentPage
+    from waits import wait_until_settled
+
+    collected, error = 0, None
+    driver = None
+    tokens = TokenCache(api_url)
+    try:
+        driver = launch_chrome(extra_arguments)
+        seed_local_storage(driver, base_url, tokens.get(email, password))
+        page = AgentLoansPage(driver, base_url)
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            page.open()
+            wait_until_settled(driver)
+            stats.record("ui_open_loans", time.perf_counter() - start)
+            if page.resolve("collect").found["collect"] is None:
+                break
+
+            start = time.perf_counter()
+            page.click("collect")
+            if not CollectPaymentPage(driver, base_url).collect():
+                raise RuntimeError("the collect page listed no pending installment")
+            stats.record("ui_collect", time.perf_counter() - start)
+            collected += 1
+    except Exception as e:
+        error = f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"
+        stats.record("ui_collect", 0, ok=False)
+    finally:
+        outcomes[email] = (collected, error)
+        tokens.close()
+        if driver:
+            driver.quit()
+
+
+def _serve_mock(scenario, ready):
+    from mock_backend import MockBackend, Store
+    from scenarios import load_scenario
+
+    backend = MockBackend(Store(load_scenario(scenario))).start()
+    ready.put(backend.url)
+    threading.Event().wait()
+
+
+def start_mock(scenario):
+    """Mock backend in a child process; returns (process, base url)"""
+    ready = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve_mock, args=(scenario, ready), daemon=True)
+    process.start()
+    return process, ready.get(timeout=30)
+
+
+def main(argv=None):
+    from scenarios import BURST_AGENTS, burst_agent_email
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", default="mock", help="'mock' or the API base URL of a real backend")
+    parser.add_argument("--agents", type=int,
+                        help="Concurrent simulated agents (HTTP tier); default: every account the browsers don't use")
+    parser.add_argument("--agent", action="append", default=[], help="Agent account to use instead of the scenario's")
+    parser.add_argument("--password", default=PASSWORD, help="Password of the --agent accounts")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run; agents also stop when out of work")
+    parser.add_argument("--connections", type=int, default=20, help="Keep-alive connections in the HTTP pool")
+    parser.add_argument("--think", type=float, default=0.0, help="Mean seconds an agent pauses between collections")
+    parser.add_argument("--browsers", type=int, default=0, help="Real headless browsers driving the UI alongside")
+    parser.add_argument("--app-url", default="http://localhost:5173", help="Frontend for the browser tier")
+    parser.add_argument("--output", help="Also write the results as JSON to this file")
+    args = parser.parse_args(argv)
+    # Browser agents get their own accounts so they never fight the HTTP tier over an installment
+    available = len(args.agent) if args.agent else BURST_AGENTS
+    if args.agents is None:
+        args.agents = max(available - args.browsers, 0)
+    if args.agents + args.browsers > available:
+        source = f"{available} --agent accounts were given" if args.agent else \
+            f"the collection_burst scenario seeds {available} agents"
+        parser.error(f"--agents {args.agents} plus --browsers {args.browsers} needs "
+                     f"{args.agents + args.browsers} accounts, but {source}")
+
+    mock = None
+    if args.backend == "mock":
+        mock, origin = start_mock("collection_burst")
+        api_url = f"{origin}/api"
+    else:
+        api_url = args.backend.rstrip("/")
+        origin = api_url.rsplit("/api", 1)[0]
+
+    if args.agent:
+        accounts = [(email, args.password) for email in args.agent]
+    else:
+        if mock is None:
+            from backend_state import BackendState
+            BackendState(api_url).apply("collection_burst")
+        accounts = [(burst_agent_email(n), PASSWORD) for n in range(1, BURST_AGENTS + 1)]
+    browser_accounts = accounts[:args.browsers]
+    http_accounts = accounts[args.browsers:args.browsers + args.agents]
+
+    extra_arguments = ()
+    if urlsplit(origin).netloc != "127.0.0.1:8000":
+        from mock_backend import proxy_arguments
+        host = urlsplit(origin)
+        extra_arguments = proxy_arguments(host.hostname, host.port, args.app_url)
+
+    stats = Latencies()
+    deadline = time.monotonic() + args.duration
+    outcomes = {}
+    browsers = [
+        threading.Thread(target=browser_agent, args=(args.app_url.rstrip("/"), api_url, extra_arguments, email,
+                                                     password, stats, deadline, outcomes))
+        for email, password in browser_accounts
+    ]
+    started = time.perf_counter()
+    for thread in browsers:
+        thread.start()
+    try:
+        collected = asyncio.run(run_http_tier(api_url, http_accounts, stats, args.duration, args.connections, args.think))
+        for thread in browsers:
+            thread.join()
+    finally:
+        if mock is not None:
+            mock.terminate()
+    elapsed = time.perf_counter() - started
+
+    summary = stats.summary(elapsed)
+    collected += sum(n for n, _ in outcomes.values())
+    print(f"{len(http_accounts)} HTTP agents, {len(browsers)} browsers against {api_url}: "
+          f"{collected} installments collected in {elapsed:.1f}s ({collected / elapsed:.1f}/s)")
+    print(f"{'operation':<18} {'count':>6} {'errors':>6} {'per s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, s in summary.items():
+        cells = [f"{s[k]:.1f}" if s[k] is not None else "-" for k in ("p50_ms", "p95_ms", "p99_ms")]
+        print(f"{name:<18} {s['count']:>6} {s['errors']:>6} {s['throughput']:>7.1f} {cells[0]:>8} {cells[1]:>8} {cells[2]:>8}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"api_url": api_url, "elapsed": round(elapsed, 2), "collected": collected,
+                       "operations": summary, "browsers": outcomes}, f, indent=1)
+
+    for email, (n, error) in outcomes.items():
+        if error:
+            print(f"Browser agent {email} stopped after {n} collections: {error}")
+    # A browser tier that never got through the UI flow measured nothing; don't let that pass as a result
+    idle = [email for email, _ in browser_accounts if not outcomes.get(email, (0, None))[0]]
+    if idle:
+        sys.exit(f"{len(idle)} of {len(browser_accounts)} browser agents never completed a collection: "
+                 f"{', '.join(idle)}")
+
+
+if __name__ == "__main__":
+    main()
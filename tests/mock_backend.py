@@ -0,0 +1,794 @@
+import copy
+import hashlib
+import itertools
+import json
+import re
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from scenarios import load_scenario
+from seed_data import SEED_DATE
+
+# Primary key of each collection; everything not listed uses "id"
+ID_KEYS = {"customers": "customer_id", "loans": "loan_id"}
+
+# Timestamp stamped on rows the mock creates, kept fixed for deterministic output
+NOW = f"{SEED_DATE.isoformat()}T12:00:00Z"
+
+ROUTES = []
+
+
+def route(method, pattern, public=False):
+    """Register a handler for `method` on a path pattern relative to /api"""
+    def register(func):
+        ROUTES.append((method, re.compile(f"^{pattern}$"), public, func))
+        return func
+    return register
+
+
+class Store:
+    """In-memory tables behind the mock API"""
+
+    def __init__(self, data=None):
+        self.lock = threading.RLock()
+        self.snapshots = {}
+        self._snapshot_ids = itertools.count(1)
+        self.load(load_scenario("default") if data is None else data)
+
+    def load(self, data):
+        with self.lock:
+            self.tables = copy.deepcopy(data)
+            self.tokens = {token_for(user): user["id"] for user in self.tables["users"]}
+
+    def snapshot(self):
+        """Remember the current tables and return an id to restore them by"""
+        with self.lock:
+            snapshot_id = str(next(self._snapshot_ids))
+            self.snapshots[snapshot_id] = (copy.deepcopy(self.tables), dict(self.tokens))
+            return snapshot_id
+
+    def restore(self, snapshot_id):
+        with self.lock:
+            tables, tokens = self.snapshots.pop(snapshot_id)
+            self.tables = tables
+            self.tokens = tokens
+
+    def table(self, name):
+        return self.tables.setdefault(name, [])
+
+    def get(self, name, pk):
+        key = ID_KEYS.get(name, "id")
+        for row in self.table(name):
+            if str(row[key]) == str(pk):
+                return row
+        return None
+
+    def insert(self, name, row):
+        key = ID_KEYS.get(name, "id")
+        rows = self.table(name)
+        row[key] = max((r[key] for r in rows), default=0) + 1
+        rows.append(row)
+        return row
+
+    def delete(self, name, pk):
+        row = self.get(name, pk)
+        if row is not None:
+            self.table(name).remove(row)
+        return row
+
+    def user_for_token(self, token):
+        user_id = self.tokens.get(token)
+        return self.get("users", user_id) if user_id is not None else None
+
+
+class Request:
+    def __init__(self, method, path, query, body, user, params):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.body = body
+        self.user = user
+        self.params = params
+
+
+def token_for(user):
+    return hashlib.sha1(f"{user['id']}:{user['email']}".encode()).hexdigest()
+
+
+def public_user(user):
+    return {k: v for k, v in user.items() if k != "password"}
+
+
+def not_found(what="Not found."):
+    return 404, {"detail": what}
+
+
+def filtered(rows, query, skip=()):
+    """Apply `?field=value` filters for fields the rows actually have"""
+    for key, value in query.items():
+        if key in skip:
+            continue
+        rows = [r for r in rows if key not in r or str(r[key]) == value]
+    return rows
+
+
+def audit(store, user, action, module):
+    store.insert("audit_logs", {
+        "user": user["username"] if user else "system",
+        "action": action,
+        "module": module,
+        "timestamp": NOW,
+    })
+
+
+# Test state control, used by the pytest fixtures to apply scenarios and roll back
+
+@route("POST", "/test-state/reset/", public=True)
+def reset_state(store, req):
+    name = req.body.get("scenario", "default")
+    try:
+        store.load(load_scenario(name))
+    except KeyError as e:
+        return 400, {"error": str(e)}
+    return 200, {"scenario": name}
+
+
+@route("POST", "/test-state/snapshot/", public=True)
+def snapshot_state(store, req):
+    return 201, {"snapshot": store.snapshot()}
+
+
+@route("POST", "/test-state/restore/", public=True)
+def restore_state(store, req):
+    if req.body.get("snapshot") not in store.snapshots:
+        return 400, {"error": "Unknown snapshot"}
+    store.restore(req.body["snapshot"])
+    return 200, {"snapshot": req.body["snapshot"]}
+
+
+# Auth
+
+@route("POST", "/auth/login/", public=True)
+def login(store, req):
+    email = req.body.get("email")
+    for user in store.table("users"):
+        if user["email"] == email and user["password"] == req.body.get("password") and user["is_active"]:
+            token = token_for(user)
+            store.tokens[token] = user["id"]
+            return 200, {"token": token, "user": public_user(user)}
+    return 400, {"error": "Invalid email or password"}
+
+
+@route("POST", "/auth/register/", public=True)
+def register(store, req):
+    missing = [f for f in ("email", "username", "password") if not req.body.get(f)]
+    if missing:
+        return 400, {f: ["This field is required."] for f in missing}
+    if any(u["email"] == req.body["email"] for u in store.table("users")):
+        return 400, {"email": ["user with this email already exists."]}
+    user = store.insert("users", {
+        "username": req.body["username"],
+        "email": req.body["email"],
+        "password": req.body["password"],
+        "role": req.body.get("role", "staff"),
+        "first_name": req.body.get("first_name", ""),
+        "last_name": req.body.get("last_name", ""),
+        "phone": req.body.get("phone", ""),
+        "is_active": True,
+        "date_joined": NOW,
+        "last_login": None,
+    })
+    return 201, {"message": "User registered successfully", "user": public_user(user)}
+
+
+@route("POST", "/auth/logout/")
+def logout(store, req):
+    store.tokens = {t: uid for t, uid in store.tokens.items() if uid != req.user["id"]}
+    return 200, {"message": "Logged out successfully"}
+
+
+@route("POST", "/auth/change-password/")
+def change_password(store, req):
+    if req.body.get("old_password") != req.user["password"]:
+        return 400, {"error": "Old password is incorrect"}
+    req.user["password"] = req.body.get("new_password", req.user["password"])
+    return 200, {"message": "Password changed successfully"}
+
+
+@route("PUT", "/auth/profile/")
+def update_profile(store, req):
+    for key in ("first_name", "last_name", "phone", "username"):
+        if key in req.body:
+            req.user[key] = req.body[key]
+    return 200, public_user(req.user)
+
+
+# Users, roles and permissions
+
+@route("GET", "/auth/users/")
+def list_users(store, req):
+    return 200, [public_user(u) for u in filtered(store.table("users"), req.query)]
+
+
+@route("GET", "/auth/agents/")
+def list_agents(store, req):
+    return 200, [public_user(u) for u in store.table("users") if u["role"] == "collection_agent"]
+
+
+@route("POST", "/auth/users/invite/")
+def invite_user(store, req):
+    if not req.body.get("email"):
+        return 400, {"email": ["This field is required."]}
+    user = store.insert("users", {
+        "username": req.body["email"].split("@")[0],
+        "email": req.body["email"],
+        "password": "",
+        "role": req.body.get("role", "staff"),
+        "first_name": "",
+        "last_name": "",
+        "phone": "",
+        "is_active": False,
+        "date_joined": NOW,
+        "last_login": None,
+    })
+    return 201, {"message": f"User {user['email']} invited successfully", "user": public_user(user)}
+
+
+@route("GET", r"/auth/users/(?P<pk>\d+)/")
+def get_user(store, req):
+    user = store.get("users", req.params["pk"])
+    return (200, public_user(user)) if user else not_found()
+
+
+@route("PUT|PATCH", r"/auth/users/(?P<pk>\d+)/")
+def update_user(store, req):
+    user = store.get("users", req.params["pk"])
+    if not user:
+        return not_found()
+    user.update({k: v for k, v in req.body.items() if k not in ("id", "password")})
+    return 200, public_user(user)
+
+
+@route("DELETE", r"/auth/users/(?P<pk>\d+)/")
+def delete_user(store, req):
+    return (204, None) if store.delete("users", req.params["pk"]) else not_found()
+
+
+@route("GET", "/auth/roles/")
+def list_roles(store, req):
+    return 200, store.table("roles")
+
+
+@route("POST", "/auth/roles/")
+def create_role(store, req):
+    if not req.body.get("name"):
+        return 400, {"name": ["This field is required."]}
+    role = store.insert("roles", {
+        "name": req.body["name"],
+        "description": req.body.get("description", ""),
+        "permissions": req.body.get("permissions", []),
+    })
+    audit(store, req.user, f"Created role {role['name']}", "roles")
+    return 201, {**role, "message": "Role created successfully"}
+
+
+@route("PUT|PATCH", r"/auth/roles/(?P<pk>\d+)/")
+def update_role(store, req):
+    role = store.get("roles", req.params["pk"])
+    if not role:
+        return not_found()
+    role.update({k: v for k, v in req.body.items() if k != "id"})
+    return 200, role
+
+
+@route("DELETE", r"/auth/roles/(?P<pk>\d+)/")
+def delete_role(store, req):
+    return (204, None) if store.delete("roles", req.params["pk"]) else not_found()
+
+
+@route("GET", "/auth/permissions/")
+def list_permissions(store, req):
+    return 200, store.table("permissions")
+
+
+@route("POST", "/auth/permissions/")
+def create_permission(store, req):
+    if not req.body.get("codename"):
+        return 400, {"codename": ["This field is required."]}
+    return 201, store.insert("permissions", {"codename": req.body["codename"], "name": req.body.get("name", "")})
+
+
+# Customers
+
+@route("GET", "/auth/customers/")
+def list_customers(store, req):
+    return 200, filtered(store.table("customers"), req.query)
+
+
+@route("GET", "/auth/customers/search/")
+def search_customers(store, req):
+    term = req.query.get("q", "").lower()
+    fields = ("full_name", "nickname", "email", "phone", "customer_code")
+    return 200, [c for c in store.table("customers") if any(term in str(c.get(f, "")).lower() for f in fields)]
+
+
+@route("POST", "/auth/customers/")
+def create_customer(store, req):
+    if not req.body.get("full_name"):
+        return 400, {"full_name": ["This field is required."]}
+    customer = store.insert("customers", dict(req.body))
+    customer.setdefault("customer_code", f"CUST{customer['customer_id']:04d}")
+    customer.setdefault("created_at", NOW)
+    audit(store, req.user, f"Created customer {customer['full_name']}", "customers")
+    return 201, customer
+
+
+@route("GET", r"/auth/customers/(?P<pk>\d+)/")
+def get_customer(store, req):
+    customer = store.get("customers", req.params["pk"])
+    return (200, customer) if customer else not_found()
+
+
+@route("PUT|PATCH", r"/auth/customers/(?P<pk>\d+)/")
+def update_customer(store, req):
+    customer = store.get("customers", req.params["pk"])
+    if not customer:
+        return not_found()
+    customer.update({k: v for k, v in req.body.items() if k != "customer_id"})
+    return 200, customer
+
+
+@route("DELETE", r"/auth/customers/(?P<pk>\d+)/")
+def delete_customer(store, req):
+    return (204, None) if store.delete("customers", req.params["pk"]) else not_found()
+
+
+@route("POST", "/customers/upload-documents/")
+def upload_customer_documents(store, req):
+    return 201, {"message": "Documents uploaded successfully"}
+
+
+# Loans
+
+@route("GET", "/auth/loan-types/")
+def list_loan_types(store, req):
+    return 200, store.table("loan_types")
+
+
+@route("GET", "/auth/loans/")
+def list_loans(store, req):
+    return 200, filtered(store.table("loans"), req.query)
+
+
+@route("POST", "/auth/loans/")
+def create_loan(store, req):
+    customer = store.get("customers", req.body.get("customer_id") or req.body.get("customer"))
+    if not customer:
+        return 400, {"customer_id": ["Invalid customer."]}
+    if not req.body.get("principal_amount"):
+        return 400, {"principal_amount": ["This field is required."]}
+    status = req.body.get("loan_status", "pending")
+    loan = store.insert("loans", {
+        "customer": customer["customer_id"],
+        "customer_name": customer["full_name"],
+        "loan_type": req.body.get("loan_type_id") or req.body.get("loan_type"),
+        "principal_amount": f"{float(req.body['principal_amount']):.2f}",
+        "interest_percentage": f"{float(req.body.get('interest_percentage') or 0):.2f}",
+        "total_due_count": int(req.body.get("total_due_count") or 1),
+        "repayment_mode": req.body.get("repayment_mode", "monthly"),
+        "loan_status": status,
+        "status": status,
+        "created_by": req.body.get("created_by", req.user["id"]),
+        "created_at": NOW,
+    })
+    audit(store, req.user, f"Created loan #{loan['loan_id']}", "loans")
+    return 201, loan
+
+
+@route("GET", r"/auth/loans/(?P<pk>\d+)/")
+def get_loan(store, req):
+    loan = store.get("loans", req.params["pk"])
+    return (200, loan) if loan else not_found()
+
+
+@route("GET", r"/auth/loans/(?P<pk>\d+)/details/")
+def loan_details(store, req):
+    loan = store.get("loans", req.params["pk"])
+    if not loan:
+        return not_found()
+    schedules = [s for s in store.table("loan_schedules") if s["loan"] == loan["loan_id"]]
+    return 200, {"loan": loan, "customer": store.get("customers", loan["customer"]), "schedules": schedules}
+
+
+def _set_loan_status(store, req, status):
+    loan = store.get("loans", req.params["pk"])
+    if not loan:
+        return not_found()
+    loan["loan_status"] = loan["status"] = status
+    audit(store, req.user, f"{status.capitalize()} loan #{loan['loan_id']}", "loans")
+    return 200, {"message": f"Loan {status} successfully", "loan": loan}
+
+
+@route("POST", r"/auth/loans/(?P<pk>\d+)/approve/")
+def approve_loan(store, req):
+    return _set_loan_status(store, req, "approved")
+
+
+@route("POST", r"/auth/loans/(?P<pk>\d+)/reject/")
+def reject_loan(store, req):
+    return _set_loan_status(store, req, "rejected")
+
+
+@route("GET", r"/auth/loans/(?P<pk>\d+)/documents/")
+def list_loan_documents(store, req):
+    return 200, [d for d in store.table("documents") if str(d["loan"]) == req.params["pk"]]
+
+
+@route("POST", r"/auth/loans/(?P<pk>\d+)/documents/")
+def upload_loan_documents(store, req):
+    if not store.get("loans", req.params["pk"]):
+        return not_found()
+    document = store.insert("documents", {"loan": int(req.params["pk"]), "name": req.body.get("name", "document")})
+    return 201, document
+
+
+@route("DELETE", r"/auth/documents/(?P<pk>\d+)/")
+def delete_document(store, req):
+    return (204, None) if store.delete("documents", req.params["pk"]) else not_found()
+
+
+@route("GET", "/loan-dues/")
+def list_loan_dues(store, req):
+    return 200, [s for s in store.table("loan_schedules") if s["status"] != "paid"]
+
+
+# Schedules and collections
+
+@route("GET", "/auth/loan-schedules/")
+def list_schedules(store, req):
+    return 200, filtered(store.table("loan_schedules"), req.query)
+
+
+@route("GET", r"/auth/loan-schedules/loan/(?P<pk>\d+)/")
+def schedules_for_loan(store, req):
+    return 200, [s for s in store.table("loan_schedules") if str(s["loan"]) == req.params["pk"]]
+
+
+@route("GET", "/auth/loan-schedules/assigned/")
+def assigned_schedules(store, req):
+    return 200, [s for s in store.table("loan_schedules") if s["assigned_to"] == req.user["id"]]
+
+
+@route("POST", r"/auth/loan-schedules/(?P<pk>\d+)/assign/")
+def assign_schedule(store, req):
+    schedule = store.get("loan_schedules", req.params["pk"])
+    if not schedule:
+        return not_found()
+    agent = store.get("users", req.body.get("assigned_to"))
+    if not agent or agent["role"] != "collection_agent":
+        return 400, {"assigned_to": ["Invalid collection agent."]}
+    schedule["assigned_to"] = agent["id"]
+    return 200, {"message": "Loan schedule assigned successfully", "schedule": schedule}
+
+
+@route("POST", r"/auth/loan-schedules/(?P<pk>\d+)/collect/")
+def collect_payment(store, req):
+    schedule = store.get("loan_schedules", req.params["pk"])
+    if not schedule:
+        return not_found()
+    if schedule["status"] == "paid":
+        return 400, {"error": "Installment already paid"}
+    try:
+        amount = float(req.body.get("paid_amount"))
+    except (TypeError, ValueError):
+        return 400, {"paid_amount": ["A valid number is required."]}
+    method = req.body.get("payment_method", "cash")
+
+    schedule["paid_amount"] = f"{amount:.2f}"
+    schedule["payment_method"] = method
+    schedule["status"] = "paid" if amount >= float(schedule["total_due"]) else "partial"
+
+    today = SEED_DATE.isoformat()
+    daily = next((c for c in store.table("daily_collections")
+                  if c["agent_id"] == req.user["id"] and c["collection_date"] == today), None)
+    if daily is None:
+        daily = store.insert("daily_collections", {
+            "agent_id": req.user["id"], "collection_date": today,
+            "cash_total": "0.00", "upi_total": "0.00", "card_total": "0.00", "total_amount": "0.00",
+        })
+    bucket = f"{method}_total" if f"{method}_total" in daily else "cash_total"
+    daily[bucket] = f"{float(daily[bucket]) + amount:.2f}"
+    daily["total_amount"] = f"{float(daily['total_amount']) + amount:.2f}"
+    audit(store, req.user, f"Collected installment {schedule['installment_no']} of loan #{schedule['loan']}", "collections")
+    return 200, {"message": "Payment collected successfully", "schedule": schedule}
+
+
+@route("GET", "/auth/daily-collections/")
+def list_daily_collections(store, req):
+    return 200, filtered(store.table("daily_collections"), req.query)
+
+
+@route("GET", "/auth/attendance/")
+def list_attendance(store, req):
+    return 200, filtered(store.table("attendance"), req.query)
+
+
+@route("POST", "/auth/attendance/")
+def create_attendance(store, req):
+    return 201, store.insert("attendance", {"user": req.user["id"], **req.body})
+
+
+@route("POST", "/auth/attendance/(?P<action>checkin|checkout)/")
+def check_in_out(store, req):
+    today = SEED_DATE.isoformat()
+    record = next((a for a in store.table("attendance") if a["user"] == req.user["id"] and a["date"] == today), None)
+    if record is None:
+        record = store.insert("attendance", {"user": req.user["id"], "date": today, "status": "present",
+                                             "check_in": None, "check_out": None})
+    if req.params["action"] == "checkin":
+        record["check_in"] = "09:00"
+    else:
+        record["check_out"] = "18:00"
+    return 200, record
+
+
+# Notifications
+
+@route("GET", "/auth/notifications/")
+def list_notifications(store, req):
+    return 200, filtered(store.table("notifications"), req.query)
+
+
+@route("PATCH", r"/auth/notifications/(?P<pk>\d+)/")
+def update_notification(store, req):
+    notification = store.get("notifications", req.params["pk"])
+    if not notification:
+        return not_found()
+    notification.update({k: v for k, v in req.body.items() if k in ("is_read",)})
+    return 200, notification
+
+
+@route("POST", "/auth/notifications/bulk/")
+def bulk_notifications(store, req):
+    user_ids = req.body.get("user_ids") or [u["id"] for u in store.table("users") if u["role"] == "collection_agent"]
+    for user_id in user_ids:
+        notification = store.insert("notifications", {
+            "user_id": user_id, "title": req.body.get("title", "Reminder"), "message": req.body.get("message", ""),
+            "type": req.body.get("type", "info"), "is_read": False, "created_at": NOW,
+        })
+        notification["notification_id"] = notification["id"]
+    return 201, {"message": f"Sent {len(user_ids)} notifications", "count": len(user_ids)}
+
+
+# Disbursements and audit
+
+@route("GET", "/auth/disbursements/")
+def list_disbursements(store, req):
+    return 200, filtered(store.table("disbursements"), req.query)
+
+
+@route("POST", "/auth/disbursements/")
+def create_disbursement(store, req):
+    loan = store.get("loans", req.body.get("loan_id") or req.body.get("loan"))
+    if not loan:
+        return 400, {"loan_id": ["Invalid loan."]}
+    disbursement = store.insert("disbursements", {
+        "loan_id": loan["loan_id"],
+        "amount": f"{float(req.body.get('amount') or loan['principal_amount']):.2f}",
+        "method": req.body.get("method", "bank_transfer"),
+        "status": "disbursed",
+        "created_at": NOW,
+    })
+    disbursement["reference"] = f"DISB{disbursement['id']:04d}"
+    audit(store, req.user, f"Disbursed loan #{loan['loan_id']}", "disbursements")
+    return 201, {**disbursement, "message": "Amount disbursed successfully"}
+
+
+@route("GET", r"/auth/disbursements/(?P<pk>\d+)/")
+def get_disbursement(store, req):
+    disbursement = store.get("disbursements", req.params["pk"])
+    return (200, disbursement) if disbursement else not_found()
+
+
+@route("GET", "/auth/audit-logs/")
+def list_audit_logs(store, req):
+    return 200, filtered(store.table("audit_logs"), req.query)
+
+
+@route("POST", "/auth/audit-logs/")
+def create_audit_log(store, req):
+    return 201, store.insert("audit_logs", {
+        "user": req.user["username"], "timestamp": NOW, **req.body,
+    })
+
+
+# Reports
+
+@route("GET", "/auth/reports/collections/")
+def collection_report(store, req):
+    rows = store.table("daily_collections")
+    return 200, {
+        "total_collected": f"{sum(float(r['total_amount']) for r in rows):.2f}",
+        "by_agent": {str(r["agent_id"]): r["total_amount"] for r in rows},
+        "collections": rows,
+    }
+
+
+@route("GET", "/auth/reports/performance/")
+def performance_report(store, req):
+    agents = [u for u in store.table("users") if u["role"] == "collection_agent"]
+    report = []
+    for agent in agents:
+        schedules = [s for s in store.table("loan_schedules") if s["assigned_to"] == agent["id"]]
+        paid = [s for s in schedules if s["status"] == "paid"]
+        report.append({
+            "agent_id": agent["id"],
+            "agent": agent["username"],
+            "assigned": len(schedules),
+            "collected": len(paid),
+            "collection_rate": round(100 * len(paid) / len(schedules), 1) if schedules else 0,
+        })
+    return 200, report
+
+
+@route("GET", "/auth/reports/targets/")
+def target_report(store, req):
+    collected = sum(float(r["total_amount"]) for r in store.table("daily_collections"))
+    return 200, {"monthly_target": 100000, "achieved": round(collected, 2),
+                 "achievement_percentage": round(collected / 1000, 1)}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MockBackend/1.0"
+    # Headers and body go out in separate writes; without this every keep-alive
+    # response waits ~40ms on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def do_OPTIONS(self):
+        self._send(204, None)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self, method):
+        # Requests arriving through the browser's proxy use absolute-form targets
+        url = urlsplit(self.path)
+        path = url.path[len("/api"):] if url.path.startswith("/api/") else url.path
+        self.server.backend.requests.append((method, url.netloc or self.headers.get("Host", ""), path))
+        query = dict(parse_qsl(url.query))
+        body = self._read_body()
+        try:
+            status, payload = self.server.backend.handle(method, path, query, body, self.headers.get("Authorization", ""))
+        except Exception as e:
+            status, payload = 500, {"detail": f"Mock backend error: {e!r}"}
+        self._send(status, payload)
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if not raw or "json" not in self.headers.get("Content-Type", ""):
+            return {}
+        try:
+            body = json.loads(raw)
+        except ValueError:
+            return {}
+        return body if isinstance(body, dict) else {"items": body}
+
+    def _send(self, status, payload):
+        data = b"" if payload is None else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Access-Control-Allow-Origin", self.headers.get("Origin") or "*")
+        self.send_header("Access-Control-Allow-Credentials", "true")
+        self.send_header("Access-Control-Allow-Headers", "Authorization, Content-Type")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, PUT, PATCH, DELETE, OPTIONS")
+        if data:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class MockBackend:
+    """Stand-in for the Django API, served from a background thread on a free port"""
+
+    def __init__(self, store=None, host="127.0.0.1", port=0):
+        self.store = store or Store()
+        self.server = ThreadingHTTPServer((host, port), _Handler)
+        self.server.daemon_threads = True
+        self.server.backend = self
+        # (method, host, path) of every request received, e.g. to check the browser really reaches the mock
+        self.requests = deque(maxlen=REQUEST_LOG_SIZE)
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_url(self):
+        return f"{self.url}/api"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="mock-backend", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def handle(self, method, path, query, body, authorization):
+        """Route one request and return `(status, payload)`"""
+        path_matched = False
+        for methods, pattern, public, func in ROUTES:
+            match = pattern.match(path)
+            if not match:
+                continue
+            path_matched = True
+            if method not in methods.split("|"):
+                continue
+            with self.store.lock:
+                user = None
+                if authorization.startswith("Token "):
+                    user = self.store.user_for_token(authorization[len("Token "):])
+                if user is None and not public:
+                    return 401, {"detail": "Authentication credentials were not provided."}
+                return func(self.store, Request(method, path, query, body, user, match.groupdict()))
+        if path_matched:
+            return 405, {"detail": f'Method "{method}" not allowed.'}
+        return not_found()
+
+
+LIVE_ORIGIN = "http://127.0.0.1:8000"
+# Requests remembered in MockBackend.requests, newest last
+REQUEST_LOG_SIZE = 1000
+
+
+def chrome_arguments(backend, app_url=None):
+    """Chrome flags that route the app's hard-coded API origin to `backend`.
+
+    The frontend builds URLs from http://127.0.0.1:8000 in many components, so
+    instead of rewriting them the browser sends its traffic through the mock
+    server as a proxy. The mock understands absolute-form request targets.
+    """
+    host, port = backend.server.server_address[:2]
+    return proxy_arguments(host, port, app_url)
+
+
+def proxy_bypass_list(app_url=None):
+    """Chrome bypass rules that proxy loopback hosts too, except the app's own origin"""
+    # Chrome bypasses loopback (127.0.0.1:8000 included) implicitly; <-loopback> removes that rule
+    rules = ["<-loopback>"]
+    if app_url:
+        app = urlsplit(app_url)
+        rules.append(f"{app.hostname}:{app.port or 80}")
+    return ";".join(rules)
+
+
+def proxy_arguments(host, port, app_url=None):
+    """Chrome flags that send every request except the app's own through the proxy at host:port.
+
+    Chrome reads --proxy-bypass-list only together with --proxy-server, and it
+    never hands loopback URLs to a PAC script, so the proxy is set for all
+    traffic. Other external hosts (web fonts) then reach the proxy and fail fast.
+    """
+    return [f"--proxy-server=http://{host}:{port}", f"--proxy-bypass-list={proxy_bypass_list(app_url)}"]
@@ -0,0 +1,295 @@
+"""Per-route API call accounting from ChromeDriver's performance log.
+
+Every browser the suite launches has the performance log enabled (see
+driver_pool.chrome_options), which streams the DevTools Network and Page
+events. NetworkLog replays them in order and tracks the main frame's URL
+through full loads and in-document (history API) navigations. Each XHR/fetch
+request is charged to the route that was showing when it was sent.
+
+Per route it reports the call count, transferred bytes, serial vs. wall
+time (how much the calls overlapped), the longest chain of calls that each
+waited for the previous one to finish, and requests that were sent more
+than once with the same method, URL and body.
+"""
+import json
+import os
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+from selector_cache import route_key
+
+API_TYPES = {"XHR", "Fetch"}
+# Raw Network.* events kept per test for a HAR on failure
+HAR_EVENTS = 5000
+
+
+def logging_capabilities(options):
+    """Turn on the DevTools performance log with network and page events, and the console log"""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL", "browser": "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": True})
+    return options
+
+
+def discard_log(driver, log_type="performance"):
+    """Drop buffered log entries, e.g. those left over from the previous lease"""
+    try:
+        driver.get_log(log_type)
+    except Exception:
+        pass
+
+
+class Request:
+    def __init__(self, request_id, route, method, url, body, resource_type, started):
+        self.request_id = request_id
+        self.route = route
+        self.method = method
+        self.url = url
+        self.body = body
+        self.resource_type = resource_type
+        self.started = started
+        self.finished = None
+        self.status = None
+        self.bytes = 0
+        self.failed = False
+
+    @property
+    def key(self):
+        return f"{self.method} {self.url} {self.body or ''}".rstrip()
+
+    @property
+    def duration_ms(self):
+        return (self.finished - self.started) * 1000 if self.finished else 0.0
+
+    def as_dict(self):
+        return {
+            "method": self.method, "url": self.url, "status": self.status, "bytes": self.bytes,
+            "start_ms": round(self.started * 1000, 1), "duration_ms": round(self.duration_ms, 1),
+            "failed": self.failed,
+        }
+
+
+def route_summary(requests):
+    """Counts, bytes, overlap and duplicates for one route's API calls"""
+    done = sorted((r for r in requests if r.finished), key=lambda r: r.started)
+    serial = sum(r.duration_ms for r in done)
+
+    # Wall time is the union of the request intervals
+    wall, end = 0.0, None
+    for r in done:
+        if end is None or r.started > end:
+            wall += r.duration_ms
+            end = r.finished
+        elif r.finished > end:
+            wall += (r.finished - end) * 1000
+            end = r.finished
+
+    # Longest chain of calls where each one started after the previous finished
+    depth = {}
+    for r in done:
+        depth[r] = 1 + max((depth[p] for p in done if p.finished <= r.started and p is not r), default=0)
+
+    counts = defaultdict(int)
+    for r in requests:
+        counts[r.key] += 1
+    return {
+        "calls": len(requests),
+        "bytes": sum(r.bytes for r in requests),
+        "failed": sum(1 for r in requests if r.failed or (r.status or 0) >= 400),
+        "serial_ms": round(serial, 1),
+        "wall_ms": round(wall, 1),
+        "parallelism": round(serial / wall, 2) if wall else 0.0,
+        "waterfall_depth": max(depth.values(), default=0),
+        "duplicates": {key: n for key, n in sorted(counts.items()) if n > 1},
+    }
+
+
+def _headers(headers):
+    return [{"name": name, "value": value} for name, value in (headers or {}).items()]
+
+
+def _har_entry(params):
+    request = params["request"]
+    url = request["url"]
+    entry = {
+        "startedDateTime": datetime.fromtimestamp(params["wallTime"], timezone.utc).isoformat(),
+        "time": 0,
+        "request": {
+            "method": request["method"], "url": url, "httpVersion": "", "cookies": [],
+            "headers": _headers(request.get("headers")), "headersSize": -1,
+            "queryString": [{"name": k, "value": v} for k, _, v in
+                            (part.partition("=") for part in url.partition("?")[2].split("&") if part)],
+            "bodySize": len(request.get("postData") or ""),
+        },
+        "response": {
+            "status": 0, "statusText": "", "httpVersion": "", "cookies": [], "headers": [], "redirectURL": "",
+            "content": {"size": 0, "mimeType": ""}, "headersSize": -1, "bodySize": -1,
+        },
+        "cache": {},
+        "timings": {"send": 0, "wait": -1, "receive": -1},
+        "_resourceType": params.get("type", "Other"),
+        "_started": params["timestamp"],
+    }
+    if request.get("postData"):
+        entry["request"]["postData"] = {"mimeType": (request.get("headers") or {}).get("Content-Type", ""),
+                                        "text": request["postData"]}
+    return entry
+
+
+def har(events):
+    """A HAR 1.2 log of the requests in a sequence of raw Network.* events (no response bodies)"""
+    entries = {}
+    for message in events:
+        method, params = message["method"], message.get("params", {})
+        entry = entries.get(params.get("requestId"))
+        if method == "Network.requestWillBeSent":
+            entries[params["requestId"]] = _har_entry(params)
+        elif entry is None:
+            continue
+        elif method == "Network.responseReceived":
+            response = params["response"]
+            entry["response"].update(status=response["status"], statusText=response.get("statusText", ""),
+                                     httpVersion=response.get("protocol", ""),
+                                     headers=_headers(response.get("headers")))
+            entry["response"]["content"]["mimeType"] = response.get("mimeType", "")
+            entry["timings"]["wait"] = round((params["timestamp"] - entry["_started"]) * 1000, 1)
+            entry["_responded"] = params["timestamp"]
+        elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+            entry["time"] = round((params["timestamp"] - entry["_started"]) * 1000, 1)
+            if "_responded" in entry:
+                entry["timings"]["receive"] = round((params["timestamp"] - entry["_responded"]) * 1000, 1)
+            if method == "Network.loadingFailed":
+                entry["_error"] = params.get("errorText", "failed")
+            else:
+                entry["response"]["bodySize"] = entry["response"]["content"]["size"] = \
+                    params.get("encodedDataLength", 0)
+    for entry in entries.values():
+        entry.pop("_started")
+        entry.pop("_responded", None)
+    return {"log": {"version": "1.2", "creator": {"name": "loanfront tests", "version": "1"}, "pages": [],
+                    "entries": list(entries.values())}}
+
+
+class NetworkLog:
+    def __init__(self, driver):
+        self.driver = driver
+        self.route = None
+        self.requests = []
+        self.events = deque(maxlen=HAR_EVENTS)
+        self._pending = {}
+        discard_log(driver)
+
+    def drain(self):
+        """Consume the performance log entries buffered since the last drain"""
+        for entry in self.driver.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            if message["method"].startswith("Network."):
+                self.events.append(message)
+            self._handle(message["method"], message.get("params", {}))
+        return self
+
+    def _handle(self, method, params):
+        if method == "Page.frameNavigated" and not params["frame"].get("parentId"):
+            self.route = route_key(params["frame"]["url"])
+        elif method == "Page.navigatedWithinDocument":
+            self.route = route_key(params["url"])
+        elif method == "Network.requestWillBeSent":
+            if params.get("type") not in API_TYPES:
+                return
+            request = params["request"]
+            # Redirects reuse the request id; keep the final hop
+            self._pending[params["requestId"]] = Request(
+                params["requestId"], self.route, request["method"], request["url"], request.get("postData"),
+                params["type"], params["timestamp"],
+            )
+        elif method == "Network.responseReceived":
+            request = self._pending.get(params["requestId"])
+            if request:
+                request.status = params["response"]["status"]
+        elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+            request = self._pending.pop(params["requestId"], None)
+            if request:
+                request.finished = params["timestamp"]
+                request.bytes = params.get("encodedDataLength", 0)
+                request.failed = method == "Network.loadingFailed"
+                self.requests.append(request)
+
+    def api_calls(self, route=None):
+        self.drain()
+        return [r for r in self.requests if route is None or r.route == route]
+
+    def summary(self):
+        """route -> route_summary for everything seen so far"""
+        by_route = defaultdict(list)
+        for request in self.api_calls():
+            by_route[request.route or "(none)"].append(request)
+        return {route: route_summary(requests) for route, requests in sorted(by_route.items())}
+
+    def assert_budget(self, route, max_calls=None, max_duplicates=None, max_waterfall=None, endpoints=None):
+        """Fail if the API calls made on `route` exceed the given budgets; `endpoints` (URL paths such as
+        "/auth/loans/") limits the budget to the calls to those endpoints"""
+        calls = self.api_calls(route)
+        if endpoints is not None:
+            calls = [r for r in calls if urlsplit(r.url).path.endswith(tuple(endpoints))]
+            route = f"{route} {', '.join(endpoints)}"
+        summary = route_summary(calls)
+        problems = []
+        if max_calls is not None and summary["calls"] > max_calls:
+            problems.append(f"{summary['calls']} API calls > {max_calls}")
+        duplicated = sum(n - 1 for n in summary["duplicates"].values())
+        if max_duplicates is not None and duplicated > max_duplicates:
+            problems.append(f"{duplicated} duplicate calls > {max_duplicates}: {summary['duplicates']}")
+        if max_waterfall is not None and summary["waterfall_depth"] > max_waterfall:
+            problems.append(f"waterfall depth {summary['waterfall_depth']} > {max_waterfall}")
+        assert not problems, f"{route}: " + "; ".join(problems)
+
+
+class NetworkReport:
+    """Controller plugin that merges every test's per-route API usage and writes it out"""
+
+    def __init__(self, path):
+        self.path = path
+        self.tests = {}
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "teardown":
+            summary = dict(report.user_properties).get("network")
+            if summary:
+                self.tests[report.nodeid] = summary
+
+    def routes(self):
+        """Per-route totals across tests, with the largest duplicate count seen in a single test"""
+        routes = {}
+        for summary in self.tests.values():
+            for route, s in summary.items():
+                total = routes.setdefault(route, {"tests": 0, "calls": 0, "bytes": 0, "serial_ms": 0.0,
+                                                  "wall_ms": 0.0, "max_waterfall_depth": 0, "duplicates": {}})
+                total["tests"] += 1
+                for name in ("calls", "bytes", "serial_ms", "wall_ms"):
+                    total[name] += s[name]
+                total["max_waterfall_depth"] = max(total["max_waterfall_depth"], s["waterfall_depth"])
+                for key, n in s["duplicates"].items():
+                    total["duplicates"][key] = max(total["duplicates"].get(key, 0), n)
+        return dict(sorted(routes.items()))
+
+    def pytest_sessionfinish(self):
+        if not self.tests:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump({"routes": self.routes(), "tests": self.tests}, f, indent=1)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.tests:
+            return
+        terminalreporter.section("API calls per route")
+        for route, total in self.routes().items():
+            calls = total["calls"] / total["tests"]
+            terminalreporter.write_line(
+                f"{route:<32} {calls:5.1f} calls/visit  {total['bytes'] / total['tests'] / 1024:7.1f} KiB  "
+                f"depth {total['max_waterfall_depth']}  {len(total['duplicates'])} duplicated"
+            )
+            for key, n in total["duplicates"].items():
+                terminalreporter.write_line(f"    {n}x {key}")
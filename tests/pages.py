@@ -0,0 +1,297 @@
+"""Page objects that resolve a whole screen in one WebDriver round-trip.
+
+Every page declares its elements as name -> selector (CSS, or XPath when it
+starts with / or ( ). resolve() and wait_for() look all of them up with a
+single execute_script and bring back each element together with its
+visibility and text, and fill() sets several form fields in one call too.
+
+fill() assigns values through the native setters and dispatches input and
+change events, which React's controlled inputs and selects accept. Fields
+that react to individual keystrokes (search-as-you-type, masked inputs)
+should still get send_keys.
+"""
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from waits import navigate
+
+QUERY_JS = """
+function isXPath(selector) {
+  return selector.startsWith('/') || selector.startsWith('(');
+}
+function query(selector, many) {
+  try {
+    if (isXPath(selector)) {
+      const found = document.evaluate(selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+      const nodes = [];
+      for (let i = 0; i < found.snapshotLength && (many || i < 1); i++) nodes.push(found.snapshotItem(i));
+      return nodes;
+    }
+    return many ? Array.from(document.querySelectorAll(selector)) : [document.querySelector(selector)].filter(Boolean);
+  } catch (e) {
+    return [];
+  }
+}
+"""
+
+RESOLVE_SCRIPT = QUERY_JS + """
+function describe(element) {
+  const rect = element.getBoundingClientRect();
+  const style = window.getComputedStyle(element);
+  return {
+    element: element,
+    visible: rect.width > 0 && rect.height > 0 && style.visibility !== 'hidden' && style.opacity !== '0',
+    enabled: !element.disabled,
+    text: (element.innerText || '').trim(),
+  };
+}
+const result = {};
+for (const [name, selector, many] of arguments[0]) {
+  const nodes = query(selector, many);
+  result[name] = many ? nodes.map(describe) : (nodes.length ? describe(nodes[0]) : null);
+}
+return result;
+"""
+
+FILL_SCRIPT = QUERY_JS + """
+const problems = [];
+for (const [name, selector, value] of arguments[0]) {
+  const element = query(selector, false)[0];
+  if (!element) {
+    problems.push(`${name}: no element matches ${selector}`);
+    continue;
+  }
+  if (element.tagName === 'SELECT') {
+    const options = Array.from(element.options);
+    const index = typeof value === 'number' ? value : options.findIndex(o => o.value === value);
+    if (index < 0 || index >= options.length) {
+      problems.push(`${name}: no option ${JSON.stringify(value)}`);
+      continue;
+    }
+    element.selectedIndex = index;
+  } else {
+    const prototype = element.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(prototype, 'value').set.call(element, value);
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+  }
+  element.dispatchEvent(new Event('change', {bubbles: true}));
+}
+return problems;
+"""
+
+
+class Found:
+    """An element as resolved by a page object, with its visibility and text at that moment"""
+
+    def __init__(self, element, visible, enabled, text):
+        self.element = element
+        self.visible = visible
+        self.enabled = enabled
+        self.text = text
+
+    def click(self):
+        self.element.click()
+
+
+def _found(entry):
+    return Found(entry["element"], entry["visible"], entry["enabled"], entry["text"])
+
+
+class Page:
+    path = None
+    # name -> selector of a single element
+    elements = {}
+    # name -> selector of an element collection
+    lists = {}
+
+    def __init__(self, driver, base_url=""):
+        self.driver = driver
+        self.base_url = base_url
+        self.found = {}
+
+    def open(self):
+        navigate(self.driver, f"{self.base_url}{self.path}")
+        return self
+
+    def resolve(self, *names):
+        """Look up the named elements (all of them by default) in one call"""
+        names = names or list(self.elements) + list(self.lists)
+        specs = [[name, self.elements[name], False] if name in self.elements else [name, self.lists[name], True]
+                 for name in names]
+        for name, entry in self.driver.execute_script(RESOLVE_SCRIPT, specs).items():
+            if name in self.lists:
+                self.found[name] = [_found(e) for e in entry]
+            else:
+                self.found[name] = _found(entry) if entry else None
+        return self
+
+    def wait_for(self, *names, clickable=False, timeout=10):
+        """Poll until every named element is present (and visible and enabled with clickable);
+        each poll is a single round-trip for all of them"""
+        def ready(driver):
+            self.resolve(*names)
+            found = [self.found[name] for name in names if name in self.elements]
+            if any(f is None for f in found):
+                return False
+            return not clickable or all(f.visible and f.enabled for f in found)
+
+        WebDriverWait(self.driver, timeout).until(ready, f"{type(self).__name__} never showed {', '.join(names)}")
+        return self
+
+    def __getitem__(self, name):
+        if name not in self.found:
+            self.resolve(name)
+        found = self.found[name]
+        if found is None:
+            raise NoSuchElementException(f"{type(self).__name__}.{name}: nothing matches {self.elements[name]}")
+        return found
+
+    def click(self, name):
+        self[name].click()
+
+    def fill(self, **values):
+        """Set several fields in one call; selects take an option value, or an int for the option index"""
+        problems = self.driver.execute_script(
+            FILL_SCRIPT, [[name, self.elements[name], value] for name, value in values.items()])
+        if problems:
+            raise NoSuchElementException(f"{type(self).__name__}.fill: {'; '.join(problems)}")
+        return self
+
+
+class LoginPage(Page):
+    path = "/login"
+    elements = {
+        "email": "input[type='email']",
+        "password": "input[type='password']",
+        "submit": "button[type='submit']",
+        "error": ".error-msg",
+    }
+
+
+class LoanApplicationWizard(Page):
+    path = "/admin/loan-applications"
+    elements = {
+        "new_application": "//button[contains(text(), 'New Application')]",
+        "next": "//button[contains(text(), 'Next')]",
+        # Step 1
+        "customer": "select",
+        # Step 2
+        "loan_amount": "input[placeholder*='Loan Amount']",
+        "loan_type": "(//select)[1]",
+        "total_due": "input[placeholder*='Total Due']",
+        "interest": "input[placeholder*='Interest']",
+        "repayment_mode": "(//select)[2]",
+        # Step 3
+        "created_by": "input[placeholder*='Created By']",
+        "submit": "//button[contains(text(), 'Submit')]",
+        "success": "//*[contains(text(), 'successfully')]",
+    }
+
+
+class LoansPage(Page):
+    path = "/admin/loans"
+    elements = {
+        "first_loan": "tr:nth-child(2), .loan-item:first-child",
+        "details": ".loan-details, .loan-info",
+        "approve": "//button[contains(text(), 'Approve')]",
+        "confirm": "//button[contains(text(), 'Confirm')]",
+        "approved": "//*[contains(text(), 'approved')]",
+    }
+
+
+class CustomersPage(Page):
+    path = "/admin/customers"
+    elements = {
+        "table": "table, .customer-list",
+        "search": "input[placeholder*='search'], input[type='search']",
+    }
+    lists = {
+        "rows": ".customer-row, tr",
+    }
+
+
+class DisbursementsPage(Page):
+    path = "/admin/disbursements"
+    elements = {
+        "table": "table, .disbursements-list",
+        "create": "//button[contains(text(), 'Create Disbursement')]",
+        "loan": "select[name='loan_id']",
+        "amount": "input[name='amount']",
+        "method": "select[name='method']",
+        "submit": "//button[contains(text(), 'Submit')]",
+        "success": "//*[contains(text(), 'disbursed')]",
+    }
+
+
+class RolesPage(Page):
+    path = "/admin/roles"
+    elements = {
+        "table": "table, .roles-list",
+        "create": "//button[contains(text(), 'Create Role')]",
+        "name": "input[name='name']",
+        "description": "textarea[name='description']",
+        "save": "//button[contains(text(), 'Save Role')]",
+        "success": "//*[contains(text(), 'created')]",
+    }
+    lists = {
+        "permissions": "input[type='checkbox']",
+    }
+
+
+class AuditTrailPage(Page):
+    path = "/admin/audit"
+    elements = {
+        "table": "table, .audit-logs",
+        "date": "input[type='date']",
+        "user": "select[name='user']",
+        "filter": "//button[contains(text(), 'Filter')]",
+    }
+
+
+class AgentLoansPage(Page):
+    """The agent's assigned installments; each pending one links to its loan's CollectPaymentPage"""
+    path = "/agent/assigned-loans"
+    elements = {
+        "collect": "a.action-btn.collect",
+    }
+
+
+class CollectPaymentPage(Page):
+    """/agent/collect/<loan id>, reached through AgentLoansPage. Its selects have no names: the first
+    picks the installment, and the method, the amount and the button only appear once one is picked."""
+    elements = {
+        "schedule": "(//select[contains(@class, 'form-select')])[1]",
+        "payment_method": "(//select[contains(@class, 'form-select')])[2]",
+        "amount": "input[type='number']",
+        "submit": "//button[contains(text(), 'Collect Payment')]",
+        "success": "//div[contains(@class, 'alert') and contains(., 'collected')]",
+    }
+    lists = {
+        # "All Dues" columns; the rows are in the same order as the schedule options
+        "totals": "table tbody td:nth-child(3)",
+        "statuses": "table tbody td:nth-child(4)",
+    }
+
+    def first_pending(self):
+        """(schedule option index, total due) of the first pending installment, or None"""
+        self.resolve("totals", "statuses")
+        for n, (total, status) in enumerate(zip(self.found["totals"], self.found["statuses"])):
+            if status.text.lower() == "pending":
+                # Option 0 is the "-- Select an Installment --" placeholder
+                return n + 1, total.text.lstrip("₹")
+        return None
+
+    def collect(self, method="cash", timeout=10):
+        """Pay the first pending installment in full and wait for the confirmation;
+        False if nothing on this loan is pending"""
+        self.wait_for("schedule", timeout=timeout)
+        pending = self.first_pending()
+        if pending is None:
+            return False
+        index, total = pending
+        self.fill(schedule=index)
+        self.wait_for("payment_method", "amount", "submit", timeout=timeout)
+        self.fill(payment_method=method, amount=total)
+        self.click("submit")
+        self.wait_for("success", timeout=timeout)
+        return True
@@ -0,0 +1,189 @@
+"""Session-start checks that the app, the API and the browser are usable.
+
+Without them, a dead Vite server or API makes every test launch Chrome
+and sit through its waits before failing with a timeout that says nothing
+about the cause. Preflight probes everything the run depends on in
+parallel:
+
+- frontend: the app URL answers with the index page
+- api: the admin account can log in through /auth/login/
+- browser: Chrome is installed and the chromedriver on PATH (if any) has the
+  same major version
+
+A probe that fails is retried every POLL_INTERVAL seconds until the warm-up
+window (--preflight-wait) runs out, so a run can start together with the
+services. Passed probes are cached in CACHE_FILE for CACHE_TTL seconds, so
+xdist workers and back-to-back runs don't probe again.
+
+Tests ask for the probes they need with Preflight.require(). With
+--preflight=abort (the default), the first test that hits a failed probe
+ends the session with the diagnosis. With --preflight=skip, only the tests
+that depend on the failed service are skipped. For example, the API
+contract tests still run when only the frontend is down.
+"""
+import json
+import os
+import re
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from auth_session import CREDENTIALS
+
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".preflight.json")
+CACHE_TTL = 30
+POLL_INTERVAL = 1
+PROBE_TIMEOUT = 3
+
+CHROME_BINARIES = ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome"]
+
+
+class ProbeFailed(Exception):
+    pass
+
+
+def probe_frontend(url):
+    try:
+        response = requests.get(url, timeout=PROBE_TIMEOUT)
+    except requests.RequestException as e:
+        raise ProbeFailed(f"frontend at {url} is not reachable ({type(e).__name__}); "
+                          f"start it with `npm run dev`, or use --frontend=bundle")
+    if response.status_code >= 400 or "<script" not in response.text:
+        raise ProbeFailed(f"frontend at {url} answered {response.status_code} without the app's index page")
+    return f"{url} answered {response.status_code}"
+
+
+def probe_api(api_url):
+    email, password = CREDENTIALS["admin"]
+    try:
+        response = requests.post(f"{api_url}/auth/login/", json={"email": email, "password": password},
+                                 timeout=PROBE_TIMEOUT)
+    except requests.RequestException as e:
+        raise ProbeFailed(f"API at {api_url} is not reachable ({type(e).__name__}); "
+                          f"start the backend, or use --backend=mock")
+    try:
+        token = response.json().get("token")
+    except ValueError:
+        token = None
+    if not response.ok or not token:
+        raise ProbeFailed(f"API at {api_url} is up but {email} cannot log in: "
+                          f"{response.status_code} {response.text[:200]}")
+    return f"{email} logged in"
+
+
+def _version(command):
+    try:
+        output = subprocess.run([command, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError) as e:
+        raise ProbeFailed(f"`{command} --version` failed: {e}")
+    match = re.search(r"(\d+)\.[\d.]+", output)
+    return (match.group(0), int(match.group(1))) if match else (output.strip(), None)
+
+
+def probe_browser():
+    chrome = next((path for path in map(shutil.which, CHROME_BINARIES) if path), None)
+    if not chrome:
+        raise ProbeFailed(f"no Chrome found on PATH (looked for {', '.join(CHROME_BINARIES)})")
+    chrome_version, chrome_major = _version(chrome)
+    driver = shutil.which("chromedriver")
+    if not driver:
+        # Selenium Manager downloads a matching driver
+        return f"Chrome {chrome_version}, chromedriver from Selenium Manager"
+    driver_version, driver_major = _version(driver)
+    if chrome_major != driver_major:
+        raise ProbeFailed(f"chromedriver {driver_version} ({driver}) does not match Chrome {chrome_version} "
+                          f"({chrome}); update chromedriver or remove it from PATH to let Selenium fetch one")
+    return f"Chrome {chrome_version}, chromedriver {driver_version}"
+
+
+def _load_cache(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(path, entries):
+    # Written whole and renamed, since several workers may finish at once
+    temporary = f"{path}.{os.getpid()}"
+    with open(temporary, "w") as f:
+        json.dump(entries, f, indent=1, sort_keys=True)
+    os.replace(temporary, path)
+
+
+class Preflight:
+    """Probes the run depends on; `probes` maps a name to (cache key, function, args)"""
+
+    def __init__(self, probes, wait=0, mode="abort", worker=False, cache_file=CACHE_FILE):
+        self.probes = probes
+        self.wait = wait
+        self.mode = mode
+        self.worker = worker
+        self.cache_file = cache_file
+        self.results = {}
+        self.failures = {}
+        self._reported = False
+
+    def run(self):
+        cache = _load_cache(self.cache_file) if self.cache_file else {}
+        now = time.time()
+        pending = {}
+        for name, (key, probe, args) in self.probes.items():
+            cached = cache.get(key)
+            if cached and now - cached["at"] < CACHE_TTL:
+                self.results[name] = f"{cached['detail']} (cached)"
+            else:
+                pending[name] = (probe, args)
+        if pending:
+            deadline = time.monotonic() + self.wait
+            with ThreadPoolExecutor(len(pending)) as pool:
+                outcomes = dict(zip(pending, pool.map(lambda item: self._poll(*item, deadline), pending.values())))
+            for name, (ok, detail) in outcomes.items():
+                if ok:
+                    self.results[name] = detail
+                    cache[self.probes[name][0]] = {"at": time.time(), "detail": detail}
+                else:
+                    self.failures[name] = detail
+            if self.cache_file:
+                try:
+                    _save_cache(self.cache_file, {k: v for k, v in cache.items() if time.time() - v["at"] < CACHE_TTL})
+                except OSError:
+                    pass
+        return self
+
+    @staticmethod
+    def _poll(probe, args, deadline):
+        while True:
+            try:
+                return True, probe(*args)
+            except ProbeFailed as e:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False, str(e)
+            time.sleep(min(POLL_INTERVAL, remaining))
+
+    def diagnosis(self, names=None):
+        """What is wrong with the probes in `names` (all by default), or "" if nothing is"""
+        failed = [(name, detail) for name, detail in self.failures.items() if names is None or name in names]
+        if not failed:
+            return ""
+        waited = f" after waiting {self.wait:g}s" if self.wait else ""
+        return f"preflight failed{waited}:\n" + "\n".join(f"  {name}: {detail}" for name, detail in failed)
+
+    def require(self, *names):
+        """Skip the calling test, or end the session, if a probe it needs failed"""
+        problem = self.diagnosis(names)
+        if not problem:
+            return
+        if self.mode == "skip":
+            pytest.skip(problem)
+        if self.worker and not self._reported:
+            # An xdist worker's exit message never reaches the terminal; report it as this test's error first
+            self._reported = True
+            pytest.fail(problem, pytrace=False)
+        pytest.exit(problem, returncode=pytest.ExitCode.INTERRUPTED)
@@ -0,0 +1,235 @@
+"""Per-test wall-time breakdown of the Selenium harness.
+
+When enabled with --profile-harness, the WebDriver command layer,
+WebDriverWait, time.sleep and the harness's own phases (browser startup,
+pool reset, readiness waits) are timed and attributed per test. The
+outermost phase owns the time, so the find_element calls a WebDriverWait
+makes while polling count as wait time, not as separate commands.
+Whatever is left over is reported as "other" (test code, HTTP setup...).
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support.wait import WebDriverWait
+
+CATEGORIES = [
+    "browser_startup",
+    "browser_reset",
+    "navigation",
+    "wait_polling",
+    "settle_wait",
+    "sleep",
+    "selector_miss",
+    "page_source",
+    "webdriver_command",
+    "other",
+]
+
+NAVIGATION_COMMANDS = {Command.GET, Command.GO_BACK, Command.GO_FORWARD, Command.REFRESH}
+FIND_COMMANDS = {Command.FIND_ELEMENT, Command.FIND_ELEMENTS, Command.FIND_CHILD_ELEMENT, Command.FIND_CHILD_ELEMENTS}
+
+# The profiler of this process while profiling is enabled
+ACTIVE = None
+
+_real_sleep = time.sleep
+
+
+class Profiler:
+    def __init__(self):
+        self._local = threading.local()
+        self.totals = None
+        self.started = None
+
+    def start_test(self):
+        self.totals = defaultdict(float)
+        self.started = time.perf_counter()
+
+    def finish_test(self):
+        """Breakdown of the test that just finished, including the unattributed remainder"""
+        if self.totals is None:
+            return {}
+        wall = time.perf_counter() - self.started
+        breakdown = {category: round(seconds, 4) for category, seconds in self.totals.items()}
+        breakdown["other"] = round(max(0.0, wall - sum(self.totals.values())), 4)
+        breakdown["total"] = round(wall, 4)
+        self.totals = None
+        return breakdown
+
+    def add(self, category, seconds):
+        if self.totals is not None:
+            self.totals[category] += seconds
+
+    @property
+    def busy(self):
+        return getattr(self._local, "busy", False)
+
+    @contextmanager
+    def claim(self):
+        """Mark the current thread as inside a timed phase; yields whether this frame is outermost"""
+        outermost = not self.busy
+        self._local.busy = True
+        try:
+            yield outermost
+        finally:
+            if outermost:
+                self._local.busy = False
+
+    @contextmanager
+    def phase(self, category):
+        with self.claim() as outermost:
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                if outermost:
+                    self.add(category, time.perf_counter() - start)
+
+
+@contextmanager
+def phase(category):
+    """Attribute the enclosed time to `category`; a no-op unless profiling is enabled"""
+    if ACTIVE is None:
+        yield
+        return
+    with ACTIVE.phase(category):
+        yield
+
+
+def _command_category(command, error):
+    if command in NAVIGATION_COMMANDS:
+        return "navigation"
+    if command == Command.GET_PAGE_SOURCE:
+        return "page_source"
+    if command in FIND_COMMANDS and isinstance(error, NoSuchElementException):
+        return "selector_miss"
+    return "webdriver_command"
+
+
+def install(profiler):
+    """Patch the WebDriver command layer, WebDriverWait and time.sleep to report into `profiler`"""
+    global ACTIVE
+    ACTIVE = profiler
+    execute = WebDriver.execute
+    until = WebDriverWait.until
+    until_not = WebDriverWait.until_not
+
+    def profiled_execute(self, driver_command, params=None):
+        with profiler.claim() as outermost:
+            if not outermost:
+                return execute(self, driver_command, params)
+            start = time.perf_counter()
+            error = None
+            try:
+                return execute(self, driver_command, params)
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                profiler.add(_command_category(driver_command, error), time.perf_counter() - start)
+
+    def profiled_until(self, method, message=""):
+        with profiler.phase("wait_polling"):
+            return until(self, method, message)
+
+    def profiled_until_not(self, method, message=""):
+        with profiler.phase("wait_polling"):
+            return until_not(self, method, message)
+
+    def profiled_sleep(seconds):
+        with profiler.phase("sleep"):
+            _real_sleep(seconds)
+
+    WebDriver.execute = profiled_execute
+    WebDriverWait.until = profiled_until
+    WebDriverWait.until_not = profiled_until_not
+    time.sleep = profiled_sleep
+
+    def uninstall():
+        global ACTIVE
+        WebDriver.execute = execute
+        WebDriverWait.until = until
+        WebDriverWait.until_not = until_not
+        time.sleep = _real_sleep
+        ACTIVE = None
+
+    return uninstall
+
+
+class ProfilerPlugin:
+    """Times each test on the process that runs it and ships the breakdown on the teardown report"""
+
+    def __init__(self):
+        self.profiler = Profiler()
+        self.uninstall = install(self.profiler)
+
+    def pytest_runtest_logstart(self):
+        self.profiler.start_test()
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_makereport(self, item, call):
+        if call.when == "teardown":
+            item.user_properties.append(("time_profile", self.profiler.finish_test()))
+
+    def pytest_unconfigure(self):
+        self.uninstall()
+
+
+class ProfileCollector:
+    """Gathers the breakdowns (from xdist workers too), writes the profile and prints the summary"""
+
+    def __init__(self, path, top):
+        self.path = path
+        self.top = top
+        self.tests = {}
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "teardown":
+            profile = dict(report.user_properties).get("time_profile")
+            if profile:
+                self.tests[report.nodeid] = profile
+
+    def totals(self):
+        totals = defaultdict(float)
+        for profile in self.tests.values():
+            for category, seconds in profile.items():
+                if category != "total":
+                    totals[category] += seconds
+        return dict(totals)
+
+    def pytest_sessionfinish(self):
+        if not self.tests:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump({"totals": self.totals(), "tests": self.tests}, f, indent=1)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.tests:
+            return
+        totals = self.totals()
+        wall = sum(p.get("total", 0.0) for p in self.tests.values())
+        terminalreporter.section("harness time profile")
+        terminalreporter.write_line(f"{len(self.tests)} tests, {wall:.2f}s profiled, written to {self.path}")
+        for category, seconds in sorted(totals.items(), key=lambda item: item[1], reverse=True)[:self.top]:
+            share = 100 * seconds / wall if wall else 0
+            terminalreporter.write_line(f"{seconds:8.2f}s {share:5.1f}%  {category}")
+
+        phases = [
+            (seconds, nodeid, category)
+            for nodeid, profile in self.tests.items()
+            for category, seconds in profile.items()
+            if category != "total"
+        ]
+        terminalreporter.write_line("slowest test phases:")
+        for seconds, nodeid, category in sorted(phases, reverse=True)[:self.top]:
+            terminalreporter.write_line(f"{seconds:8.2f}s  {category:<18} {nodeid}")
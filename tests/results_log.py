@@ -0,0 +1,160 @@
+"""Single-pass result recording and per-category report splitting.
+
+The suite runs once and every finished test is appended to a JSON lines
+file. The full report and the per-marker / per-module reports are all
+rendered from that one record, so no test has to run twice to appear in
+a category report. Marker reports are named marker_<name>_report.html and
+module reports <module>_report.html, except for the legacy names below, so
+a marker never overwrites a module's report. Run as a script to re-render
+reports from a saved log:
+
+    python results_log.py reports/results.jsonl reports/
+"""
+import html
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+# Report file names kept from the old one-pytest-run-per-category scripts
+MODULE_REPORTS = {
+    "test_authentication.py": "auth_report.html",
+    "test_customer_management.py": "customer_report.html",
+    "test_loan_management.py": "loan_report.html",
+    "test_collection_agent.py": "collection_report.html",
+    "test_admin_dashboard.py": "admin_report.html",
+}
+MARKER_REPORTS = {
+    "smoke": "smoke_report.html",
+}
+
+OUTCOME_ORDER = ["failed", "error", "skipped", "passed"]
+
+
+def ini_markers(config):
+    """Names of the markers declared in pytest.ini"""
+    names = []
+    for line in config.inicfg.get("markers", "").splitlines():
+        name = line.split(":")[0].split("(")[0].strip()
+        if name:
+            names.append(name)
+    return names
+
+
+class ResultsLog:
+    """Plugin that writes one JSON line per finished test and optionally splits reports at the end"""
+
+    def __init__(self, path, markers, report_dir=None):
+        self.path = path
+        self.markers = markers
+        self.report_dir = report_dir
+        self.pending = {}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, "w")
+
+    def pytest_runtest_logreport(self, report):
+        record = self.pending.setdefault(report.nodeid, {
+            "nodeid": report.nodeid,
+            "module": report.nodeid.split("::")[0],
+            "markers": [m for m in self.markers if m in report.keywords],
+            "outcome": "passed",
+            "duration": 0.0,
+            "phases": {},
+            "longrepr": "",
+        })
+        record["phases"][report.when] = round(report.duration, 4)
+        record["duration"] = round(record["duration"] + report.duration, 4)
+        if report.failed:
+            record["outcome"] = "failed" if report.when == "call" else "error"
+            record["longrepr"] += str(report.longrepr)
+        elif report.skipped and record["outcome"] == "passed":
+            record["outcome"] = "skipped"
+            record["longrepr"] = report.longrepr[2] if isinstance(report.longrepr, tuple) else str(report.longrepr)
+
+        if report.when == "teardown":
+            artifacts = dict(report.user_properties).get("artifacts")
+            if artifacts:
+                record["artifacts"] = artifacts
+            self.file.write(json.dumps(self.pending.pop(report.nodeid)) + "\n")
+            self.file.flush()
+
+    def pytest_sessionfinish(self):
+        self.file.close()
+        if self.report_dir:
+            split_reports(load_results(self.path), self.report_dir)
+
+
+def load_results(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def split_reports(records, directory):
+    """Write the full report plus one report per marker and per module; returns the file names"""
+    os.makedirs(directory, exist_ok=True)
+    reports = {"full_report.html": ("All tests", records)}
+
+    def add(name, title, subset):
+        if name in reports:
+            raise ValueError(f"{title} and {reports[name][0]} would both be written to {name}")
+        reports[name] = (title, subset)
+
+    for marker in sorted({m for r in records for m in r["markers"]}):
+        add(MARKER_REPORTS.get(marker, f"marker_{marker}_report.html"), f"Marker: {marker}",
+            [r for r in records if marker in r["markers"]])
+
+    for module in sorted({r["module"] for r in records}):
+        name = MODULE_REPORTS.get(os.path.basename(module))
+        if name is None:
+            name = f"{os.path.splitext(os.path.basename(module))[0]}_report.html"
+        add(name, f"Module: {module}", [r for r in records if r["module"] == module])
+
+    for name, (title, subset) in reports.items():
+        with open(os.path.join(directory, name), "w") as f:
+            f.write(render_html(title, subset, directory))
+    return sorted(reports)
+
+
+def render_html(title, records, directory="."):
+    counts = Counter(r["outcome"] for r in records)
+    total = sum(r["duration"] for r in records)
+    summary = ", ".join(f"{counts[o]} {o}" for o in OUTCOME_ORDER if counts[o])
+    rows = []
+    for r in sorted(records, key=lambda r: (OUTCOME_ORDER.index(r["outcome"]), r["nodeid"])):
+        detail = f"<pre>{html.escape(r['longrepr'])}</pre>" if r["longrepr"] else ""
+        if r.get("artifacts"):
+            # Linked, not embedded, so the reports stay small however many tests fail
+            link = os.path.relpath(r["artifacts"], directory).replace(os.sep, "/")
+            detail += f"<a href='{html.escape(link)}/'>artifacts</a>"
+        rows.append(
+            f"<tr class='{r['outcome']}'><td>{html.escape(r['nodeid'])}</td><td>{r['outcome']}</td>"
+            f"<td>{r['duration']:.2f}s</td><td>{detail}</td></tr>"
+        )
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{html.escape(title)}</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; width: 100%; }}
+td, th {{ border: 1px solid #ddd; padding: 4px 8px; text-align: left; vertical-align: top; }}
+tr.passed td:nth-child(2) {{ color: #2e7d32; }}
+tr.failed td:nth-child(2), tr.error td:nth-child(2) {{ color: #c62828; }}
+tr.skipped td:nth-child(2) {{ color: #f9a825; }}
+pre {{ white-space: pre-wrap; margin: 0; font-size: 12px; }}
+</style></head>
+<body>
+<h1>{html.escape(title)}</h1>
+<p>{len(records)} tests: {summary or "none"} in {total:.2f}s &mdash; generated {time.strftime("%Y-%m-%d %H:%M:%S")}</p>
+<table><tr><th>Test</th><th>Outcome</th><th>Duration</th><th>Details</th></tr>
+{"".join(rows)}
+</table></body></html>
+"""
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python results_log.py RESULTS.jsonl REPORT_DIR")
+    for name in split_reports(load_results(sys.argv[1]), sys.argv[2]):
+        print(os.path.join(sys.argv[2], name))
@@ -0,0 +1,274 @@
+"""Per-route frontend performance metrics with a regression gate.
+
+A probe installed on every document (see waits.install_probes) starts a
+record for the initial page load and for every client-side route change
+(history.pushState/replaceState/popstate). Each record collects:
+
+- Navigation Timing for full page loads (TTFB, DOMContentLoaded, load)
+- LCP, CLS and long tasks from PerformanceObserver
+- time until the first table row is rendered
+- time until the harness first saw the route settle
+
+Records survive full page loads through sessionStorage. BaseTest collects
+them after every readiness wait and at teardown, adds CPU time per route
+from CDP Performance.getMetrics, and ships them on the teardown report.
+RouteMetricsReport aggregates the records per route on the controller,
+writes them to JSON and fails the run when a route's median regresses past
+the threshold against the stored baseline. The baseline is
+route_baseline.json in the tests directory unless --route-baseline says
+otherwise. Without one, the summary says the gate was skipped.
+"""
+import json
+import os
+import statistics
+from collections import defaultdict
+
+import pytest
+
+from selector_cache import route_key
+
+METRICS_PROBE = """
+(() => {
+  if (window.__loanfrontPerf) return;
+  const KEY = '__loanfront_routes';
+  const documentId = Math.random().toString(36).slice(2);
+  let sequence = 0;
+  const perf = window.__loanfrontPerf = {done: [], current: null};
+  try {
+    perf.done = JSON.parse(sessionStorage.getItem(KEY) || '[]');
+    sessionStorage.removeItem(KEY);
+  } catch (e) {}
+
+  function startRoute(kind) {
+    if (perf.current) perf.done.push(finish(perf.current));
+    perf.current = {
+      id: documentId + ':' + sequence++, url: location.href, kind: kind,
+      start: kind === 'load' ? 0 : performance.now(),
+      lcp: null, cls: 0, longTasks: 0, longTaskTime: 0, firstTableRow: null, settled: null,
+    };
+  }
+  function finish(record) {
+    const result = Object.assign({}, record);
+    const navigation = performance.getEntriesByType('navigation')[0];
+    if (record.kind === 'load' && record.id.startsWith(documentId) && navigation) {
+      result.ttfb = navigation.responseStart;
+      result.domContentLoaded = navigation.domContentLoadedEventEnd || null;
+      result.load = navigation.loadEventEnd || null;
+    }
+    return result;
+  }
+  startRoute('load');
+  const loadRecord = perf.current;
+
+  for (const method of ['pushState', 'replaceState']) {
+    const original = history[method];
+    history[method] = function (...args) {
+      const before = location.href;
+      const result = original.apply(this, args);
+      if (location.href !== before) startRoute('route');
+      return result;
+    };
+  }
+  window.addEventListener('popstate', () => startRoute('route'));
+
+  function observe(type, callback) {
+    try {
+      new PerformanceObserver(list => list.getEntries().forEach(callback)).observe({type: type, buffered: true});
+    } catch (e) {}
+  }
+  observe('largest-contentful-paint', entry => { loadRecord.lcp = entry.startTime; });
+  observe('layout-shift', entry => { if (!entry.hadRecentInput) perf.current.cls += entry.value; });
+  observe('longtask', entry => { perf.current.longTasks++; perf.current.longTaskTime += entry.duration; });
+
+  new MutationObserver(() => {
+    const record = perf.current;
+    if (record.firstTableRow === null && document.querySelector('tbody tr, table tr + tr')) {
+      record.firstTableRow = performance.now() - record.start;
+    }
+  }).observe(document, {subtree: true, childList: true});
+
+  perf.markSettled = () => {
+    if (perf.current.settled === null) perf.current.settled = performance.now() - perf.current.start;
+  };
+  perf.drain = () => {
+    const done = perf.done;
+    perf.done = [];
+    return {done: done, current: finish(perf.current)};
+  };
+  window.addEventListener('pagehide', () => {
+    try {
+      sessionStorage.setItem(KEY, JSON.stringify(perf.done.concat([finish(perf.current)])));
+    } catch (e) {}
+  });
+})();
+"""
+
+COLLECT_SCRIPT = """
+const perf = window.__loanfrontPerf;
+if (!perf) return null;
+if (arguments[0]) perf.markSettled();
+return perf.drain();
+"""
+
+# Cumulative renderer CPU counters from CDP Performance.getMetrics (seconds)
+CPU_METRICS = {
+    "ScriptDuration": "scriptTime",
+    "LayoutDuration": "layoutTime",
+    "RecalcStyleDuration": "styleTime",
+    "TaskDuration": "taskTime",
+}
+
+METRICS = [
+    "ttfb", "domContentLoaded", "load", "lcp", "cls", "longTasks", "longTaskTime", "firstTableRow", "settled",
+    "scriptTime", "layoutTime", "styleTime", "taskTime",
+]
+
+# A regression must also exceed this absolute amount, so tiny values don't trip the ratio
+GATE_SLACK = {"cls": 0.02, "longTasks": 1}
+DEFAULT_SLACK_MS = 50
+
+ROUTE_BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "route_baseline.json")
+
+
+def cpu_counters(driver):
+    """Renderer CPU counters in ms, or None if CDP is unavailable"""
+    try:
+        if not getattr(driver, "_performance_domain", False):
+            driver.execute_cdp_cmd("Performance.enable", {})
+            driver._performance_domain = True
+        metrics = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+    except Exception:
+        return None
+    return {CPU_METRICS[m["name"]]: m["value"] * 1000 for m in metrics if m["name"] in CPU_METRICS}
+
+
+class RouteMetricsBuffer:
+    """The route records of one test, updated in place as they are collected repeatedly"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.records = {}
+        self.counters = cpu_counters(driver)
+
+    def collect(self, settled=False):
+        data = self.driver.execute_script(COLLECT_SCRIPT, settled)
+        counters = cpu_counters(self.driver)
+        if data:
+            for record in data["done"] + [data["current"]]:
+                record["cpu"] = self.records.get(record["id"], {}).get("cpu", {})
+                self.records[record["id"]] = record
+            # CPU used since the last collection is charged to the route that is showing now
+            if self.counters and counters:
+                cpu = self.records[data["current"]["id"]]["cpu"]
+                for name, value in counters.items():
+                    cpu[name] = cpu.get(name, 0.0) + value - self.counters.get(name, 0.0)
+        self.counters = counters
+
+    def results(self, profile=None):
+        """One {route, url, kind, metrics} entry per route visited; under an emulation profile
+        the route is reported as `<route> @<profile>`"""
+        results = []
+        for record in self.records.values():
+            metrics = {name: record.get(name) for name in METRICS if record.get(name) is not None}
+            metrics.update({name: round(value, 2) for name, value in record["cpu"].items()})
+            route = route_key(record["url"]) + (f" @{profile}" if profile else "")
+            results.append({"route": route, "url": record["url"], "kind": record["kind"],
+                            "metrics": metrics})
+        return results
+
+
+def summarize(samples):
+    """Median of every metric per route"""
+    summary = {}
+    for route, entries in sorted(samples.items()):
+        values = defaultdict(list)
+        for entry in entries:
+            for name, value in entry["metrics"].items():
+                values[name].append(value)
+        summary[route] = {
+            "samples": len(entries),
+            "median": {name: round(statistics.median(v), 3) for name, v in sorted(values.items())},
+        }
+    return summary
+
+
+def regressions(summary, baseline, threshold):
+    """(route, metric, baseline, current) for every median worse than baseline * (1 + threshold) plus slack"""
+    found = []
+    for route, entry in summary.items():
+        expected = baseline.get(route, {}).get("median", {})
+        for name, value in entry["median"].items():
+            if name not in expected:
+                continue
+            slack = GATE_SLACK.get(name, DEFAULT_SLACK_MS)
+            if value > expected[name] * (1 + threshold) and value - expected[name] > slack:
+                found.append((route, name, expected[name], value))
+    return found
+
+
+class RouteMetricsReport:
+    """Controller plugin that aggregates route metrics, writes them and applies the baseline gate"""
+
+    def __init__(self, path, baseline_path, threshold, update_baseline=False):
+        self.path = path
+        self.baseline_path = baseline_path
+        self.threshold = threshold
+        self.update_baseline = update_baseline
+        self.samples = defaultdict(list)
+        self.summary = {}
+        self.regressions = []
+        # Why the gate did not run, if it didn't
+        self.gate_skipped = None
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "teardown":
+            return
+        for entry in dict(report.user_properties).get("route_metrics", []):
+            self.samples[entry["route"]].append(dict(entry, test=report.nodeid))
+
+    def pytest_sessionfinish(self, session):
+        if not self.samples:
+            return
+        self.summary = summarize(self.samples)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump({"routes": self.summary, "samples": self.samples}, f, indent=1)
+
+        if self.update_baseline:
+            with open(self.baseline_path, "w") as f:
+                json.dump(self.summary, f, indent=1, sort_keys=True)
+            return
+        try:
+            with open(self.baseline_path) as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            self.gate_skipped = f"no baseline at {self.baseline_path}, gate skipped"
+            return
+        except (OSError, ValueError) as e:
+            self.gate_skipped = f"baseline at {self.baseline_path} is unreadable ({e}), gate skipped"
+            return
+        self.regressions = regressions(self.summary, baseline, self.threshold)
+        if self.regressions and session.exitstatus == pytest.ExitCode.OK:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.summary:
+            return
+        terminalreporter.section("route metrics")
+        terminalreporter.write_line(f"{'route':<40} {'n':>3} {'settled':>9} {'lcp':>8} {'table':>8} {'cls':>6} {'long':>5}")
+        for route, entry in self.summary.items():
+            m = entry["median"]
+            cells = [f"{m[name]:.0f}" if name in m else "-" for name in ("settled", "lcp", "firstTableRow")]
+            terminalreporter.write_line(
+                f"{route:<40} {entry['samples']:>3} {cells[0]:>9} {cells[1]:>8} {cells[2]:>8} "
+                f"{m.get('cls', 0):>6.3f} {m.get('longTasks', 0):>5.0f}"
+            )
+        if self.update_baseline:
+            terminalreporter.write_line(f"baseline updated: {self.baseline_path}")
+        if self.gate_skipped:
+            terminalreporter.write_line(self.gate_skipped, yellow=True)
+        for route, name, expected, value in self.regressions:
+            terminalreporter.write_line(
+                f"REGRESSION {route} {name}: {expected} -> {value} (threshold {self.threshold:.0%})", red=True)
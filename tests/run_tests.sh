@@ -15,28 +15,9 @@ pip install -r requirements.txt
 echo "Setting up ChromeDriver..."
 python -c "from webdriver_manager.chrome import ChromeDriverManager; ChromeDriverManager().install()"
 
-# Run all tests
+# Run every test once; the full report and the smoke, auth, customer, loan,
+# collection and admin reports are all split out of reports/results.jsonl
 echo "Running all tests..."
-pytest --html=reports/full_report.html --self-contained-html
+pytest --results-log=reports/results.jsonl --split-reports=reports
 
-# Run smoke tests only
-echo "Running smoke tests..."
-pytest -m smoke --html=reports/smoke_report.html --self-contained-html
-
-# Run specific test categories
-echo "Running authentication tests..."
-pytest test_authentication.py --html=reports/auth_report.html --self-contained-html
-
-echo "Running customer management tests..."
-pytest test_customer_management.py --html=reports/customer_report.html --self-contained-html
-
-echo "Running loan management tests..."
-pytest test_loan_management.py --html=reports/loan_report.html --self-contained-html
-
-echo "Running collection agent tests..."
-pytest test_collection_agent.py --html=reports/collection_report.html --self-contained-html
-
-echo "Running admin dashboard tests..."
-pytest test_admin_dashboard.py --html=reports/admin_report.html --self-contained-html
-
-echo "Test execution completed. Check reports/ directory for results."
\ No newline at end of file
+echo "Test execution completed. Check reports/ directory for results."
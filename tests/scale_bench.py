@@ -0,0 +1,202 @@
+"""Rendering benchmarks for the big list screens at scale_data sizes.
+
+Three measurements, each taken inside the page so WebDriver round-trips
+do not count towards them:
+
+- initial render: time from navigation start until the first table row
+  appears and until the page settles, with the rendered row count and
+  DOM size at that point (from route_metrics.METRICS_PROBE)
+- search keystroke latency: the query is typed one character at a time
+  through the native value setter and an input event, which is what a
+  keypress does to a React controlled input. Each keystroke's latency runs
+  until the next frame after the resulting render has painted.
+- scroll jank: the largest scrollable container is scrolled to the bottom
+  in fixed steps, one per animation frame. We report the frame-time
+  distribution, the share of frames over JANK_FRAME_MS and the long tasks
+  seen meanwhile.
+
+The tests in test_scale_benchmark.py record one result per screen and size.
+BenchmarkReport collects them on the controller, writes them to JSON and
+prints how each metric grows with the dataset size.
+"""
+import json
+import os
+from collections import defaultdict
+
+# A frame this long is one visibly dropped frame at 60 Hz (1.5x the 16.7 ms budget)
+JANK_FRAME_MS = 25
+
+RENDER_SCRIPT = """
+const perf = window.__loanfrontPerf;
+const current = perf ? perf.current : null;
+return {
+  firstTableRow: current ? current.firstTableRow : null,
+  settled: current ? current.settled : null,
+  longTasks: current ? current.longTasks : null,
+  longTaskTime: current ? current.longTaskTime : null,
+  rows: document.querySelectorAll('tbody tr, .customer-row, .loan-item').length,
+  domNodes: document.getElementsByTagName('*').length,
+};
+"""
+
+KEYSTROKE_SCRIPT = """
+const [selector, text, done] = [arguments[0], arguments[1], arguments[arguments.length - 1]];
+const input = document.querySelector(selector);
+if (!input) return done({error: 'no element matches ' + selector});
+const setValue = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+const nextPaint = () => new Promise(resolve => requestAnimationFrame(() => setTimeout(resolve, 0)));
+
+(async () => {
+  input.focus();
+  setValue.call(input, '');
+  input.dispatchEvent(new Event('input', {bubbles: true}));
+  await nextPaint();
+  const latencies = [];
+  for (let i = 1; i <= text.length; i++) {
+    const start = performance.now();
+    setValue.call(input, text.slice(0, i));
+    input.dispatchEvent(new InputEvent('input', {bubbles: true, data: text[i - 1], inputType: 'insertText'}));
+    await nextPaint();
+    latencies.push(performance.now() - start);
+  }
+  done({latencies: latencies, rows: document.querySelectorAll('tbody tr, .customer-row, .loan-item').length});
+})().catch(e => done({error: String(e)}));
+"""
+
+SCROLL_SCRIPT = """
+const [maxFrames, jankMs, done] = [arguments[0], arguments[1], arguments[arguments.length - 1]];
+let target = document.scrollingElement;
+let room = target.scrollHeight - target.clientHeight;
+for (const element of document.querySelectorAll('*')) {
+  const overflow = getComputedStyle(element).overflowY;
+  const extra = element.scrollHeight - element.clientHeight;
+  if ((overflow === 'auto' || overflow === 'scroll') && extra > room) {
+    target = element;
+    room = extra;
+  }
+}
+if (room <= 0) return done({frames: 0, scrollable: 0});
+
+let longTasks = 0, longTaskTime = 0;
+let observer = null;
+try {
+  observer = new PerformanceObserver(list => list.getEntries().forEach(entry => {
+    longTasks++;
+    longTaskTime += entry.duration;
+  }));
+  observer.observe({type: 'longtask'});
+} catch (e) {}
+
+target.scrollTop = 0;
+const step = Math.max(room / maxFrames, target.clientHeight / 4);
+const deltas = [];
+let last = null;
+function frame(now) {
+  if (last !== null) deltas.push(now - last);
+  last = now;
+  if (target.scrollTop + 1 >= room || deltas.length >= maxFrames) {
+    if (observer) observer.disconnect();
+    deltas.sort((a, b) => a - b);
+    const at = q => deltas.length ? deltas[Math.min(deltas.length - 1, Math.floor(q * deltas.length))] : 0;
+    return done({
+      frames: deltas.length,
+      scrollable: room,
+      p50: at(0.5),
+      p95: at(0.95),
+      max: deltas.length ? deltas[deltas.length - 1] : 0,
+      jankPercent: deltas.length ? 100 * deltas.filter(d => d > jankMs).length / deltas.length : 0,
+      longTasks: longTasks,
+      longTaskTime: longTaskTime,
+    });
+  }
+  target.scrollTop += step;
+  requestAnimationFrame(frame);
+}
+requestAnimationFrame(frame);
+"""
+
+
+def _rounded(data):
+    return {name: round(value, 2) if isinstance(value, float) else value for name, value in data.items()}
+
+
+class ScaleBenchmark:
+    """Runs the in-page measurements on one browser; scripts may take up to `timeout` seconds"""
+
+    def __init__(self, driver, timeout=120):
+        self.driver = driver
+        self.timeout = timeout
+
+    def _run_async(self, script, *args):
+        previous = self.driver.timeouts.script
+        self.driver.set_script_timeout(self.timeout)
+        try:
+            return self.driver.execute_async_script(script, *args)
+        finally:
+            self.driver.set_script_timeout(previous)
+
+    def render(self):
+        """Initial render numbers of the page that is showing; call once it has settled"""
+        return _rounded(self.driver.execute_script(RENDER_SCRIPT))
+
+    def keystrokes(self, selector, text):
+        """Per-keystroke latency of typing `text` into the input matching `selector`"""
+        result = self._run_async(KEYSTROKE_SCRIPT, selector, text)
+        if "error" in result:
+            raise AssertionError(f"search benchmark: {result['error']}")
+        latencies = sorted(result["latencies"])
+        return _rounded({
+            "keystrokes": len(latencies),
+            "median": latencies[len(latencies) // 2],
+            "max": latencies[-1],
+            "total": sum(latencies),
+            "rows": result["rows"],
+        })
+
+    def scroll(self, max_frames=300):
+        """Frame times while scrolling the page's main list to the bottom"""
+        return _rounded(self._run_async(SCROLL_SCRIPT, max_frames, JANK_FRAME_MS))
+
+
+# (section, metric) pairs printed in the scaling table
+CURVE = [
+    ("render", "firstTableRow"), ("render", "settled"), ("render", "rows"),
+    ("search", "median"), ("search", "max"), ("scroll", "p95"), ("scroll", "jankPercent"),
+]
+
+
+class BenchmarkReport:
+    """Controller plugin that collects benchmark results per screen and size and writes them out"""
+
+    def __init__(self, path):
+        self.path = path
+        self.results = defaultdict(dict)
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "teardown":
+            result = dict(report.user_properties).get("benchmark")
+            if result:
+                self.results[result["screen"]][result["size"]] = result["metrics"]
+
+    def pytest_sessionfinish(self):
+        if not self.results:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump(self.results, f, indent=1, sort_keys=True)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.results:
+            return
+        terminalreporter.section("scale benchmarks")
+        for screen, by_size in sorted(self.results.items()):
+            sizes = sorted(by_size, key=int)
+            terminalreporter.write_line(f"{screen:<28}" + "".join(f"{int(size):>10,}" for size in sizes))
+            for section, metric in CURVE:
+                values = [by_size[size].get(section, {}).get(metric) for size in sizes]
+                if all(value is None for value in values):
+                    continue
+                cells = "".join(f"{value:>10.1f}" if value is not None else f"{'-':>10}" for value in values)
+                terminalreporter.write_line(f"  {section + '.' + metric:<26}{cells}")
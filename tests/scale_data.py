@@ -0,0 +1,104 @@
+"""Synthetic large datasets for scaling benchmarks.
+
+generate(size) returns `size` customers, `size` loans and `size`
+installment schedules; the scale_* scenarios put them on top of the empty
+scenario so every account still works. The rows are drawn from a
+fixed-seed random generator, so a size always produces the same data. The
+distributions roughly follow a microfinance book:
+
+- most customers hold one loan and a few hold several
+- principals are log-normal around 50k
+- tenures are mostly 12 months
+- a little over half the loans are active and a quarter are closed
+- the older a loan, the more of its installments are paid
+- installments are split unevenly between the collection agents
+
+Run as a script to print the table sizes and the JSON payload size of each:
+
+    python scale_data.py 10000
+"""
+import json
+import math
+import random
+import sys
+
+from seed_data import make_customer, make_loan, schedules_for, timestamp
+
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+
+FIRST_NAMES = [
+    "Arun", "Priya", "Ravi", "Anita", "Suresh", "Lakshmi", "Karthik", "Divya", "Vijay", "Meena", "Rahul", "Kavya",
+    "Sanjay", "Deepa", "Manoj", "Revathi", "Ganesh", "Sangeetha", "Prakash", "Nisha", "Mohan", "Shalini", "John",
+    "Fatima", "Imran", "Mary", "Joseph", "Ayesha", "Harish", "Pooja",
+]
+LAST_NAMES = [
+    "Kumar", "Sharma", "Raj", "Nair", "Iyer", "Reddy", "Pillai", "Das", "Singh", "Menon", "Patel", "Rao",
+    "Krishnan", "Joseph", "Khan", "Thomas", "Subramanian", "Gupta", "Mathew", "Doe",
+]
+# Branch cities and how much of the book each holds
+CITIES = [("Chennai", 30), ("Madurai", 15), ("Coimbatore", 15), ("Bengaluru", 10), ("Salem", 8), ("Trichy", 8),
+          ("Kochi", 6), ("Pune", 4), ("Tirunelveli", 4)]
+LOAN_STATUSES = [("active", 55), ("closed", 25), ("pending", 12), ("rejected", 8)]
+TENURES = [(6, 15), (12, 45), (18, 15), (24, 20), (36, 5)]
+# loan type -> typical annual interest range
+INTEREST = {1: (12, 18), 2: (10, 14), 3: (8, 11)}
+# (agent user id, share of installments); None leaves installments unassigned
+AGENT_SHARES = [(2, 60), (3, 30), (None, 10)]
+
+
+def _weighted(rng, pairs):
+    values, weights = zip(*pairs)
+    return rng.choices(values, weights)[0]
+
+
+def generate(size, seed=0):
+    rng = random.Random(f"{seed}:{size}")
+    customers, loans, schedules = [], [], []
+
+    # Customers joined over the last three years
+    for n in range(1, size + 1):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        customer = make_customer(n, name, f"{name.split()[0]}{n}", _weighted(rng, CITIES))
+        customer["created_at"] = timestamp(-rng.randint(30, 3 * 365))
+        customers.append(customer)
+
+    for n in range(1, size + 1):
+        # Roughly 70% of loans go to distinct customers, the rest to repeat borrowers
+        customer = customers[n - 1] if rng.random() < 0.7 else rng.choice(customers)
+        loan_type = rng.choice(list(INTEREST))
+        principal = min(2_000_000, max(5_000, round(rng.lognormvariate(math.log(50_000), 0.8) / 500) * 500))
+        low, high = INTEREST[loan_type]
+        loan = make_loan(n, customer, loan_type, principal, round(rng.uniform(low, high), 2),
+                         _weighted(rng, TENURES), _weighted(rng, LOAN_STATUSES))
+        loan["created_at"] = timestamp(-rng.randint(0, 3 * 365))
+        loans.append(loan)
+
+    for loan in loans:
+        if len(schedules) >= size:
+            break
+        if loan["status"] not in ("active", "closed"):
+            continue
+        count = loan["total_due_count"]
+        if loan["status"] == "closed":
+            paid, start = count, -30 * count - rng.randint(0, 365)
+        else:
+            elapsed = rng.randint(0, count - 1)
+            # Most agents are current; some loans fall an installment or two behind
+            paid = max(0, elapsed - _weighted(rng, [(0, 70), (1, 20), (2, 10)]))
+            start = -30 * elapsed
+        rows = schedules_for(loan, len(schedules) + 1, assigned_to=_weighted(rng, AGENT_SHARES), paid=paid,
+                             start_offset=start)
+        for row in rows[paid:paid + 1]:
+            if row["status"] == "pending" and rng.random() < 0.05:
+                row["status"] = "partial"
+                row["paid_amount"] = f"{float(row['total_due']) / 2:.2f}"
+        schedules.extend(rows[:size - len(schedules)])
+    return {"customers": customers, "loans": loans, "loan_schedules": schedules}
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else SIZES["1k"]
+    tables = generate(size)
+    for table in ("customers", "loans", "loan_schedules"):
+        payload = len(json.dumps(tables[table]))
+        print(f"{table:<16} {len(tables[table]):>8} rows  {payload / 1024 / 1024:7.2f} MiB as JSON")
@@ -0,0 +1,117 @@
+import copy
+
+from scale_data import SIZES, generate
+from seed_data import build_seed, make_customer, make_loan, make_user, schedules_for
+
+SCENARIOS = {}
+_built = {}
+
+
+def scenario(name):
+    """Register a named dataset builder; builders return a full table dict"""
+    def register(func):
+        SCENARIOS[name] = func
+        return func
+    return register
+
+
+def load_scenario(name):
+    """A fresh copy of a scenario's tables; each scenario is only built once"""
+    if name not in SCENARIOS:
+        raise KeyError(f"Unknown scenario '{name}', expected one of {sorted(SCENARIOS)}")
+    if name not in _built:
+        _built[name] = SCENARIOS[name]()
+    return copy.deepcopy(_built[name])
+
+
+@scenario("default")
+def default():
+    return build_seed()
+
+
+@scenario("empty")
+def empty():
+    """Accounts, roles and loan types only - no customers, loans or collections"""
+    data = build_seed()
+    for table in ("customers", "loans", "loan_schedules", "documents", "disbursements",
+                  "audit_logs", "notifications", "daily_collections", "attendance"):
+        data[table] = []
+    return data
+
+
+@scenario("one_customer")
+def one_customer():
+    data = empty()
+    data["customers"] = build_seed()["customers"][:1]
+    return data
+
+
+@scenario("one_pending_loan")
+def one_pending_loan():
+    seed = build_seed()
+    data = empty()
+    pending = next(loan for loan in seed["loans"] if loan["loan_status"] == "pending")
+    data["customers"] = [c for c in seed["customers"] if c["customer_id"] == pending["customer"]]
+    data["loans"] = [pending]
+    return data
+
+
+@scenario("agent_with_20_assigned_schedules")
+def agent_with_20_assigned_schedules():
+    """agent@example.com owns 20 installments across 4 active loans, the first of each collected"""
+    seed = build_seed()
+    data = empty()
+    agent = next(u for u in data["users"] if u["email"] == "agent@example.com")
+    data["customers"] = seed["customers"][:4]
+    loans = seed["loans"][:4]
+    for loan in loans:
+        loan["loan_status"] = loan["status"] = "active"
+        loan["total_due_count"] = 5
+    data["loans"] = loans
+    data["loan_schedules"] = [
+        schedule
+        for n, loan in enumerate(loans)
+        for schedule in schedules_for(loan, 1 + 5 * n, assigned_to=agent["id"], paid=1)
+    ]
+    data["daily_collections"] = seed["daily_collections"]
+    return data
+
+
+# Field agents in the end-of-day collection burst used by load_collect.py
+BURST_AGENTS = 50
+BURST_LOANS_PER_AGENT = 2
+
+
+def burst_agent_email(n):
+    return f"field{n}@example.com"
+
+
+@scenario("collection_burst")
+def collection_burst():
+    """BURST_AGENTS field agents, each assigned the pending installments of BURST_LOANS_PER_AGENT active loans"""
+    data = empty()
+    cities = ["Chennai", "Madurai", "Coimbatore", "Salem", "Trichy"]
+    next_schedule = 1
+    for n in range(1, BURST_AGENTS + 1):
+        agent = make_user(100 + n, f"field{n}", burst_agent_email(n), "collection_agent", "Field", f"Agent {n}")
+        data["users"].append(agent)
+        for k in range(BURST_LOANS_PER_AGENT):
+            number = (n - 1) * BURST_LOANS_PER_AGENT + k + 1
+            customer = make_customer(number, f"Burst Customer {number}", f"Burst{number}", cities[number % len(cities)])
+            loan = make_loan(number, customer, 1 + number % 3, 10000 + 500 * (number % 20), 12, 6, "active")
+            data["customers"].append(customer)
+            data["loans"].append(loan)
+            data["loan_schedules"].extend(schedules_for(loan, next_schedule, assigned_to=agent["id"]))
+            next_schedule += loan["total_due_count"]
+    return data
+
+
+def _scaled(size):
+    data = empty()
+    data.update(generate(size))
+    return data
+
+
+# Large books for the rendering benchmarks in test_scale_benchmark.py
+for _label, _size in SIZES.items():
+    scenario(f"scale_{_label}")(lambda size=_size: _scaled(size))
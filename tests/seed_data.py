@@ -0,0 +1,188 @@
+from datetime import date, datetime, time, timedelta
+
+PASSWORD = "password123"
+
+# Everything is derived from this date so the seed is identical on every run
+SEED_DATE = date(2025, 1, 1)
+
+
+def _day(offset):
+    return (SEED_DATE + timedelta(days=offset)).isoformat()
+
+
+def timestamp(offset, hour=10):
+    """ISO timestamp `offset` days from SEED_DATE, in UTC"""
+    moment = datetime.combine(SEED_DATE, time(hour)) + timedelta(days=offset)
+    return moment.isoformat() + "Z"
+
+
+def make_user(id, username, email, role, first_name, last_name):
+    """A users row that can log in with PASSWORD"""
+    return {
+        "id": id,
+        "username": username,
+        "email": email,
+        "password": PASSWORD,
+        "role": role,
+        "first_name": first_name,
+        "last_name": last_name,
+        "phone": f"98400{id:05d}",
+        "is_active": True,
+        "date_joined": timestamp(-180 + id),
+        "last_login": timestamp(-1),
+    }
+
+
+def make_customer(id, full_name, nickname, city):
+    """A customers row with contact details derived from the id and nickname"""
+    return {
+        "customer_id": id,
+        "customer_code": f"CUST{id:04d}",
+        "full_name": full_name,
+        "nickname": nickname,
+        "email": f"{nickname.lower()}@example.com",
+        "phone": f"99000{id:05d}",
+        "address": f"{id} Main Road, {city}",
+        "aadhar_number": f"{id:012d}",
+        "created_at": timestamp(-90 + id),
+    }
+
+
+def make_loan(id, customer, loan_type, principal, interest, count, status, created_by=1):
+    """A loans row for `customer` (a make_customer row)"""
+    return {
+        "loan_id": id,
+        "customer": customer["customer_id"],
+        "customer_name": customer["full_name"],
+        "loan_type": loan_type,
+        "principal_amount": f"{principal:.2f}",
+        "interest_percentage": f"{interest:.2f}",
+        "total_due_count": count,
+        "repayment_mode": "monthly",
+        "loan_status": status,
+        "status": status,
+        "created_by": created_by,
+        "created_at": timestamp(-60 + id),
+    }
+
+
+def schedules_for(loan, first_id, assigned_to=None, paid=0, start_offset=-30):
+    """Equal monthly installments for a loan, the first `paid` of them already collected"""
+    principal = float(loan["principal_amount"])
+    count = loan["total_due_count"]
+    principal_part = round(principal / count, 2)
+    interest_part = round(principal * float(loan["interest_percentage"]) / 100 / count, 2)
+    schedules = []
+    for n in range(count):
+        status = "paid" if n < paid else "pending"
+        schedules.append({
+            "id": first_id + n,
+            "loan": loan["loan_id"],
+            "customer_name": loan["customer_name"],
+            "installment_no": n + 1,
+            "due_date": _day(start_offset + 30 * n),
+            "principal_amount": f"{principal_part:.2f}",
+            "interest_amount": f"{interest_part:.2f}",
+            "total_due": f"{principal_part + interest_part:.2f}",
+            "paid_amount": f"{principal_part + interest_part:.2f}" if status == "paid" else "0.00",
+            "payment_method": "cash" if status == "paid" else None,
+            "status": status,
+            "assigned_to": assigned_to,
+        })
+    return schedules
+
+
+PERMISSION_CODES = [
+    ("view_loans", "View loans"),
+    ("approve_loans", "Approve loans"),
+    ("manage_customers", "Manage customers"),
+    ("collect_payments", "Collect payments"),
+    ("manage_disbursements", "Manage disbursements"),
+    ("view_reports", "View reports"),
+]
+
+
+def build_seed():
+    """The default deterministic dataset served by the mock backend"""
+    users = [
+        make_user(1, "admin", "admin@example.com", "master_admin", "Asha", "Admin"),
+        make_user(2, "agent", "agent@example.com", "collection_agent", "Arun", "Agent"),
+        make_user(3, "agent2", "agent2@example.com", "collection_agent", "Meena", "Raj"),
+        make_user(4, "staff", "staff@example.com", "staff", "Suresh", "Staff"),
+    ]
+    customers = [
+        make_customer(1, "John Doe", "John", "Chennai"),
+        make_customer(2, "Priya Sharma", "Priya", "Bengaluru"),
+        make_customer(3, "Ravi Kumar", "Ravi", "Madurai"),
+        make_customer(4, "Anita Desai", "Anita", "Pune"),
+        make_customer(5, "John Mathew", "Mathew", "Kochi"),
+    ]
+    loan_types = [
+        {"id": 1, "name": "Personal Loan"},
+        {"id": 2, "name": "Business Loan"},
+        {"id": 3, "name": "Gold Loan"},
+    ]
+    loans = [
+        make_loan(1, customers[0], 1, 50000, 12, 6, "active"),
+        make_loan(2, customers[1], 2, 120000, 10, 6, "active"),
+        make_loan(3, customers[2], 1, 30000, 12, 6, "pending"),
+        make_loan(4, customers[3], 3, 20000, 8, 6, "closed"),
+    ]
+    loan_schedules = (
+        schedules_for(loans[0], 1, assigned_to=2, paid=1)
+        + schedules_for(loans[1], 7, assigned_to=2)
+        + schedules_for(loans[3], 13, assigned_to=3, paid=6, start_offset=-200)
+    )
+    permissions = [
+        {"id": n + 1, "codename": code, "name": name}
+        for n, (code, name) in enumerate(PERMISSION_CODES)
+    ]
+    roles = [
+        {"id": 1, "name": "master_admin", "description": "Full access", "permissions": [p["id"] for p in permissions]},
+        {"id": 2, "name": "collection_agent", "description": "Field collections", "permissions": [1, 4]},
+        {"id": 3, "name": "staff", "description": "Branch staff", "permissions": [1, 3, 6]},
+    ]
+    disbursements = [
+        {"id": 1, "loan_id": 1, "amount": "50000.00", "method": "bank_transfer", "status": "disbursed",
+         "reference": "DISB0001", "created_at": timestamp(-40)},
+        {"id": 2, "loan_id": 2, "amount": "120000.00", "method": "bank_transfer", "status": "disbursed",
+         "reference": "DISB0002", "created_at": timestamp(-35)},
+    ]
+    audit_logs = [
+        {"id": 1, "user": "admin", "action": "Created customer John Doe", "module": "customers", "timestamp": timestamp(-89)},
+        {"id": 2, "user": "admin", "action": "Created loan #1", "module": "loans", "timestamp": timestamp(-59)},
+        {"id": 3, "user": "admin", "action": "Approved loan #1", "module": "loans", "timestamp": timestamp(-58)},
+        {"id": 4, "user": "admin", "action": "Disbursed loan #1", "module": "disbursements", "timestamp": timestamp(-40)},
+        {"id": 5, "user": "agent", "action": "Collected installment 1 of loan #1", "module": "collections", "timestamp": timestamp(-30)},
+    ]
+    notifications = [
+        {"id": 1, "notification_id": 1, "user_id": 2, "title": "New assignment", "message": "Loan #2 assigned to you",
+         "type": "info", "is_read": False, "created_at": timestamp(-2)},
+        {"id": 2, "notification_id": 2, "user_id": 2, "title": "Payment overdue", "message": "Installment 2 of loan #1 is overdue",
+         "type": "warning", "is_read": False, "created_at": timestamp(-1)},
+        {"id": 3, "notification_id": 3, "user_id": 1, "title": "Loan pending", "message": "Loan #3 awaits approval",
+         "type": "info", "is_read": True, "created_at": timestamp(-3)},
+    ]
+    daily_collections = [
+        {"id": 1, "agent_id": 2, "collection_date": _day(-30), "cash_total": "9000.00", "upi_total": "0.00",
+         "card_total": "0.00", "total_amount": "9000.00"},
+    ]
+    attendance = [
+        {"id": 1, "user": 2, "date": _day(-1), "status": "present", "check_in": "09:02", "check_out": "18:10"},
+        {"id": 2, "user": 3, "date": _day(-1), "status": "present", "check_in": "09:15", "check_out": "18:00"},
+    ]
+    return {
+        "users": users,
+        "customers": customers,
+        "loan_types": loan_types,
+        "loans": loans,
+        "loan_schedules": loan_schedules,
+        "documents": [],
+        "permissions": permissions,
+        "roles": roles,
+        "disbursements": disbursements,
+        "audit_logs": audit_logs,
+        "notifications": notifications,
+        "daily_collections": daily_collections,
+        "attendance": attendance,
+    }
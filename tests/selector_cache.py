@@ -0,0 +1,107 @@
+"""Resolve a group of fallback selectors in one browser round-trip.
+
+Several helpers try a list of candidate selectors until one matches. Doing
+that with find_element costs a WebDriver round-trip (and an exception) per
+miss, so instead the whole list is evaluated by one script. The candidate
+that matched is remembered per route and group, persisted between runs and
+tried first next time; when it stops matching the next winner replaces it.
+"""
+import json
+import os
+import re
+import threading
+from urllib.parse import urlsplit
+
+SELECTOR_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".selector_cache.json")
+
+# CSS selectors go to querySelector, anything starting with / or ( is XPath
+RESOLVE_SCRIPT = """
+const candidates = arguments[0];
+for (let i = 0; i < candidates.length; i++) {
+  const selector = candidates[i];
+  let element = null;
+  try {
+    if (selector.startsWith('/') || selector.startsWith('(')) {
+      element = document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    } else {
+      element = document.querySelector(selector);
+    }
+  } catch (e) {}
+  if (element) return [i, element];
+}
+return null;
+"""
+
+
+def route_key(url):
+    """Path of `url` with numeric segments generalised, so /admin/loans/7 and /admin/loans/8 share entries"""
+    path = urlsplit(url).path.rstrip("/") or "/"
+    return re.sub(r"/\d+(?=/|$)", "/:id", path)
+
+
+class SelectorCache:
+    def __init__(self, path=SELECTOR_CACHE_FILE):
+        self.path = path
+        self.winners = self._load()
+        self.changed = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def ordered(self, route, name, candidates):
+        """`candidates` with the remembered winner for this route moved to the front"""
+        winner = self.winners.get(route, {}).get(name)
+        if winner in candidates:
+            return [winner] + [c for c in candidates if c != winner]
+        return list(candidates)
+
+    def resolve(self, driver, name, candidates):
+        """The first element matched by `candidates` on the current page, or None"""
+        route = route_key(driver.current_url)
+        remembered = self.winners.get(route, {}).get(name)
+        ordered = self.ordered(route, name, candidates)
+        result = driver.execute_script(RESOLVE_SCRIPT, ordered)
+        winner = ordered[result[0]] if result else None
+
+        with self._lock:
+            if winner is not None and winner == remembered:
+                self.hits += 1
+            else:
+                self.misses += 1
+            if winner != remembered:
+                self._remember(route, name, winner)
+        return result[1] if result else None
+
+    def _remember(self, route, name, winner):
+        entries = self.winners.setdefault(route, {})
+        if winner is None:
+            entries.pop(name, None)
+        else:
+            entries[name] = winner
+        self.changed[(route, name)] = winner
+
+    def save(self):
+        """Merge this process's changes into the file, so parallel workers don't drop each other's entries"""
+        if not self.changed:
+            return
+        with self._lock:
+            merged = self._load()
+            for (route, name), winner in self.changed.items():
+                entries = merged.setdefault(route, {})
+                if winner is None:
+                    entries.pop(name, None)
+                else:
+                    entries[name] = winner
+            merged = {route: entries for route, entries in merged.items() if entries}
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(merged, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+            self.changed = {}
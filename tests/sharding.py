@@ -0,0 +1,113 @@
+import json
+import os
+import statistics
+
+DURATIONS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".test_durations.json")
+
+# Assumed duration for tests that have never been timed
+DEFAULT_DURATION = 5.0
+
+
+def load_durations(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_durations(path, durations):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(dict(sorted(durations.items())), f, indent=1)
+    os.replace(tmp, path)
+
+
+def estimator(durations):
+    """Duration lookup that falls back to the median of known tests"""
+    fallback = statistics.median(durations.values()) if durations else DEFAULT_DURATION
+    return lambda nodeid: durations.get(nodeid, fallback)
+
+
+def partition(nodeids, durations, shards):
+    """Longest-processing-time-first split of tests into `shards` balanced bins"""
+    duration = estimator(durations)
+    bins = [[] for _ in range(shards)]
+    loads = [0.0] * shards
+    for nodeid in sorted(nodeids, key=duration, reverse=True):
+        lightest = loads.index(min(loads))
+        bins[lightest].append(nodeid)
+        loads[lightest] += duration(nodeid)
+    return bins, loads
+
+
+def parse_shard(value):
+    """'2/4' -> (1, 4): zero-based shard index and shard count"""
+    index, slash, count = value.strip().partition("/")
+    if not (slash and index.isdigit() and count.isdigit()):
+        raise ValueError(f"shard {value!r} is not K/N, e.g. 2/4")
+    index, count = int(index), int(count)
+    if not 1 <= index <= count:
+        raise ValueError(f"shard {value!r} is out of range; K must be between 1 and N")
+    return index - 1, count
+
+
+def worker_index(config):
+    """0 for gw0, 1 for gw1, ... and 0 when not running under xdist"""
+    workerinput = getattr(config, "workerinput", None)
+    if not workerinput:
+        return 0
+    return int(workerinput["workerid"].lstrip("gw") or 0)
+
+
+def resolve_base_url(template, index):
+    """Per-worker app URL from a template.
+
+    `template` is either one URL, optionally containing a `{worker}`
+    placeholder for the worker index, or a comma-separated list where worker N
+    takes entry N modulo its length.
+    """
+    candidates = [url.strip() for url in template.split(",") if url.strip()]
+    url = candidates[index % len(candidates)]
+    return url.format(worker=index).rstrip("/")
+
+
+class DurationRecorder:
+    """Plugin that accumulates setup + call + teardown time per test and saves it at session end"""
+
+    def __init__(self, path):
+        self.path = path
+        self.measured = {}
+
+    def pytest_runtest_logreport(self, report):
+        self.measured[report.nodeid] = self.measured.get(report.nodeid, 0.0) + report.duration
+
+    def pytest_sessionfinish(self):
+        if not self.measured:
+            return
+        durations = load_durations(self.path)
+        durations.update({nodeid: round(seconds, 3) for nodeid, seconds in self.measured.items()})
+        save_durations(self.path, durations)
+
+
+def make_duration_scheduler(durations):
+    """xdist LoadScheduling that hands out the longest tests first.
+
+    Workers still pull new tests as they finish, so dispatching in descending
+    duration order is greedy LPT: long tests start early and short ones fill
+    the gaps, keeping all workers busy until the end.
+    """
+    from xdist.scheduler import LoadScheduling
+
+    duration = estimator(durations)
+
+    class DurationScheduling(LoadScheduling):
+        _ordered = False
+
+        def _send_tests(self, node, num):
+            if not self._ordered:
+                self.pending.sort(key=lambda i: duration(self.collection[i]), reverse=True)
+                self._ordered = True
+            super()._send_tests(node, num)
+
+    return DurationScheduling
@@ -0,0 +1,144 @@
+"""Production build of the frontend, served by a small static server.
+
+The Vite dev server transforms every module on first request and serves
+unbundled ESM, so the first navigation in each fresh browser is slow and
+unrepresentative. With --frontend=bundle the suite runs `vite build` once
+per distinct source tree (keyed by a hash of src/ and the build inputs)
+and serves dist/ from here instead.
+"""
+import hashlib
+import os
+import shutil
+import subprocess
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Everything besides src/ that changes what `vite build` emits
+BUILD_INPUTS = ["src", "public", "index.html", "vite.config.js", "package-lock.json"]
+STAMP_FILE = ".source-hash"
+
+# Client-side routes that must be answered with index.html
+SPA_ROUTES = ("/admin", "/agent", "/staff", "/login", "/signup", "/profile")
+
+BUILD_TIMEOUT = 300
+
+
+class BuildError(Exception):
+    pass
+
+
+def source_hash(root=PROJECT_ROOT):
+    """Digest of the paths and contents of every build input"""
+    digest = hashlib.sha256()
+    for name in BUILD_INPUTS:
+        path = os.path.join(root, name)
+        if os.path.isfile(path):
+            files = [path]
+        else:
+            files = sorted(
+                os.path.join(directory, filename)
+                for directory, _, filenames in os.walk(path)
+                for filename in filenames
+            )
+        for file in files:
+            digest.update(os.path.relpath(file, root).replace(os.sep, "/").encode())
+            with open(file, "rb") as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def _stamp(out_dir):
+    try:
+        with open(os.path.join(out_dir, STAMP_FILE)) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def build_bundle(root=PROJECT_ROOT, out_dir=None):
+    """Run `vite build` into dist/ unless it already holds a build of the current sources.
+
+    Concurrent callers (xdist workers) serialise on a lock file; the ones
+    that wait find the fresh stamp and skip the build.
+    """
+    out_dir = out_dir or os.path.join(root, "dist")
+    wanted = source_hash(root)
+    if _stamp(out_dir) == wanted:
+        return out_dir
+
+    lock = f"{out_dir}.lock"
+    deadline = time.monotonic() + BUILD_TIMEOUT
+    while True:
+        try:
+            os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            if time.monotonic() > deadline:
+                raise BuildError(f"Timed out waiting for another build to release {lock}")
+            time.sleep(0.5)
+    try:
+        if _stamp(out_dir) == wanted:
+            return out_dir
+        npx = shutil.which("npx")
+        if npx is None:
+            raise BuildError("npx was not found; install Node.js to build the frontend bundle")
+        print(f"Building frontend bundle into {out_dir}")
+        result = subprocess.run(
+            [npx, "vite", "build", "--outDir", out_dir, "--emptyOutDir"],
+            cwd=root, capture_output=True, text=True, timeout=BUILD_TIMEOUT,
+        )
+        if result.returncode != 0:
+            raise BuildError(f"vite build failed:\n{result.stdout[-2000:]}{result.stderr[-2000:]}")
+        with open(os.path.join(out_dir, STAMP_FILE), "w") as f:
+            f.write(wanted)
+        return out_dir
+    finally:
+        os.remove(lock)
+
+
+class _BundleHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def send_head(self):
+        path = urlsplit(self.path).path
+        if path == "/" or any(path == route or path.startswith(route + "/") for route in SPA_ROUTES):
+            self.path = "/index.html"
+        return super().send_head()
+
+    def end_headers(self):
+        # Vite fingerprints everything under assets/, so those never need revalidating
+        if self.path.startswith("/assets/"):
+            self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+        else:
+            self.send_header("Cache-Control", "no-cache")
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StaticServer:
+    def __init__(self, directory, host="127.0.0.1", port=0):
+        handler = lambda *args, **kwargs: _BundleHandler(*args, directory=directory, **kwargs)
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,152 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from api_contract import (
+    ATTENDANCE, AUDIT_LOG, COLLECTION_REPORT, CUSTOMER, DAILY_COLLECTION, DISBURSEMENT, DOCUMENT, LOAN,
+    LOAN_DETAILS, LOAN_TYPE, LOGIN, MESSAGE, NOTIFICATION, PERFORMANCE_REPORT, PERMISSION, ROLE, SCHEDULE,
+    TARGET_REPORT, USER, load_catalog, validate,
+)
+import pytest
+
+ENDPOINTS, CALLS = load_catalog()
+
+NOT_FOUND = {"detail": str}
+
+
+def contract(call, schema, status=200, role="admin", params=None, query=None, body=None, method=None):
+    """One expected exchange. `call` is a loanService function, or "endpoints.<name>" for
+    api.js endpoints that the service module does not call (then `method` is required)."""
+    return {"call": call, "schema": schema, "status": status, "role": role, "params": params or {},
+            "query": query, "body": body, "method": method}
+
+
+CONTRACTS = [
+    contract("getLoans", [LOAN], query={"loan_status": "active"}),
+    contract("getLoanById", LOAN_DETAILS, params={"id": 1}),
+    contract("createLoan", LOAN, 201, body={"customer_id": 1, "loan_type_id": 1, "principal_amount": "25000",
+                                            "interest_percentage": "12", "total_due_count": 6}),
+    contract("getLoanSchedules", [SCHEDULE], params={"loanId": 1}),
+    contract("getLoanSchedules", [SCHEDULE]),
+    contract("getAssignedLoans", [SCHEDULE], role="agent"),
+    contract("assignLoanSchedule", {"message": str, "schedule": SCHEDULE}, params={"scheduleId": 8},
+             body={"assigned_to": 3}),
+    contract("collectPayment", {"message": str, "schedule": SCHEDULE}, role="agent", params={"scheduleId": 2},
+             body={"payment_method": "cash", "paid_amount": "9333.33"}),
+    contract("getCustomers", [CUSTOMER]),
+    contract("createCustomer", CUSTOMER, 201, body={"full_name": "Kavya Nair", "nickname": "Kavya",
+                                                    "email": "kavya@example.com", "phone": "9900012345"}),
+    contract("updateCustomer", CUSTOMER, params={"id": 2}, body={"full_name": "Priya Sharma", "nickname": "Priya S"}),
+    contract("deleteCustomer", None, 204, params={"id": 5}),
+    contract("getLoanTypes", [LOAN_TYPE]),
+    contract("getCollectionAgents", [USER]),
+    contract("createAgent", {"message": str, "user": USER}, 201, role=None,
+             body={"username": "field9", "email": "field9@example.com", "password": "password123",
+                   "role": "collection_agent"}),
+    contract("getDailyCollections", [DAILY_COLLECTION]),
+    contract("getNotifications", [NOTIFICATION], query={"user_id": 2}),
+    contract("markNotificationAsRead", NOTIFICATION, params={"notificationId": 1}, body={"is_read": True}),
+    contract("getUsers", [USER]),
+    contract("updateUserRole", USER, params={"userId": 4}, body={"role": "collection_agent"}),
+    contract("getRoles", [ROLE]),
+    contract("getPermissions", [PERMISSION]),
+    # The app sends multipart form data; the mock only reads JSON, and the response is what's checked
+    contract("uploadLoanDocuments", DOCUMENT, 201, params={"id": 1}, body={"name": "kyc.pdf"}),
+    contract("getLoanDocuments", [DOCUMENT], params={"id": 1}),
+    contract("deleteDocument", NOT_FOUND, 404, params={"documentId": 999}),
+    contract("updateProfile", USER, body={"first_name": "Asha"}),
+    contract("searchCustomers", [CUSTOMER], query={"q": "john"}),
+    contract("approveLoan", {"message": str, "loan": LOAN}, params={"loanId": 3}, body={"remarks": "Verified"}),
+    contract("rejectLoan", {"message": str, "loan": LOAN}, params={"loanId": 3}, body={"reason": "Incomplete KYC"}),
+    contract("getDisbursements", [DISBURSEMENT]),
+    contract("createDisbursement", DISBURSEMENT, 201,
+             body={"loan_id": 2, "amount": "120000", "method": "bank_transfer"}),
+    contract("getDisbursementDetails", DISBURSEMENT, params={"id": 1}),
+    contract("getAuditLogs", [AUDIT_LOG]),
+    contract("createAuditLog", AUDIT_LOG, 201, body={"action": "Exported report", "module": "reports"}),
+    contract("createRole", ROLE, 201, body={"name": "auditor", "description": "Read only", "permissions": [1, 6]}),
+    contract("updateRole", ROLE, params={"roleId": 3},
+             body={"name": "staff", "description": "Branch staff", "permissions": [1, 3]}),
+    contract("deleteRole", None, 204, params={"roleId": 3}),
+    contract("createPermission", PERMISSION, 201, body={"codename": "export_reports", "name": "Export reports"}),
+    contract("inviteUser", {"message": str, "user": USER}, 201, body={"email": "new.staff@example.com", "role": "staff"}),
+    contract("sendBulkNotifications", {"message": str, "count": int}, 201,
+             body={"title": "Reminder", "message": "Submit today's collections"}),
+    contract("getCollectionReports", COLLECTION_REPORT),
+    contract("getPerformanceReports", PERFORMANCE_REPORT),
+    contract("getTargetReports", TARGET_REPORT),
+    contract("endpoints.login", LOGIN, role=None, method="POST",
+             body={"email": "admin@example.com", "password": "password123"}),
+    contract("endpoints.login", {"error": str}, 400, role=None, method="POST",
+             body={"email": "admin@example.com", "password": "wrong"}),
+    contract("endpoints.changePassword", MESSAGE, role="agent", method="POST",
+             body={"old_password": "password123", "new_password": "password123"}),
+    contract("endpoints.logout", MESSAGE, role="agent", method="POST"),
+    contract("endpoints.loanDues", [SCHEDULE], method="GET"),
+    contract("endpoints.attendance", [ATTENDANCE], method="GET"),
+    contract("endpoints.customers", {"detail": str}, 401, role=None, method="GET"),
+]
+
+# Reads are repeated this many times by the throughput test, spread over THROUGHPUT_WORKERS threads
+THROUGHPUT_ROUNDS = 20
+THROUGHPUT_WORKERS = 8
+# Per-call latency the pooled client must stay under at the 95th percentile
+LATENCY_BUDGET_MS = 100
+
+
+def resolve(case):
+    """(method, path) for a contract, picking the service call variant whose path takes its params"""
+    if case["call"].startswith("endpoints."):
+        return case["method"], ENDPOINTS[case["call"].split(".", 1)[1]]
+    for call in CALLS:
+        if call.name == case["call"] and call.params == set(case["params"]):
+            return call.method, call.url(**case["params"])
+    raise LookupError(f"loanService has no {case['call']} call taking {sorted(case['params'])}")
+
+
+def case_id(case):
+    variant = ",".join(sorted(case["params"]))
+    return f"{case['call']}[{variant}]-{case['status']}" if variant else f"{case['call']}-{case['status']}"
+
+
+def exchange(api_client, case):
+    method, path = resolve(case)
+    return api_client.request(method, path, role=case["role"], params=case["query"], json=case["body"])
+
+
+@pytest.mark.api
+class TestApiContract:
+
+    @pytest.mark.parametrize("case", CONTRACTS, ids=case_id)
+    def test_contract(self, api_client, case):
+        """Status code and response schema of every call the frontend makes"""
+        response = exchange(api_client, case)
+        assert response.status_code == case["status"], f"{response.status_code}: {response.text[:300]}"
+        if case["schema"] is None:
+            assert not response.content
+            return
+        problems = validate(response.json(), case["schema"])
+        assert not problems, "\n".join(problems[:20])
+
+    def test_every_service_call_has_a_contract(self):
+        """A new or changed loanService call fails here until it gets a contract above"""
+        covered = {(case["call"], frozenset(case["params"])) for case in CONTRACTS}
+        missing = [call for call in CALLS if (call.name, frozenset(call.params)) not in covered]
+        assert not missing, f"loanService calls without a contract: {missing}"
+
+    def test_every_endpoint_has_a_contract(self):
+        """Every path in api.js `endpoints` is requested by at least one contract"""
+        paths = [resolve(case)[1] for case in CONTRACTS]
+        missing = {name: path for name, path in ENDPOINTS.items() if not any(p.startswith(path) for p in paths)}
+        assert not missing, f"api.js endpoints without a contract: {missing}"
+
+    def test_read_throughput(self, api_client):
+        """Every read the frontend makes, repeated concurrently over the keep-alive pool"""
+        reads = [case for case in CONTRACTS if resolve(case)[0] == "GET" and case["status"] == 200]
+        started = len(api_client.timings)
+        with ThreadPoolExecutor(THROUGHPUT_WORKERS) as pool:
+            statuses = list(pool.map(lambda case: exchange(api_client, case).status_code, reads * THROUGHPUT_ROUNDS))
+        latencies = sorted(elapsed for _, _, elapsed in api_client.timings[started:])
+
+        assert set(statuses) == {200}, f"unexpected statuses: {sorted(set(statuses))}"
+        p95 = latencies[int(len(latencies) * 0.95)]
+        print(f"{len(latencies)} reads, median {latencies[len(latencies) // 2]:.1f}ms, p95 {p95:.1f}ms")
+        assert p95 < LATENCY_BUDGET_MS, f"p95 read latency {p95:.1f}ms exceeds {LATENCY_BUDGET_MS}ms"
@@ -2,25 +2,23 @@ from base_test import BaseTest
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 import pytest
-import time
 
 class TestBasicFunctionality(BaseTest):
     
     @pytest.mark.smoke
     def test_app_loads(self):
         """Test if React app loads"""
-        self.driver.get(self.base_url)
-        time.sleep(3)
+        self.navigate(self.base_url)
+        self.wait_until_settled()
         
         # Check if React app loaded (look for React root or any content)
-        page_source = self.driver.page_source
-        assert len(page_source) > 1000 or "react" in page_source.lower()
+        assert self.dom.refresh().source_length > 1000 or self.dom.contains("react")
     
     @pytest.mark.smoke  
     def test_basic_navigation(self):
         """Test basic navigation works"""
-        self.driver.get(self.base_url)
-        time.sleep(2)
+        self.navigate(self.base_url)
+        self.wait_until_settled()
         
         # Just verify we can navigate and page responds
         current_url = self.driver.current_url
@@ -28,8 +26,8 @@ class TestBasicFunctionality(BaseTest):
     
     def test_page_title(self):
         """Test page has a title"""
-        self.driver.get(self.base_url)
-        time.sleep(2)
+        self.navigate(self.base_url)
+        self.wait_until_settled()
         
         title = self.driver.title
         assert title is not None and len(title) > 0
\ No newline at end of file
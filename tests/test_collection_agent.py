@@ -1,10 +1,10 @@
 from base_test import BaseTest
+from pages import AgentLoansPage, CollectPaymentPage
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import Select
 import pytest
-import time
 
+@pytest.mark.collection
 class TestCollectionAgent(BaseTest):
     
     def test_agent_dashboard_access(self):
@@ -25,40 +25,32 @@ class TestCollectionAgent(BaseTest):
         assert assigned_loans.is_displayed()
         assert pending_dues.is_displayed()
     
+    @pytest.mark.scenario("agent_with_20_assigned_schedules")
     def test_collect_payment(self):
         """Test payment collection process"""
         self.login("agent@example.com", "password123")
         
         # Navigate to assigned loans
-        self.driver.get(f"{self.base_url}/agent/loans")
+        page = AgentLoansPage(self.driver, self.base_url).open()
         
-        # Click collect button for first loan
-        collect_btn = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Collect')]")))
-        collect_btn.click()
+        # Click collect button for first pending installment
+        page.wait_for("collect", clickable=True)
+        page.click("collect")
         
-        # Fill payment collection form
-        amount_input = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "input[name='amount'], input[placeholder*='amount']")))
-        payment_method = self.driver.find_element(By.CSS_SELECTOR, "select[name='payment_method']")
-        notes = self.driver.find_element(By.CSS_SELECTOR, "textarea[name='notes']")
-        
-        amount_input.send_keys("5000")
-        Select(payment_method).select_by_value("cash")
-        notes.send_keys("Payment collected successfully")
-        
-        # Submit payment
-        submit_btn = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Submit')]")
-        submit_btn.click()
+        # Pay the loan's first pending installment in full
+        collect_page = CollectPaymentPage(self.driver, self.base_url)
+        assert collect_page.collect(), "the collect page listed no pending installment"
         
         # Verify success message
-        success_msg = self.wait.until(EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'collected')]")))
-        assert success_msg.is_displayed()
+        assert collect_page["success"].visible
     
+    @pytest.mark.scenario("agent_with_20_assigned_schedules")
     def test_view_collection_history(self):
         """Test viewing collection history"""
         self.login("agent@example.com", "password123")
         
         # Navigate to collection history
-        self.driver.get(f"{self.base_url}/agent/history")
+        self.navigate(f"{self.base_url}/agent/history")
         
         # Verify history table is displayed
         history_table = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "table, .history-list")))
@@ -73,7 +65,7 @@ class TestCollectionAgent(BaseTest):
         self.login("agent@example.com", "password123")
         
         # Navigate to performance page
-        self.driver.get(f"{self.base_url}/agent/performance")
+        self.navigate(f"{self.base_url}/agent/performance")
         
         # Verify performance metrics are displayed
         metrics_container = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ".performance-metrics, .metrics-container")))
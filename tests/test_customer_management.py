@@ -1,9 +1,8 @@
 from base_test import BaseTest
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
+from pages import CustomersPage
 import pytest
-import time
 
+@pytest.mark.customer
 class TestCustomerManagement(BaseTest):
     
     def test_add_customer(self):
@@ -11,41 +10,39 @@ class TestCustomerManagement(BaseTest):
         self.login()
         
         # Try to navigate to customer page
-        self.driver.get(f"{self.base_url}/admin/customers")
-        time.sleep(3)
+        self.navigate(f"{self.base_url}/admin/customers")
+        self.wait_until_settled()
         
         # Just verify page loads (flexible check)
-        page_source = self.driver.page_source.lower()
         current_url = self.driver.current_url
         
         # Pass if we can access the page
-        assert "customer" in page_source or "admin" in current_url or len(self.driver.page_source) > 1000
+        assert self.dom.contains("customer") or "admin" in current_url or self.dom.source_length > 1000
     
     def test_view_customers(self):
         """Test viewing customer list"""
         self.login()
         
         # Navigate to customers page
-        self.driver.get(f"{self.base_url}/admin/customers")
+        page = CustomersPage(self.driver, self.base_url).open()
         
         # Verify customers table is displayed
-        customers_table = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "table, .customer-list")))
-        assert customers_table.is_displayed()
+        page.wait_for("table")
+        assert page["table"].visible
     
     def test_search_customer(self):
         """Test customer search functionality"""
         self.login()
         
         # Navigate to customers page
-        self.driver.get(f"{self.base_url}/admin/customers")
+        page = CustomersPage(self.driver, self.base_url).open()
         
-        # Find search input
-        search_input = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "input[placeholder*='search'], input[type='search']")))
-        search_input.send_keys("John")
+        # Find search input; typed key by key since results update as you type
+        page.wait_for("search")
+        page["search"].element.send_keys("John")
         
         # Wait for search results
-        time.sleep(2)
+        self.wait_until_settled()
         
         # Verify search results
-        results = self.driver.find_elements(By.CSS_SELECTOR, ".customer-row, tr")
-        assert len(results) > 0
\ No newline at end of file
+        assert len(page.resolve("rows")["rows"]) > 0
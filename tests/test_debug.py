@@ -1,31 +1,31 @@
 from base_test import BaseTest
 from selenium.webdriver.common.by import By
-import time
 
 class TestDebug(BaseTest):
     
     def test_debug_login_page(self):
         """Debug what's actually on login page"""
-        self.driver.get(f"{self.base_url}/login")
-        time.sleep(3)
+        self.navigate(f"{self.base_url}/login")
+        self.wait_until_settled()
         
         print(f"Current URL: {self.driver.current_url}")
         print(f"Page Title: {self.driver.title}")
-        print(f"Page Source Length: {len(self.driver.page_source)}")
+        print(f"Page Source Length: {self.dom.refresh().source_length}")
         
         # Check if page loaded
-        if "login" in self.driver.page_source.lower():
+        if self.dom.contains("login"):
             print("✓ Login page loaded")
         else:
             print("✗ Login page not found")
             
-        # Save screenshot
-        self.driver.save_screenshot("debug_login.png")
+        # Saved in the background with the failure artifacts (--artifacts)
+        if self.artifacts:
+            self.artifacts.capture("debug_login")
     
     def test_debug_after_login(self):
         """Debug what happens after login attempt"""
-        self.driver.get(f"{self.base_url}/login")
-        time.sleep(2)
+        self.navigate(f"{self.base_url}/login")
+        self.wait_until_settled()
         
         try:
             # Try to login
@@ -37,17 +37,18 @@ class TestDebug(BaseTest):
             password_input.send_keys("password123")
             login_btn.click()
             
-            time.sleep(5)
+            self.wait_until_settled()
             
             print(f"After login URL: {self.driver.current_url}")
             print(f"After login Title: {self.driver.title}")
             
             # Check for error messages
-            if "error" in self.driver.page_source.lower():
+            if self.dom.contains("error"):
                 print("✗ Login error detected")
             
-            # Save screenshot
-            self.driver.save_screenshot("debug_after_login.png")
+            # Saved in the background with the failure artifacts (--artifacts)
+            if self.artifacts:
+                self.artifacts.capture("debug_after_login")
             
         except Exception as e:
             print(f"Login attempt failed: {e}")
@@ -55,14 +56,14 @@ class TestDebug(BaseTest):
     def test_check_app_running(self):
         """Check if app is running at all"""
         try:
-            self.driver.get(self.base_url)
-            time.sleep(3)
+            self.navigate(self.base_url)
+            self.wait_until_settled()
             
             print(f"App URL: {self.base_url}")
             print(f"Response URL: {self.driver.current_url}")
-            print(f"Page loaded: {len(self.driver.page_source) > 100}")
+            print(f"Page loaded: {self.dom.refresh().source_length > 100}")
             
-            if "Cannot GET" in self.driver.page_source:
+            if self.dom.contains("Cannot GET"):
                 print("✗ App not running - start with 'npm run dev'")
             else:
                 print("✓ App is running")
@@ -0,0 +1,58 @@
+from base_test import BaseTest
+from emulation import PROFILES
+from pages import AgentLoansPage, CollectPaymentPage
+import pytest
+import time
+
+# Each flow runs once per profile; its route metrics are reported as "<route> @<profile>"
+FIELD_PROFILES = [pytest.param(name, id=name, marks=pytest.mark.emulate(name))
+                  for name in ("office-desktop", "agent-3G-lowend")]
+
+# Six-times-slower CPU on 3G needs far longer than the default 10s
+TIMEOUT = 60
+
+
+@pytest.mark.collection
+@pytest.mark.parametrize("profile", FIELD_PROFILES)
+class TestFieldAgentProfiles(BaseTest):
+
+    def timed(self, record_property, profile, flow, started):
+        seconds = round(time.perf_counter() - started, 3)
+        record_property(f"{flow}_seconds", seconds)
+        print(f"{flow} under {profile} ({PROFILES[profile].cpu_rate}x CPU, "
+              f"{PROFILES[profile].latency_ms:g}ms latency): {seconds:.2f}s")
+
+    def test_agent_dashboard(self, profile, record_property):
+        """Agent dashboard from login to settled"""
+        # The token comes from a session cache; fetching it would only time the first profile's API login
+        self.auth_tokens.get("agent@example.com", "password123")
+        started = time.perf_counter()
+        self.login("agent@example.com", "password123")
+        self.wait_until_settled(timeout=TIMEOUT)
+        self.timed(record_property, profile, "dashboard", started)
+        assert self.dom.contains("Collection Agent")
+
+    @pytest.mark.scenario("agent_with_20_assigned_schedules")
+    def test_assigned_loans(self, profile, record_property):
+        """Assigned loans list until its first collect link can be clicked"""
+        self.login("agent@example.com", "password123")
+        self.wait_until_settled(timeout=TIMEOUT)
+        started = time.perf_counter()
+        page = AgentLoansPage(self.driver, self.base_url).open()
+        page.wait_for("collect", clickable=True, timeout=TIMEOUT)
+        self.wait_until_settled(timeout=TIMEOUT)
+        self.timed(record_property, profile, "assigned_loans", started)
+
+    @pytest.mark.scenario("agent_with_20_assigned_schedules")
+    def test_collect_payment(self, profile, record_property):
+        """Collect-payment flow from the assigned loans list to the confirmation"""
+        self.login("agent@example.com", "password123")
+        page = AgentLoansPage(self.driver, self.base_url).open()
+        page.wait_for("collect", clickable=True, timeout=TIMEOUT)
+
+        started = time.perf_counter()
+        page.click("collect")
+        collect_page = CollectPaymentPage(self.driver, self.base_url)
+        assert collect_page.collect(timeout=TIMEOUT), "the collect page listed no pending installment"
+        self.timed(record_property, profile, "collect_payment", started)
+        assert collect_page["success"].visible
@@ -0,0 +1,42 @@
+from base_test import BaseTest
+from leak_check import LeakCheck
+import pytest
+
+# Routes each role cycles through, starting and ending on the first. /admin/reports (CollectionReports)
+# mounts and unmounts the recharts charts, /admin/repayments the animated repayments table; the admin
+# dashboard itself only draws plain div bars. The agent's loan page is where LoanDetails is mounted.
+ROUTE_CYCLES = [
+    pytest.param("admin@example.com", ["/admin/dashboard", "/admin/loans", "/admin/customers", "/admin/reports",
+                                       "/admin/repayments"], id="admin"),
+    pytest.param("agent@example.com", ["/agent/dashboard", "/agent/loan/1", "/agent/assigned-loans",
+                                       "/agent/performance"], id="agent"),
+]
+
+
+def custom_routes(config, default):
+    """--leak-routes, if it is a cycle for the same dashboard (/admin, /agent, ...) as `default`"""
+    routes = [route.strip() for route in (config.getoption("--leak-routes") or "").split(",") if route.strip()]
+    if routes and routes[0].split("/")[1] == default[0].split("/")[1]:
+        return routes
+    return default
+
+
+@pytest.mark.leak_check
+class TestLeakCheck(BaseTest):
+
+    @pytest.mark.parametrize("email,routes", ROUTE_CYCLES)
+    def test_route_cycle(self, request, record_property, email, routes):
+        """Heap, DOM nodes and listeners must not keep growing while the SPA stays open"""
+        routes = custom_routes(request.config, routes)
+        cycles = request.config.getoption("--leak-cycles")
+        self.login(email, "password123")
+        self.wait_until_settled()
+
+        check = LeakCheck(self.driver, routes, self.wait_until_settled)
+        result = check.run(cycles)
+        record_property("leak_check", {"routes": routes, "cycles": cycles, "metrics": result})
+        for name, m in result.items():
+            print(f"{name:<18} {m['first']:>12g} -> {m['last']:>12g}  {m['per_cycle']:>10g}/cycle  r²={m['r2']}")
+
+        problems = check.problems()
+        assert not problems, f"possible leak over {cycles} cycles of {' -> '.join(routes)}:\n" + "\n".join(problems)
@@ -0,0 +1,45 @@
+from results_log import split_reports
+import pytest
+
+
+def record(nodeid, markers, outcome="passed"):
+    return {"nodeid": nodeid, "module": nodeid.split("::")[0], "markers": markers, "outcome": outcome,
+            "duration": 0.5, "phases": {}, "longrepr": ""}
+
+
+RECORDS = [
+    record("test_collection_agent.py::TestCollectionAgent::test_collect_payment", ["collection"]),
+    record("test_field_agent_profiles.py::TestFieldAgentProfiles::test_agent_dashboard[office-desktop]",
+           ["collection"], "failed"),
+    record("test_smoke.py::TestSmoke::test_login_page_loads", ["smoke"]),
+    record("test_authentication.py::TestAuthentication::test_valid_login", ["auth", "smoke"]),
+]
+
+
+class TestSplitReports:
+
+    def test_marker_and_module_reports(self, tmp_path):
+        """Marker reports never take over a module report of the same category"""
+        names = split_reports(RECORDS, str(tmp_path))
+        assert names == sorted([
+            "full_report.html", "smoke_report.html", "marker_collection_report.html", "marker_auth_report.html",
+            "collection_report.html", "auth_report.html", "test_smoke_report.html",
+            "test_field_agent_profiles_report.html",
+        ])
+
+        module = (tmp_path / "collection_report.html").read_text()
+        assert "Module: test_collection_agent.py" in module
+        assert "test_collect_payment" in module
+        assert "test_field_agent_profiles" not in module
+
+        marker = (tmp_path / "marker_collection_report.html").read_text()
+        assert "test_collect_payment" in marker and "test_field_agent_profiles" in marker
+
+        smoke = (tmp_path / "smoke_report.html").read_text()
+        assert "Marker: smoke" in smoke and "test_valid_login" in smoke
+
+    def test_name_clash_fails(self, tmp_path):
+        """A module report that would land on a marker report's file is an error, not a silent overwrite"""
+        records = [record("smoke.py::test_x", []), record("test_smoke.py::test_y", ["smoke"])]
+        with pytest.raises(ValueError, match="smoke_report.html"):
+            split_reports(records, str(tmp_path))
@@ -0,0 +1,46 @@
+from base_test import BaseTest
+from pages import AgentLoansPage, CustomersPage, LoansPage
+from scale_bench import ScaleBenchmark
+from scale_data import SIZES
+import pytest
+
+# One run per dataset size; each loads the matching scale_* scenario into the backend
+SCALES = [pytest.param(size, id=label, marks=pytest.mark.scenario(f"scale_{label}")) for label, size in SIZES.items()]
+
+# The 100k tables can take well over the default 10s to fetch and render
+SETTLE_TIMEOUT = 120
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("size", SCALES)
+class TestScaleBenchmark(BaseTest):
+
+    def measure(self, record_property, screen, size, page, search=None):
+        """Open the page, then record initial render, search typing (if given) and scroll numbers"""
+        bench = ScaleBenchmark(self.driver, timeout=SETTLE_TIMEOUT)
+        page.open()
+        self.wait_until_settled(timeout=SETTLE_TIMEOUT)
+        metrics = {"render": bench.render()}
+        assert metrics["render"]["rows"] > 0, f"{screen} rendered no rows with {size} records"
+
+        metrics["scroll"] = bench.scroll()
+        if search:
+            metrics["search"] = bench.keystrokes(page.elements["search"], search)
+            self.wait_until_settled(timeout=SETTLE_TIMEOUT)
+        record_property("benchmark", {"screen": screen, "size": size, "metrics": metrics})
+        print(f"{screen} @ {size}: {metrics}")
+
+    def test_customers_table(self, size, record_property):
+        """Customer list render, search-as-you-type and scrolling"""
+        self.login()
+        self.measure(record_property, "customers", size, CustomersPage(self.driver, self.base_url), search="Kumar")
+
+    def test_loans_table(self, size, record_property):
+        """Loan list render and scrolling"""
+        self.login()
+        self.measure(record_property, "loans", size, LoansPage(self.driver, self.base_url))
+
+    def test_agent_schedules(self, size, record_property):
+        """Collection agent's assigned installments render and scrolling"""
+        self.login("agent@example.com", "password123")
+        self.measure(record_property, "agent_schedules", size, AgentLoansPage(self.driver, self.base_url))
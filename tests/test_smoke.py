@@ -2,17 +2,16 @@ from base_test import BaseTest
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 import pytest
-import time
 
 class TestSmoke(BaseTest):
     
     @pytest.mark.smoke
     def test_application_loads(self):
         """Test if the application loads successfully"""
-        self.driver.get(self.base_url)
+        self.navigate(self.base_url)
         
         # Wait for page to load
-        time.sleep(2)
+        self.wait_until_settled()
         
         # Check if we're redirected to login or if login page loads
         assert "login" in self.driver.current_url or self.driver.title
@@ -20,7 +19,7 @@ class TestSmoke(BaseTest):
     @pytest.mark.smoke
     def test_login_page_elements(self):
         """Test if login page has required elements"""
-        self.driver.get(f"{self.base_url}/login")
+        self.navigate(f"{self.base_url}/login")
         
         # Check for email input
         email_input = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='email']")))
@@ -37,10 +36,10 @@ class TestSmoke(BaseTest):
     @pytest.mark.smoke
     def test_signup_page_loads(self):
         """Test if signup page loads"""
-        self.driver.get(f"{self.base_url}/signup")
+        self.navigate(f"{self.base_url}/signup")
         
         # Wait for page to load
-        time.sleep(2)
+        self.wait_until_settled()
         
         # Check if signup form is present
         try:
@@ -48,4 +47,16 @@ class TestSmoke(BaseTest):
             assert signup_form.is_displayed()
         except:
             # If no form found, check if page loaded at all
-            assert self.driver.title or "signup" in self.driver.current_url
\ No newline at end of file
+            assert self.driver.title or "signup" in self.driver.current_url
+    
+    @pytest.mark.smoke
+    def test_api_calls_reach_mock_backend(self, mock_backend, cassettes):
+        """The app's hard-coded http://127.0.0.1:8000 API calls are proxied to this run's mock"""
+        if mock_backend is None or cassettes.mode == "replay":
+            pytest.skip("only meaningful against the mock backend")
+        mock_backend.requests.clear()
+        self.login()
+        self.wait_until_settled()
+        
+        seen = list(mock_backend.requests)
+        assert ("GET", "127.0.0.1:8000", "/auth/loans/") in seen, f"mock saw: {seen}"
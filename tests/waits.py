@@ -0,0 +1,136 @@
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from profiler import phase
+from route_metrics import METRICS_PROBE
+
+# Installed before any app script runs. Counts in-flight XHR/fetch calls (axios
+# uses XHR), stamps React commits through a minimal devtools hook and stamps
+# DOM mutations so rAF-driven framer-motion animations count as activity. The
+# mutation counter and per-document id let DOM snapshots tell when they are stale.
+PROBE_SCRIPT = """
+(() => {
+  if (window.__loanfront) return;
+  const probe = window.__loanfront = {
+    pending: 0, lastCommit: 0, lastMutation: performance.now(), mutations: 0, document: Math.random(),
+  };
+
+  const send = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function (...args) {
+    probe.pending++;
+    this.addEventListener('loadend', () => { probe.pending--; }, {once: true});
+    return send.apply(this, args);
+  };
+
+  const nativeFetch = window.fetch;
+  window.fetch = function (...args) {
+    probe.pending++;
+    return nativeFetch.apply(this, args).finally(() => { probe.pending--; });
+  };
+
+  if (!window.__REACT_DEVTOOLS_GLOBAL_HOOK__) {
+    let nextId = 0;
+    window.__REACT_DEVTOOLS_GLOBAL_HOOK__ = {
+      renderers: new Map(),
+      supportsFiber: true,
+      isDisabled: false,
+      inject(renderer) { const id = ++nextId; this.renderers.set(id, renderer); return id; },
+      onScheduleFiberRoot() {},
+      onCommitFiberRoot() { probe.lastCommit = performance.now(); },
+      onCommitFiberUnmount() {},
+      onPostCommitFiberRoot() {},
+      checkDCE() {},
+    };
+  }
+
+  new MutationObserver(() => { probe.lastMutation = performance.now(); probe.mutations++; })
+    .observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+})();
+"""
+
+STATE_SCRIPT = """
+const probe = window.__loanfront;
+const now = performance.now();
+const animations = document.getAnimations ? document.getAnimations().filter(
+  a => a.playState === 'running' && a.effect && a.effect.getComputedTiming().endTime !== Infinity
+).length : 0;
+return {
+  url: location.href,
+  readyState: document.readyState,
+  instrumented: !!probe,
+  pending: probe ? probe.pending : 0,
+  sinceCommit: probe && probe.lastCommit ? now - probe.lastCommit : null,
+  sinceMutation: probe ? now - probe.lastMutation : null,
+  animations: animations,
+};
+"""
+
+
+def install_probes(driver):
+    """Register the readiness and route metrics probes for every document this browser loads"""
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": PROBE_SCRIPT + METRICS_PROBE})
+
+
+def navigate(driver, url):
+    """driver.get(url), after the `before_navigate` callback a test may have put on the driver
+    has collected what lives only in the current document (coverage, route metrics)"""
+    callback = getattr(driver, "before_navigate", None)
+    if callback:
+        callback()
+    driver.get(url)
+
+
+def is_settled(state, from_url=None, quiet_ms=100):
+    """Decide from a page state snapshot whether the app has stopped moving"""
+    if from_url is not None and state["url"] == from_url:
+        return False
+    if state["readyState"] != "complete":
+        return False
+    if not state["instrumented"]:
+        # Documents loaded before the probes existed: readyState is all we have
+        return True
+    if state["pending"] > 0 or state["animations"] > 0:
+        return False
+    if state["sinceCommit"] is not None and state["sinceCommit"] < quiet_ms:
+        return False
+    return state["sinceMutation"] >= quiet_ms
+
+
+def wait_until_settled(driver, from_url=None, timeout=10, quiet_ms=100, poll=0.05):
+    """Block until the page is settled and return the seconds spent waiting.
+
+    Settled means the route has moved away from `from_url` (when given), no
+    XHR/fetch requests are in flight, React has not committed and the DOM has
+    not mutated for `quiet_ms`, and no finite CSS/WAAPI animations are running.
+    """
+    start = time.perf_counter()
+    with phase("settle_wait"):
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=poll).until(
+                lambda d: is_settled(d.execute_script(STATE_SCRIPT), from_url, quiet_ms)
+            )
+        except TimeoutException:
+            raise TimeoutException(f"Page did not settle within {timeout}s (from_url={from_url})")
+    return time.perf_counter() - start
+
+
+class WaitRecorder:
+    """Collects how long each readiness wait actually blocked"""
+
+    def __init__(self):
+        self.records = []
+
+    def record(self, test_id, label, seconds):
+        self.records.append({"test": test_id, "label": label, "seconds": seconds})
+
+    def total(self):
+        return sum(r["seconds"] for r in self.records)
+
+    def by_label(self):
+        totals = {}
+        for r in self.records:
+            count, seconds = totals.get(r["label"], (0, 0.0))
+            totals[r["label"]] = (count + 1, seconds + r["seconds"])
+        return sorted(totals.items(), key=lambda item: item[1][1], reverse=True)